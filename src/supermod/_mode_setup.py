@@ -1,6 +1,7 @@
 from functools import lru_cache
 
 import gspread
+from gspread.http_client import HTTPClient
 
 from supermod._paths import LOCAL_MARKER, TOKENS_PATH
 from supermod._utils import get_and_verify_env
@@ -28,17 +29,23 @@ def load_local_env() -> None:
 
 
 @lru_cache(maxsize=1)
-def mode_setup():
-    """Authenticate with Google Sheets for the current run mode and return the client."""
+def mode_setup(http_client: type[HTTPClient] = HTTPClient) -> gspread.Client:
+    """
+    Authenticate with Google Sheets for the current run mode and return the
+    client, sending its requests through the given HTTP client class.
+    """
     load_local_env()
 
     if is_local():
-        gsa = gspread.service_account(str(TOKENS_PATH / "service_account.json"))
+        gsa = gspread.service_account(
+            str(TOKENS_PATH / "service_account.json"), http_client=http_client
+        )
     else:
         from json import loads
 
         gsa = gspread.service_account_from_dict(
-            loads(get_and_verify_env("SERVICE_ACCOUNT_CRED"))
+            loads(get_and_verify_env("SERVICE_ACCOUNT_CRED")),
+            http_client=http_client,
         )
 
     return gsa
@@ -0,0 +1,38 @@
+from supermod._sheets.cache import (
+    SHEETS_CACHE_TTL,
+    CachedSpreadsheet,
+    CachedWorksheet,
+    SnapshotCache,
+    open_spreadsheet,
+    sheets_cache,
+)
+from supermod._sheets.gateway import (
+    SHEETS_BACKGROUND_WORKERS,
+    SHEETS_MAX_WORKERS,
+    run_sheets,
+    submit_sheets,
+)
+from supermod._sheets.mirror import (
+    SHEETS_MIRROR_INTERVAL,
+    SHEETS_MIRROR_PATH,
+    SheetsMirror,
+    sheets_mirror,
+)
+from supermod._sheets.quota import (
+    SHEETS_REQUESTS_PER_MINUTE,
+    Priority,
+    QuotaScheduler,
+    ScheduledHTTPClient,
+    background_priority,
+    quota_scheduler,
+    sheets_client,
+    sheets_priority,
+)
+from supermod._sheets.writes import (
+    SHEETS_FLUSH_MAX_DELAY,
+    SHEETS_FLUSH_WINDOW,
+    WriteBuffer,
+    flush_all,
+    flush_writes,
+    write_buffer,
+)
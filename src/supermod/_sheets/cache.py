@@ -0,0 +1,405 @@
+"""
+Read-through worksheet snapshots shared by every feature.
+
+Most features re-read a whole worksheet each time they run, even when nothing
+has changed in between. The lazy worksheet handles in each feature's
+``_constants`` therefore hand out ``CachedWorksheet`` wrappers: a full read is
+served from a snapshot for ``SHEETS_CACHE_TTL`` seconds, the derived reads
+(``find``, ``cell``, ``acell``, ``row_values``) are answered from that snapshot
+too, and the bot's own writes patch it in place (or drop it) so it never goes
+stale because of something the bot did itself. Writes addressed by row number
+must call ``refresh()`` first and locate the row in live data, since rows may
+have been moved by hand in the Sheets UI since the snapshot was taken.
+"""
+
+import threading
+import time
+from functools import lru_cache
+from os import getenv
+from typing import Any, Callable, Hashable, Optional
+
+from gspread.cell import Cell
+from gspread.exceptions import IncorrectCellLabel
+from gspread.utils import a1_to_rowcol, absolute_range_name
+
+from supermod._mode_setup import load_local_env
+from supermod._sheets.quota import sheets_client
+
+load_local_env()
+
+# Edits made by hand in the Sheets UI show up after at most this many seconds.
+SHEETS_CACHE_TTL = float(getenv("SHEETS_CACHE_TTL", "60"))
+
+Rows = list[list[str]]
+# Told about every change to a snapshot: the new rows (None if not known) and
+# the generation they belong to, as notifications can arrive out of order.
+Listener = Callable[[Hashable, Optional[Rows], int], None]
+
+
+def _pad(rows: Rows) -> Rows:
+    """Make a grid rectangular, as gspread's get_all_values returns it."""
+    width = max((len(row) for row in rows), default=0)
+    for row in rows:
+        row.extend([""] * (width - len(row)))
+    return rows
+
+
+def _set_cell(rows: Rows, row: int, col: int, value: Any) -> None:
+    """Write one value into a snapshot grid, growing it as needed."""
+    while len(rows) < row:
+        rows.append([])
+    target = rows[row - 1]
+    target.extend([""] * (col - len(target)))
+    target[col - 1] = str(value)
+
+
+class SnapshotCache:
+    """
+    Thread-safe store of worksheet snapshots, keyed by worksheet. Every change
+    to an entry bumps its generation, so a slow read that started before a
+    write can never store its (older) result over the write. Subscribed
+    listeners hear about every change, after the lock is released.
+    """
+
+    def __init__(self, ttl: float = SHEETS_CACHE_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._snapshots: dict[Hashable, tuple[float, Rows]] = {}
+        self._generations: dict[Hashable, int] = {}
+        self._listeners: list[Listener] = []
+
+    def subscribe(self, listener: Listener) -> None:
+        with self._lock:
+            if listener not in self._listeners:
+                self._listeners.append(listener)
+
+    def _notify(self, key: Hashable, rows: Optional[Rows], generation: int) -> None:
+        with self._lock:
+            listeners = list(self._listeners)
+        for listener in listeners:
+            listener(key, rows, generation)
+
+    def _fresh(self, key: Hashable) -> Optional[Rows]:
+        entry = self._snapshots.get(key)
+        if entry is None or time.monotonic() - entry[0] > self.ttl:
+            return None
+        return entry[1]
+
+    def _bump(self, key: Hashable) -> None:
+        self._generations[key] = self._generations.get(key, 0) + 1
+
+    def fresh(self, key: Hashable) -> bool:
+        """Whether a read of key would be served from its snapshot."""
+        with self._lock:
+            return self._fresh(key) is not None
+
+    def get(self, key: Hashable, load: Callable[[], Rows]) -> Rows:
+        """Return a copy of the snapshot for key, calling load() on a miss."""
+        with self._lock:
+            rows = self._fresh(key)
+            if rows is not None:
+                return [list(row) for row in rows]
+            generation = self._generations.get(key, 0)
+
+        rows = _pad([[str(value) for value in row] for row in load()])
+        with self._lock:
+            stored = self._generations.get(key, 0) == generation
+            if stored:
+                self._snapshots[key] = (time.monotonic(), [list(r) for r in rows])
+        if stored:
+            self._notify(key, rows, generation)
+        return rows
+
+    def put(self, key: Hashable, rows: Rows) -> None:
+        rows = _pad([list(r) for r in rows])
+        with self._lock:
+            self._bump(key)
+            self._snapshots[key] = (time.monotonic(), [list(r) for r in rows])
+            generation = self._generations[key]
+        self._notify(key, rows, generation)
+
+    def update(self, key: Hashable, change: Callable[[Rows], None]) -> None:
+        """Apply an in-place change to a cached snapshot, if there is one."""
+        with self._lock:
+            self._bump(key)
+            entry = self._snapshots.get(key)
+            rows = None
+            if entry is not None:
+                change(entry[1])
+                rows = [list(r) for r in _pad(entry[1])]
+            generation = self._generations[key]
+        self._notify(key, rows, generation)
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Drop one snapshot, or every snapshot if no key is given."""
+        with self._lock:
+            dropped = list(self._snapshots) if key is None else [key]
+            for dropped_key in dropped:
+                self._bump(dropped_key)
+                self._snapshots.pop(dropped_key, None)
+            generations = [self._generations[k] for k in dropped]
+        for dropped_key, generation in zip(dropped, generations):
+            self._notify(dropped_key, None, generation)
+
+
+sheets_cache = SnapshotCache()
+
+
+class CachedWorksheet:
+    """
+    Wrap a gspread Worksheet so that reads are served from the shared snapshot
+    and the bot's writes keep it current. Anything not overridden here passes
+    straight through to the wrapped worksheet.
+    """
+
+    def __init__(self, worksheet: Any, cache: SnapshotCache = sheets_cache):
+        self._worksheet = worksheet
+        self._cache = cache
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._worksheet, name)
+
+    def __repr__(self) -> str:
+        return f"CachedWorksheet({self._worksheet!r})"
+
+    @property
+    def cache(self) -> SnapshotCache:
+        return self._cache
+
+    @property
+    def cache_key(self) -> tuple[Any, Any]:
+        return (self._worksheet.spreadsheet_id, self._worksheet.id)
+
+    def refresh(self) -> None:
+        """Drop the snapshot, so that the next read fetches live data."""
+        self._cache.invalidate(self.cache_key)
+
+    # --- reads ------------------------------------------------------------
+
+    def get_all_values(self, *args, **kwargs) -> Rows:
+        if args or kwargs:
+            # Ranged or re-rendered reads are not what the snapshot holds.
+            return self._worksheet.get_all_values(*args, **kwargs)
+        return self._cache.get(self.cache_key, self._worksheet.get_all_values)
+
+    def row_values(self, row: int) -> list[str]:
+        rows = self.get_all_values()
+        if 1 <= row <= len(rows):
+            # Like the API, leave off trailing blank cells.
+            values = rows[row - 1]
+            while values and values[-1] == "":
+                values.pop()
+            return values
+        return []
+
+    def cell(self, row: int, col: int) -> Cell:
+        rows = self.get_all_values()
+        value = ""
+        if 1 <= row <= len(rows) and 1 <= col <= len(rows[row - 1]):
+            value = rows[row - 1][col - 1]
+        return Cell(row, col, value)
+
+    def acell(self, label: str) -> Cell:
+        return self.cell(*a1_to_rowcol(label))
+
+    def find(self, query: str) -> Optional[Cell]:
+        for r, row in enumerate(self.get_all_values(), start=1):
+            for c, value in enumerate(row, start=1):
+                if value == query:
+                    return Cell(r, c, value)
+        return None
+
+    # --- writes -----------------------------------------------------------
+
+    def append_row(self, values: list, *args, **kwargs) -> Any:
+        result = self._worksheet.append_row(values, *args, **kwargs)
+        self._cache.update(
+            self.cache_key, lambda rows: rows.append([str(v) for v in values])
+        )
+        return result
+
+    def append_rows(self, values: list[list], *args, **kwargs) -> Any:
+        result = self._worksheet.append_rows(values, *args, **kwargs)
+        self._cache.update(
+            self.cache_key,
+            lambda rows: rows.extend([str(v) for v in row] for row in values),
+        )
+        return result
+
+    def update_cell(self, row: int, col: int, value: Any) -> Any:
+        result = self._worksheet.update_cell(row, col, value)
+        self._cache.update(
+            self.cache_key, lambda rows: _set_cell(rows, row, col, value)
+        )
+        return result
+
+    def delete_rows(self, start_index: int, end_index: Optional[int] = None) -> Any:
+        result = self._worksheet.delete_rows(start_index, end_index)
+        end = start_index if end_index is None else end_index
+
+        def change(rows: Rows) -> None:
+            del rows[start_index - 1 : end]
+
+        self._cache.update(self.cache_key, change)
+        return result
+
+    def clear(self) -> Any:
+        result = self._worksheet.clear()
+        self._cache.put(self.cache_key, [])
+        return result
+
+    def replace_all(self, rows: list[list]) -> Any:
+        """
+        Overwrite the whole worksheet with rows in a single request, blanking
+        whatever is left below and to the right of them, so a reader sees
+        either the old contents or the new, never a half-written sheet.
+        """
+        rows = [[str(value) for value in row] for row in rows]
+        old = self._worksheet.get_all_values()
+        height = max(len(rows), len(old), 1)
+        width = max([len(row) for row in rows + old] + [1])
+        if height > self._worksheet.row_count:
+            self._worksheet.add_rows(height - self._worksheet.row_count)
+        if width > self._worksheet.col_count:
+            self._worksheet.add_cols(width - self._worksheet.col_count)
+        grid = rows + [[] for _ in range(height - len(rows))]
+        grid = [row + [""] * (width - len(row)) for row in grid]
+        result = self._worksheet.update(grid, "A1")
+        self._cache.put(self.cache_key, rows)
+        return result
+
+    def update(self, *args, **kwargs) -> Any:
+        result = self._worksheet.update(*args, **kwargs)
+        self._cache.invalidate(self.cache_key)
+        return result
+
+    def batch_update(self, data: list[dict], *args, **kwargs) -> Any:
+        result = self._worksheet.batch_update(data, *args, **kwargs)
+        # Single-cell updates (what WriteBuffer sends) can be applied to the
+        # snapshot directly; anything wider just drops it.
+        try:
+            cells = [
+                (*a1_to_rowcol(entry["range"]), entry["values"][0][0])
+                for entry in data
+                if len(entry["values"]) == 1 and len(entry["values"][0]) == 1
+            ]
+        except IncorrectCellLabel:
+            cells = []
+        if len(cells) != len(data):
+            self._cache.invalidate(self.cache_key)
+            return result
+
+        def change(rows: Rows) -> None:
+            for row, col, value in cells:
+                _set_cell(rows, row, col, value)
+
+        self._cache.update(self.cache_key, change)
+        return result
+
+
+class CachedSpreadsheet:
+    """
+    Wrap a gspread Spreadsheet so that the worksheets it hands out are
+    CachedWorksheets. gspread fetches the spreadsheet's metadata every time a
+    worksheet is looked up, so instead the metadata of every worksheet is read
+    once, on the first lookup, and the handles are served from memory after
+    that. A lookup that misses (a tab added since) reads the metadata again;
+    call invalidate() after renaming or removing worksheets.
+    """
+
+    def __init__(self, spreadsheet: Any, cache: SnapshotCache = sheets_cache):
+        self._spreadsheet = spreadsheet
+        self._cache = cache
+        self._lock = threading.Lock()
+        self._worksheets: dict[Hashable, CachedWorksheet] = {}
+
+    def _load(self) -> None:
+        """Read the metadata of every worksheet, in one request."""
+        worksheets = self._spreadsheet.worksheets()
+        with self._lock:
+            # Keep the handles already given out for worksheets still there.
+            known = {handle.id: handle for handle in self._worksheets.values()}
+            self._worksheets = {}
+            for index, worksheet in enumerate(worksheets):
+                handle = known.get(worksheet.id) or CachedWorksheet(
+                    worksheet, self._cache
+                )
+                self._worksheets[("title", worksheet.title)] = handle
+                self._worksheets[("index", index)] = handle
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._spreadsheet, name)
+
+    def __repr__(self) -> str:
+        return f"CachedSpreadsheet({self._spreadsheet!r})"
+
+    def _handle(self, key: Hashable, fetch: Callable[[], Any]) -> CachedWorksheet:
+        with self._lock:
+            handle = self._worksheets.get(key)
+        if handle is None:
+            self._load()
+            with self._lock:
+                handle = self._worksheets.get(key)
+        if handle is None:
+            # Not in the metadata either: let gspread look it up, raising
+            # WorksheetNotFound (which is not memoised) if it really is missing.
+            handle = CachedWorksheet(fetch(), self._cache)
+            with self._lock:
+                handle = self._worksheets.setdefault(key, handle)
+        return handle
+
+    def invalidate(self) -> None:
+        """Forget the memoised worksheet handles."""
+        with self._lock:
+            self._worksheets.clear()
+
+    def worksheet(self, title: str) -> CachedWorksheet:
+        return self._handle(
+            ("title", title), lambda: self._spreadsheet.worksheet(title)
+        )
+
+    def get_worksheet(self, index: int) -> CachedWorksheet:
+        return self._handle(
+            ("index", index), lambda: self._spreadsheet.get_worksheet(index)
+        )
+
+    @property
+    def sheet1(self) -> CachedWorksheet:
+        return self.get_worksheet(0)
+
+    def get_all_values_many(self, titles: list[str]) -> list[Rows]:
+        """
+        Every row of several worksheets, as get_all_values returns them. Those
+        without a fresh snapshot are read in a single values_batch_get request,
+        and stored as their snapshots.
+        """
+        worksheets = [self.worksheet(title) for title in titles]
+        stale = [
+            title
+            for title, worksheet in zip(titles, worksheets)
+            if not self._cache.fresh(worksheet.cache_key)
+        ]
+        fetched: dict[str, Rows] = {}
+        if stale:
+            response = self._spreadsheet.values_batch_get(
+                [absolute_range_name(title) for title in stale]
+            )
+            for title, value_range in zip(stale, response.get("valueRanges", [])):
+                fetched[title] = value_range.get("values", [])
+
+        def load(title: str, worksheet: CachedWorksheet) -> Callable[[], Rows]:
+            # A snapshot that expired since it was checked is read on its own.
+            if title in fetched:
+                return lambda: fetched[title]
+            return worksheet._worksheet.get_all_values
+
+        return [
+            self._cache.get(worksheet.cache_key, load(title, worksheet))
+            for title, worksheet in zip(titles, worksheets)
+        ]
+
+
+@lru_cache(maxsize=None)
+def open_spreadsheet(url: str) -> CachedSpreadsheet:
+    """Open a spreadsheet by URL once per process, however many features use it."""
+    return CachedSpreadsheet(sheets_client().open_by_url(url))
@@ -0,0 +1,61 @@
+"""
+Run blocking gspread calls off the event loop.
+
+gspread is synchronous, so a Sheets round-trip made straight from a cog stalls
+discord.py's event loop (heartbeats and every other command included) until it
+returns. Feature code hands those calls to ``run_sheets`` instead, which runs
+them on a small thread pool shared by the whole bot. Work marked with
+``background_priority()`` gets a pool of its own, so a long sync waiting on
+quota can never occupy the workers an interactive command needs.
+"""
+
+import asyncio
+import contextvars
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from typing import Callable, ParamSpec, TypeVar
+
+from supermod._sheets.quota import Priority, sheets_priority
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+# Bounded so a burst of commands cannot open an unbounded number of concurrent
+# Sheets connections; excess calls queue on the pool instead.
+SHEETS_MAX_WORKERS = 4
+SHEETS_BACKGROUND_WORKERS = 2
+
+_executor = ThreadPoolExecutor(
+    max_workers=SHEETS_MAX_WORKERS, thread_name_prefix="sheets"
+)
+_background_executor = ThreadPoolExecutor(
+    max_workers=SHEETS_BACKGROUND_WORKERS, thread_name_prefix="sheets-background"
+)
+
+
+def _pool() -> ThreadPoolExecutor:
+    if sheets_priority.get() is Priority.BACKGROUND:
+        return _background_executor
+    return _executor
+
+
+def submit_sheets(
+    func: Callable[P, T], /, *args: P.args, **kwargs: P.kwargs
+) -> Future[T]:
+    """
+    Schedule a blocking Sheets call from synchronous code (e.g. a timer thread)
+    on the pool matching the caller's priority, with its context variables.
+    """
+    ctx = contextvars.copy_context()
+    return _pool().submit(ctx.run, func, *args, **kwargs)
+
+
+async def run_sheets(func: Callable[P, T], /, *args: P.args, **kwargs: P.kwargs) -> T:
+    """
+    Await a blocking Sheets call (or a helper making several) on the Sheets
+    thread pool matching the caller's priority. The caller's context variables
+    are carried into the worker thread, as with asyncio.to_thread.
+    """
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+    return await loop.run_in_executor(_pool(), partial(ctx.run, func, *args, **kwargs))
@@ -0,0 +1,301 @@
+"""
+Local SQLite mirror of the worksheets the bot looks things up in.
+
+The read paths that run on every submission, ``,my_subs``, QOTD and promo tick
+(the masterlists, the discussed-albums sheet, the QOTD sheet and the promos
+tab) read through ``sheets_mirror`` rather than the worksheet itself. The
+mirror stores each worksheet cell by cell, indexed by column and value, so a
+lookup such as "the rows with this submitter id" is a local indexed query, and
+it lives in a file (``SHEETS_MIRROR_PATH``) so a restarted bot can answer from
+it before it has read anything from Sheets.
+
+The mirror follows the shared snapshot cache: whatever the bot reads or writes
+through a ``CachedWorksheet`` is written into it, changed rows only. A worksheet
+whose snapshot was dropped without its new contents being known (a ranged
+update, a ``refresh()`` before a row-addressed write) is marked stale and read
+live on its next use. Edits made by hand in the Sheets UI are picked up by
+``refresh_all``, which the bot runs every ``SHEETS_MIRROR_INTERVAL`` seconds on
+the background pool.
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from os import getenv
+from typing import Any, Hashable, Optional
+
+from supermod._mode_setup import load_local_env
+from supermod._paths import REPO_ROOT
+from supermod._sheets.cache import CachedSpreadsheet, CachedWorksheet, Rows, _pad
+
+logger = logging.getLogger(__name__)
+
+load_local_env()
+
+SHEETS_MIRROR_PATH = getenv(
+    "SHEETS_MIRROR_PATH", str(REPO_ROOT / ".sheets-mirror.sqlite3")
+)
+SHEETS_MIRROR_INTERVAL = float(getenv("SHEETS_MIRROR_INTERVAL", "300"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS worksheets (
+    key TEXT PRIMARY KEY,
+    rows INTEGER NOT NULL,
+    cols INTEGER NOT NULL,
+    synced REAL
+);
+CREATE TABLE IF NOT EXISTS cells (
+    key TEXT NOT NULL,
+    row INTEGER NOT NULL,
+    col INTEGER NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (key, row, col)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS cells_by_value ON cells (key, col, value);
+"""
+
+
+def _mirror_key(cache_key: Hashable) -> str:
+    spreadsheet_id, worksheet_id = cache_key  # type: ignore[misc]
+    return f"{spreadsheet_id}/{worksheet_id}"
+
+
+class SheetsMirror:
+    """
+    SQLite copy of the worksheets read through it. Only ``CachedWorksheet``
+    handles are mirrored, as the snapshot cache's change notifications are what
+    keep the copy current; any other worksheet is simply read live.
+    """
+
+    def __init__(self, path: str = SHEETS_MIRROR_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+        # The worksheets to refresh, and the cache generation each copy matches.
+        self._worksheets: dict[str, CachedWorksheet] = {}
+        self._generations: dict[str, int] = {}
+        # Each copy's version, set from a counter bumped whenever a copy
+        # changes; never reset, so a version is never reused.
+        self._versions: dict[str, int] = {}
+        self._last_version = 0
+        self._rows_changed = 0
+
+    def __repr__(self) -> str:
+        return f"SheetsMirror({self.path!r})"
+
+    # --- storage ----------------------------------------------------------
+
+    def _grid(self, key: str, rows: Optional[list[int]] = None) -> Optional[Rows]:
+        """Rebuild a mirrored worksheet (or some of its rows) as a padded grid."""
+        shape = self._db.execute(
+            "SELECT rows, cols FROM worksheets WHERE key = ?", (key,)
+        ).fetchone()
+        if shape is None:
+            return None
+        row_count, col_count = shape
+        if rows is None:
+            grid = [[""] * col_count for _ in range(row_count)]
+            cells = self._db.execute(
+                "SELECT row, col, value FROM cells WHERE key = ?", (key,)
+            )
+            for row, col, value in cells:
+                grid[row - 1][col - 1] = value
+            return grid
+        grid = {row: [""] * col_count for row in rows}
+        for row in rows:
+            cells = self._db.execute(
+                "SELECT col, value FROM cells WHERE key = ? AND row = ?", (key, row)
+            )
+            for col, value in cells:
+                grid[row][col - 1] = value
+        return [grid[row] for row in rows]
+
+    def _store(self, key: str, rows: Rows) -> int:
+        """Write a worksheet's rows, touching only the rows that changed."""
+        rows = _pad([[str(value) for value in row] for row in rows])
+        stored = self._grid(key)
+        old = stored or []
+        col_count = len(rows[0]) if rows else 0
+        changed = [
+            number
+            for number, row in enumerate(rows, start=1)
+            if number > len(old) or old[number - 1] != row
+        ]
+        with self._db:
+            self._db.executemany(
+                "DELETE FROM cells WHERE key = ? AND row = ?",
+                [(key, number) for number in changed],
+            )
+            self._db.execute(
+                "DELETE FROM cells WHERE key = ? AND (row > ? OR col > ?)",
+                (key, len(rows), col_count),
+            )
+            self._db.executemany(
+                "INSERT INTO cells (key, row, col, value) VALUES (?, ?, ?, ?)",
+                [
+                    (key, number, col, value)
+                    for number in changed
+                    for col, value in enumerate(rows[number - 1], start=1)
+                    if value
+                ],
+            )
+            self._db.execute(
+                "INSERT OR REPLACE INTO worksheets (key, rows, cols, synced) "
+                "VALUES (?, ?, ?, ?)",
+                (key, len(rows), col_count, time.time()),
+            )
+        count = len(changed) + max(len(old) - len(rows), 0)
+        self._rows_changed += count
+        if count or stored is None:
+            self._bump(key)
+        return count
+
+    def _mark_stale(self, key: str) -> None:
+        with self._db:
+            self._db.execute(
+                "UPDATE worksheets SET synced = NULL WHERE key = ?", (key,)
+            )
+        self._bump(key)
+
+    def _bump(self, key: str) -> None:
+        self._last_version += 1
+        self._versions[key] = self._last_version
+
+    def _synced(self, key: str) -> bool:
+        synced = self._db.execute(
+            "SELECT synced FROM worksheets WHERE key = ?", (key,)
+        ).fetchone()
+        return synced is not None and synced[0] is not None
+
+    # --- keeping up with the cache ------------------------------------------
+
+    def _on_change(self, cache_key: Hashable, rows: Optional[Rows], generation: int):
+        key = _mirror_key(cache_key)
+        with self._lock:
+            if key not in self._worksheets:
+                return
+            if generation < self._generations.get(key, 0):
+                return  # Overtaken by a later change.
+            self._generations[key] = generation
+            if rows is None:
+                self._mark_stale(key)
+            else:
+                self._store(key, rows)
+
+    def _track(self, worksheet: CachedWorksheet) -> str:
+        key = _mirror_key(worksheet.cache_key)
+        worksheet.cache.subscribe(self._on_change)
+        with self._lock:
+            self._worksheets.setdefault(key, worksheet)
+        return key
+
+    def _ensure(self, worksheet: CachedWorksheet) -> str:
+        """Track a worksheet and read it in if its copy is missing or stale."""
+        key = self._track(worksheet)
+        with self._lock:
+            synced = self._synced(key)
+        if not synced:
+            # A read that goes to Sheets reaches _on_change and is stored
+            # there; one served from a fresh snapshot has to be stored here.
+            rows = worksheet.get_all_values()
+            with self._lock:
+                if not self._synced(key):
+                    self._store(key, rows)
+        return key
+
+    # --- reads ------------------------------------------------------------
+
+    def rows(self, worksheet: Any) -> Rows:
+        """Every row of a worksheet, as get_all_values returns them."""
+        if not isinstance(worksheet, CachedWorksheet):
+            return worksheet.get_all_values()
+        key = self._ensure(worksheet)
+        with self._lock:
+            grid = self._grid(key)
+        return grid if grid is not None else []
+
+    def rows_many(self, spreadsheet: Any, titles: list[str]) -> list[Rows]:
+        """
+        Every row of several worksheets of one spreadsheet. Those whose copy is
+        missing or stale are read together, in one request.
+        """
+        if not isinstance(spreadsheet, CachedSpreadsheet):
+            return [spreadsheet.worksheet(title).get_all_values() for title in titles]
+        keys = {title: self._track(spreadsheet.worksheet(title)) for title in titles}
+        with self._lock:
+            stale = [title for title in titles if not self._synced(keys[title])]
+        if stale:
+            for title, rows in zip(stale, spreadsheet.get_all_values_many(stale)):
+                with self._lock:
+                    if not self._synced(keys[title]):
+                        self._store(keys[title], rows)
+        with self._lock:
+            return [self._grid(keys[title]) or [] for title in titles]
+
+    def find_rows(self, worksheet: Any, col: int, value: str) -> list[list[str]]:
+        """The rows of a worksheet whose column ``col`` (1-based) holds value."""
+        if not isinstance(worksheet, CachedWorksheet):
+            return [
+                row
+                for row in worksheet.get_all_values()
+                if len(row) >= col and row[col - 1] == value
+            ]
+        key = self._ensure(worksheet)
+        with self._lock:
+            numbers = [
+                number
+                for (number,) in self._db.execute(
+                    "SELECT row FROM cells WHERE key = ? AND col = ? AND value = ? "
+                    "ORDER BY row",
+                    (key, col, value),
+                )
+            ]
+            return self._grid(key, numbers) or []
+
+    def version(self, worksheet: Any) -> Optional[int]:
+        """
+        A number that changes whenever a mirrored worksheet's rows do, so that
+        whatever was worked out from them can tell it is out of date. None for
+        a worksheet whose copy is stale or that is not mirrored.
+        """
+        if not isinstance(worksheet, CachedWorksheet):
+            return None
+        key = _mirror_key(worksheet.cache_key)
+        with self._lock:
+            if key not in self._worksheets or not self._synced(key):
+                return None
+            return self._versions.get(key, 0)
+
+    # --- maintenance ------------------------------------------------------
+
+    def refresh_all(self) -> int:
+        """
+        Re-read every mirrored worksheet (from the snapshot cache, so at most
+        SHEETS_CACHE_TTL seconds old) and return how many rows changed.
+        """
+        with self._lock:
+            worksheets = list(self._worksheets.items())
+            before = self._rows_changed
+        for key, worksheet in worksheets:
+            # A read that goes to Sheets is stored by _on_change already.
+            rows = worksheet.get_all_values()
+            with self._lock:
+                self._store(key, rows)
+        with self._lock:
+            changed = self._rows_changed - before
+        if changed:
+            logger.info("Sheets mirror refreshed: %s rows changed.", changed)
+        return changed
+
+    def clear(self) -> None:
+        """Forget every mirrored worksheet."""
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM cells")
+            self._db.execute("DELETE FROM worksheets")
+            self._worksheets.clear()
+            self._generations.clear()
+
+
+sheets_mirror = SheetsMirror()
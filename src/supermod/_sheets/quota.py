@@ -0,0 +1,161 @@
+"""
+Share the Google Sheets quota between interactive and background work.
+
+Every gspread request the bot makes goes through ``ScheduledHTTPClient``, which
+takes a token from the shared ``QuotaScheduler`` first. The bucket refills at
+``SHEETS_REQUESTS_PER_MINUTE``; when it runs dry, requests queue rather than
+fail. Background work (the periodic loops and full sheet syncs, marked with
+``background_priority()``) runs on its own worker pool and only takes a token
+while no interactive request is waiting and a reserve is left over, so staff
+commands stay responsive during a big sync. A 429 from Google pauses every lane
+and the request is retried with exponential backoff.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from functools import lru_cache
+from http import HTTPStatus
+from os import getenv
+from typing import Any, Iterator
+
+from gspread import Client
+from gspread.exceptions import APIError
+from gspread.http_client import HTTPClient
+from requests import Response
+
+from supermod._mode_setup import load_local_env, mode_setup
+from supermod._stats import record_backoff, record_sheets_call
+
+load_local_env()
+
+# Google's default per-user quota is 60 read and 60 write requests a minute.
+SHEETS_REQUESTS_PER_MINUTE = float(getenv("SHEETS_REQUESTS_PER_MINUTE", "60"))
+SHEETS_BURST = 10
+# Share of the bucket background work must leave for interactive requests.
+BACKGROUND_RESERVE = 0.3
+MAX_BACKOFF = 64.0
+
+
+class Priority(IntEnum):
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+sheets_priority: ContextVar[Priority] = ContextVar(
+    "sheets_priority", default=Priority.INTERACTIVE
+)
+
+
+@contextmanager
+def background_priority() -> Iterator[None]:
+    """Mark the Sheets requests made inside the block as background work."""
+    token = sheets_priority.set(Priority.BACKGROUND)
+    try:
+        yield
+    finally:
+        sheets_priority.reset(token)
+
+
+class QuotaScheduler:
+    """Thread-safe token bucket with an interactive and a background lane."""
+
+    def __init__(
+        self,
+        per_minute: float = SHEETS_REQUESTS_PER_MINUTE,
+        burst: int = SHEETS_BURST,
+        background_reserve: float = BACKGROUND_RESERVE,
+    ):
+        self.rate = per_minute / 60
+        self.capacity = float(burst)
+        self.reserve = burst * background_reserve
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._waiting = {priority: 0 for priority in Priority}
+        self._cond = threading.Condition()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    def _needed(self, priority: Priority) -> float:
+        """Tokens that must be in the bucket before this lane may take one."""
+        if priority is Priority.INTERACTIVE:
+            return 1.0
+        # A bucket too small to hold the reserve can never fill past capacity.
+        return min(1.0 + self.reserve, self.capacity)
+
+    def acquire(self, priority: Priority = Priority.INTERACTIVE) -> float:
+        """Block until a request may be sent; return the seconds spent waiting."""
+        start = time.monotonic()
+        with self._cond:
+            self._waiting[priority] += 1
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    yielding = (
+                        priority is Priority.BACKGROUND
+                        and self._waiting[Priority.INTERACTIVE] > 0
+                    )
+                    needed = self._needed(priority)
+                    if (
+                        now >= self._paused_until
+                        and not yielding
+                        and self._tokens >= needed
+                    ):
+                        self._tokens -= 1
+                        return time.monotonic() - start
+                    if now < self._paused_until:
+                        timeout = self._paused_until - now
+                    else:
+                        timeout = max((needed - self._tokens) / self.rate, 0.01)
+                    self._cond.wait(timeout)
+            finally:
+                self._waiting[priority] -= 1
+                self._cond.notify_all()
+
+    def pause(self, seconds: float) -> None:
+        """Hold every lane for a while (after Google has answered with a 429)."""
+        with self._cond:
+            self._tokens = 0.0
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._cond.notify_all()
+
+
+quota_scheduler = QuotaScheduler()
+
+
+class ScheduledHTTPClient(HTTPClient):
+    """
+    gspread HTTP client that waits for quota before every request and retries
+    requests rejected with a 429.
+    """
+
+    def request(self, *args: Any, **kwargs: Any) -> Response:
+        priority = sheets_priority.get()
+        backoff = 1.0
+        while True:
+            record_backoff(quota_scheduler.acquire(priority))
+            start = time.perf_counter()
+            try:
+                return super().request(*args, **kwargs)
+            except APIError as e:
+                if e.code != HTTPStatus.TOO_MANY_REQUESTS or backoff > MAX_BACKOFF:
+                    raise
+            finally:
+                record_sheets_call(time.perf_counter() - start)
+            # The quota is shared, so hold everyone back, not just this request.
+            quota_scheduler.pause(backoff)
+            backoff *= 2
+
+
+@lru_cache(maxsize=1)
+def sheets_client() -> Client:
+    """Return the bot's gspread client, whose requests all go through the scheduler."""
+    return mode_setup(http_client=ScheduledHTTPClient)
@@ -0,0 +1,158 @@
+"""
+Coalesce sheet mutations into batched requests.
+
+Bulk commands used to make one HTTP call per row or cell (an ``append_row`` per
+approved album, an ``update_cell`` per question on a reset). Mutations queued
+on a worksheet's ``WriteBuffer`` are instead sent as a single ``append_rows``
+and a single ``batch_update`` when the buffer is flushed: explicitly at the end
+of a command, or automatically once ``SHEETS_FLUSH_WINDOW`` seconds have passed
+since the first queued write. A flush that fails puts its writes back and
+re-arms the timer, backing off up to ``SHEETS_FLUSH_MAX_DELAY`` seconds.
+"""
+
+import contextvars
+import logging
+import threading
+from typing import Any, Hashable
+
+from gspread.utils import rowcol_to_a1
+
+from supermod._sheets.gateway import run_sheets, submit_sheets
+
+logger = logging.getLogger(__name__)
+
+SHEETS_FLUSH_WINDOW = 2.0
+SHEETS_FLUSH_MAX_DELAY = 120.0
+
+
+class WriteBuffer:
+    """Pending appends and single-cell updates for one worksheet."""
+
+    def __init__(self, worksheet: Any):
+        self.worksheet = worksheet
+        self._lock = threading.Lock()
+        self._appends: list[list] = []
+        self._updates: dict[tuple[int, int], Any] = {}
+        self._timer: threading.Timer | None = None
+        self._failures = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._appends) + len(self._updates)
+
+    def append_row(self, values: list) -> None:
+        with self._lock:
+            self._appends.append(list(values))
+            self._schedule()
+
+    def append_rows(self, rows: list[list]) -> None:
+        # Queued together, so a timed flush cannot send them apart.
+        with self._lock:
+            self._appends.extend(list(values) for values in rows)
+            self._schedule()
+
+    def update_cell(self, row: int, col: int, value: Any) -> None:
+        # A later write to the same cell replaces the earlier one.
+        with self._lock:
+            self._updates[(row, col)] = value
+            self._schedule()
+
+    def _delay(self) -> float:
+        return min(SHEETS_FLUSH_WINDOW * 2**self._failures, SHEETS_FLUSH_MAX_DELAY)
+
+    def _schedule(self) -> None:
+        """Start the flush timer unless it is already running (lock held)."""
+        if self._timer is not None:
+            return
+        ctx = contextvars.copy_context()
+        self._timer = threading.Timer(
+            self._delay(), ctx.run, args=(submit_sheets, self._timed_flush)
+        )
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _timed_flush(self) -> None:
+        try:
+            self.flush()
+        except Exception:
+            logger.exception(
+                "Timed flush of %r failed; retrying in %.0fs.",
+                self.worksheet,
+                self._delay(),
+            )
+
+    def flush(self) -> None:
+        """
+        Send everything queued as one append_rows and one batch_update. Writes
+        that fail are put back on the buffer before the error is re-raised.
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            appends, self._appends = self._appends, []
+            updates, self._updates = self._updates, {}
+
+        if appends:
+            try:
+                self.worksheet.append_rows(appends)
+            except Exception:
+                self._requeue(appends, updates)
+                raise
+        if updates:
+            try:
+                self.worksheet.batch_update(
+                    [
+                        {"range": rowcol_to_a1(row, col), "values": [[value]]}
+                        for (row, col), value in updates.items()
+                    ]
+                )
+            except Exception:
+                self._requeue([], updates)
+                raise
+        with self._lock:
+            self._failures = 0
+
+    def _requeue(self, appends: list[list], updates: dict) -> None:
+        """Put failed writes back and re-arm the timer with a longer delay."""
+        with self._lock:
+            self._appends[:0] = appends
+            self._updates = {**updates, **self._updates}
+            self._failures += 1
+            self._schedule()
+
+
+_buffers: dict[Hashable, WriteBuffer] = {}
+_buffers_lock = threading.Lock()
+
+
+def write_buffer(worksheet: Any) -> WriteBuffer:
+    """Return the shared write buffer for a worksheet, creating it if needed."""
+    key = (worksheet.spreadsheet_id, worksheet.id)
+    with _buffers_lock:
+        buffer = _buffers.get(key)
+        if buffer is None:
+            buffer = _buffers[key] = WriteBuffer(worksheet)
+        return buffer
+
+
+def flush_all() -> None:
+    """Flush every worksheet's pending writes (blocking)."""
+    with _buffers_lock:
+        buffers = list(_buffers.values())
+    # One failing worksheet must not hold back the others' writes.
+    errors = []
+    for buffer in buffers:
+        if len(buffer):
+            try:
+                buffer.flush()
+            except Exception as e:
+                logger.exception("Flush of %r failed.", buffer.worksheet)
+                errors.append(e)
+    if errors:
+        raise errors[0]
+
+
+async def flush_writes() -> None:
+    """Flush every worksheet's pending writes on the Sheets thread pool."""
+    await run_sheets(flush_all)
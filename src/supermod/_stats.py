@@ -0,0 +1,170 @@
+"""
+Per-command cost accounting.
+
+``Supermod.invoke`` opens an ``Invocation`` record for every command, which is
+visible to everything the command awaits (and to the Sheets worker threads, as
+``run_sheets`` carries context variables along). The Sheets HTTP client and the
+Discord HTTP client add their calls to the current record, so each invocation
+ends up with its wall time, its Sheets and Discord request counts and times, and
+the time it spent held back by rate limiting. The last ``STATS_WINDOW``
+invocations of every command are kept for the staff-only ``,stats`` command.
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import wraps
+from typing import Any, Iterable, Iterator, Optional
+
+STATS_WINDOW = 200
+
+_lock = threading.Lock()
+
+
+@dataclass
+class Invocation:
+    """The cost of one command invocation."""
+
+    command: str
+    feature: str
+    wall_time: float = 0.0
+    sheets_calls: int = 0
+    sheets_time: float = 0.0
+    discord_calls: int = 0
+    discord_time: float = 0.0
+    backoff_time: float = 0.0
+    finished: bool = False
+
+
+current_invocation: ContextVar[Optional[Invocation]] = ContextVar(
+    "current_invocation", default=None
+)
+
+
+def _record(**costs: float) -> None:
+    """Add costs to the current invocation, if there is one still running."""
+    invocation = current_invocation.get()
+    if invocation is None:
+        return
+    # Sheets calls of one command can run on several worker threads at once.
+    with _lock:
+        if invocation.finished:
+            return
+        for name, value in costs.items():
+            setattr(invocation, name, getattr(invocation, name) + value)
+
+
+def record_sheets_call(seconds: float) -> None:
+    _record(sheets_calls=1, sheets_time=seconds)
+
+
+def record_discord_call(seconds: float) -> None:
+    _record(discord_calls=1, discord_time=seconds)
+
+
+def record_backoff(seconds: float) -> None:
+    _record(backoff_time=seconds)
+
+
+def percentile(values: Iterable[float], q: float) -> float:
+    """Return the q-th percentile (0-100) of values, by nearest rank."""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = max(1, -(-len(ordered) * q // 100))
+    return ordered[int(rank) - 1]
+
+
+class CommandStats:
+    """Rolling window of recent invocations per command."""
+
+    def __init__(self, window: int = STATS_WINDOW):
+        self.window = window
+        self._invocations: dict[str, deque[Invocation]] = {}
+
+    @contextmanager
+    def track(self, command: str, feature: Optional[str]) -> Iterator[Invocation]:
+        """Record the invocation of a command run inside the block."""
+        invocation = Invocation(command, feature or "No category")
+        token = current_invocation.set(invocation)
+        start = time.perf_counter()
+        try:
+            yield invocation
+        finally:
+            current_invocation.reset(token)
+            with _lock:
+                invocation.wall_time = time.perf_counter() - start
+                invocation.finished = True
+                runs = self._invocations.setdefault(command, deque(maxlen=self.window))
+                runs.append(invocation)
+
+    def by_command(self) -> dict[str, list[Invocation]]:
+        with _lock:
+            return {name: list(runs) for name, runs in self._invocations.items()}
+
+    def by_feature(self) -> dict[str, list[Invocation]]:
+        features: dict[str, list[Invocation]] = {}
+        for runs in self.by_command().values():
+            for invocation in runs:
+                features.setdefault(invocation.feature, []).append(invocation)
+        return features
+
+    def clear(self) -> None:
+        with _lock:
+            self._invocations.clear()
+
+
+command_stats = CommandStats()
+
+
+def summary_line(name: str, runs: list[Invocation]) -> str:
+    """One row of the ,stats table: median / p95 of each cost over runs."""
+
+    def spread(values: list[float], fmt: str) -> str:
+        return f"{percentile(values, 50):{fmt}}/{percentile(values, 95):{fmt}}"
+
+    return (
+        f"{name[:16]:<16} {len(runs):>4} "
+        f"{spread([r.wall_time for r in runs], '.2f'):>11} "
+        f"{spread([r.sheets_calls for r in runs], '.0f'):>7} "
+        f"{spread([r.sheets_time for r in runs], '.2f'):>11} "
+        f"{spread([r.discord_calls for r in runs], '.0f'):>7} "
+        f"{spread([r.backoff_time for r in runs], '.2f'):>11}"
+    )
+
+
+SUMMARY_HEADER = (
+    f"{'':<16} {'runs':>4} {'wall s':>11} {'sheets':>7} "
+    f"{'sheets s':>11} {'discord':>7} {'backoff s':>11}"
+)
+# Enough rows to cover every command while staying under Discord's 2000 chars.
+STATS_TABLE_ROWS = 20
+
+
+def stats_table(title: str, groups: dict[str, list[Invocation]]) -> str:
+    """Format the busiest groups as a code-block table (median/p95 columns)."""
+    busiest = sorted(groups.items(), key=lambda item: -len(item[1]))
+    lines = [summary_line(name, runs) for name, runs in busiest[:STATS_TABLE_ROWS]]
+    return (
+        f"**{title}** (median/p95)\n```\n"
+        + "\n".join([SUMMARY_HEADER, *lines])
+        + "\n```"
+    )
+
+
+def instrument_discord_http(http: Any) -> None:
+    """Count the REST requests (and their time) made through a discord HTTPClient."""
+    request = http.request
+
+    @wraps(request)
+    async def counted_request(*args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            return await request(*args, **kwargs)
+        finally:
+            record_discord_call(time.perf_counter() - start)
+
+    http.request = counted_request
@@ -1,10 +1,19 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
 from os import getenv
-from typing import Optional
+from typing import AsyncIterator, Awaitable, Callable, Iterable, Optional, TypeVar
 
-from discord import Member, TextChannel
+from discord import HTTPException, Member, TextChannel
 from discord.ext import commands
 from discord.ext.commands import Bot
 
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
 
 def get_and_verify_env(var_name: str) -> str:
     var = getenv(var_name)
@@ -35,3 +44,143 @@ def is_staff(role_id: int):
         )
 
     return commands.check(predicate)
+
+
+async def with_retries(
+    call: Callable[[], Awaitable[T]], backoff: float = 1.0, max_backoff: float = 8.0
+) -> T:
+    """
+    Await a Discord call, retrying it when it fails in a way that may pass (a
+    server error, or a rate limit discord.py gave up waiting out), waiting
+    twice as long before each retry, until the wait would exceed max_backoff.
+    """
+    while True:
+        try:
+            return await call()
+        except HTTPException as e:
+            if (e.status < 500 and e.status != 429) or backoff > max_backoff:
+                raise
+            logger.warning("Discord call failed (%s); retrying in %.0fs.", e, backoff)
+        await asyncio.sleep(backoff)
+        backoff *= 2
+
+
+class RWLock:
+    """
+    asyncio readers-writer lock. Any number of readers can hold it at once, a
+    writer holds it alone; a waiting writer keeps new readers out, so a stream
+    of short readers cannot starve it.
+    """
+
+    def __init__(self):
+        self._condition = asyncio.Condition()
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+
+    @property
+    def writing(self) -> bool:
+        """Whether a writer holds the lock or is waiting for it."""
+        return self._writer or self._writers_waiting > 0
+
+    @asynccontextmanager
+    async def read(self) -> AsyncIterator[None]:
+        async with self._condition:
+            await self._condition.wait_for(lambda: not self.writing)
+            self._readers += 1
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self._readers -= 1
+                self._condition.notify_all()
+
+    @asynccontextmanager
+    async def write(self) -> AsyncIterator[None]:
+        async with self._condition:
+            self._writers_waiting += 1
+            try:
+                await self._condition.wait_for(
+                    lambda: not self._writer and not self._readers
+                )
+            except BaseException:
+                # Let the readers this writer was holding back go ahead.
+                self._writers_waiting -= 1
+                self._condition.notify_all()
+                raise
+            self._writers_waiting -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self._writer = False
+                self._condition.notify_all()
+
+
+class DisplayNames:
+    """
+    Resolve user ids to display names: from the guild's member cache first,
+    then from earlier lookups (the last ``maxsize``, for ``ttl`` seconds), and
+    only then with fetch_user, at most ``concurrency`` at a time. A user being
+    looked up already is not looked up again.
+    """
+
+    def __init__(
+        self,
+        bot: Bot,
+        guild_id: int,
+        maxsize: int = 2048,
+        ttl: float = 3600,
+        concurrency: int = 5,
+    ):
+        self.bot = bot
+        self.guild_id = guild_id
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._names: OrderedDict[int, tuple[float, str]] = OrderedDict()
+        self._pending: dict[int, asyncio.Task[Optional[str]]] = {}
+
+    def _cached(self, user_id: int) -> Optional[str]:
+        guild = self.bot.get_guild(self.guild_id)
+        member = guild.get_member(user_id) if guild is not None else None
+        if member is not None:
+            return member.display_name
+        entry = self._names.get(user_id)
+        if entry is None or time.monotonic() - entry[0] > self.ttl:
+            return None
+        self._names.move_to_end(user_id)
+        return entry[1]
+
+    async def _fetch(self, user_id: int) -> Optional[str]:
+        try:
+            async with self._semaphore:
+                user = await self.bot.fetch_user(user_id)
+        except HTTPException as e:
+            logger.warning("Could not look up user %s: %s", user_id, e)
+            return None
+        finally:
+            self._pending.pop(user_id, None)
+        self._names[user_id] = (time.monotonic(), user.display_name)
+        self._names.move_to_end(user_id)
+        while len(self._names) > self.maxsize:
+            self._names.popitem(last=False)
+        return user.display_name
+
+    async def resolve(self, user_ids: Iterable[int]) -> dict[int, str]:
+        """The display names of the users that could be found."""
+        names = {}
+        lookups = {}
+        for user_id in set(user_ids):
+            name = self._cached(user_id)
+            if name is not None:
+                names[user_id] = name
+                continue
+            if user_id not in self._pending:
+                self._pending[user_id] = asyncio.create_task(self._fetch(user_id))
+            lookups[user_id] = self._pending[user_id]
+        for user_id, name in zip(lookups, await asyncio.gather(*lookups.values())):
+            if name is not None:
+                names[user_id] = name
+        return names
@@ -2,12 +2,21 @@ import logging
 import pkgutil
 
 from discord import AllowedMentions, Intents
-from discord.ext import commands
+from discord.ext import commands, tasks
 from discord.ext.commands import Bot, Context
 
 from supermod._logging import setup_logging
-from supermod._mode_setup import is_local, mode_setup
+from supermod._mode_setup import is_local
 from supermod._paths import FEATURES_DIR, FEATURES_PACKAGE
+from supermod._sheets import (
+    SHEETS_MIRROR_INTERVAL,
+    background_priority,
+    flush_writes,
+    run_sheets,
+    sheets_client,
+    sheets_mirror,
+)
+from supermod._stats import command_stats, instrument_discord_http
 from supermod._utils import get_and_verify_env
 
 logger = logging.getLogger(__name__)
@@ -27,7 +36,36 @@ class Supermod(Bot):
         # Runs exactly once, before the gateway connects — the idiomatic place
         # for async startup. (on_ready can fire again on every reconnect, which
         # would re-load every extension and raise ExtensionAlreadyLoaded.)
+        instrument_discord_http(self.http)
         await self.load_features()
+        self.mirror_loop.start()
+
+    @tasks.loop(seconds=SHEETS_MIRROR_INTERVAL)
+    async def mirror_loop(self) -> None:
+        # Brings edits made by hand in the Sheets UI into the local mirror.
+        try:
+            with background_priority():
+                await run_sheets(sheets_mirror.refresh_all)
+        except Exception:
+            logger.exception("Failed to refresh the sheets mirror.")
+
+    async def close(self) -> None:
+        self.mirror_loop.cancel()
+        # Writes still waiting out their flush window would be lost on shutdown.
+        try:
+            await flush_writes()
+        except Exception:
+            logger.exception("Failed to flush pending sheet writes on shutdown.")
+        await super().close()
+
+    async def invoke(self, ctx: Context) -> None:
+        # Tracked here rather than in on_command: listeners run as separate
+        # tasks, so only this task's context reaches the command's own calls.
+        if ctx.command is None:
+            await super().invoke(ctx)
+            return
+        with command_stats.track(ctx.command.qualified_name, ctx.command.cog_name):
+            await super().invoke(ctx)
 
     async def on_ready(self) -> None:
         logger.info("Logged in as %s.", self.user)
@@ -99,7 +137,7 @@ class Supermod(Bot):
 
         # Authenticate now so that, in local mode, load_dotenv populates TOKEN
         # (and the other secrets) before they are read below.
-        mode_setup()
+        sheets_client()
 
         token = get_and_verify_env("TOKEN")
         self.run(token, log_handler=None)
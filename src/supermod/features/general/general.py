@@ -7,6 +7,7 @@ import discord
 from discord.ext import commands
 from discord.ext.commands import Bot, Cog, Context
 
+from supermod._stats import command_stats, stats_table
 from supermod._utils import is_staff
 from supermod.features.general._constants import *
 
@@ -24,6 +25,20 @@ class General(Cog, description="General commands"):
     async def hello(self, ctx: Context):
         await ctx.send("It's fine now. Why? Because I am here!")
 
+    @commands.command(
+        brief="Show what recent commands have cost.",
+        description="Show wall time, Google Sheets calls, Discord API calls and "
+        + "rate-limit waits of recent commands, per command and per feature.",
+    )
+    @is_staff(STAFF_ROLE)
+    async def stats(self, ctx: Context) -> None:
+        by_command = command_stats.by_command()
+        if not by_command:
+            await ctx.send("No commands have been recorded yet.")
+            return
+        await ctx.send(stats_table("Per command", by_command))
+        await ctx.send(stats_table("Per feature", command_stats.by_feature()))
+
     @commands.command(
         brief="Archive a channel from its channel id.",
         description="Archive a channel from its channel id "
@@ -1,6 +1,7 @@
 from functools import lru_cache
 
-from supermod._mode_setup import load_local_env, mode_setup
+from supermod._mode_setup import load_local_env
+from supermod._sheets import open_spreadsheet
 from supermod._utils import get_and_verify_env
 
 load_local_env()
@@ -25,4 +26,4 @@ STAFF_ROLE = int(get_and_verify_env("STAFF_ROLE"))
 @lru_cache(maxsize=1)
 def news_sheet():
     """Lazily open and memoize the newsletter spreadsheet."""
-    return mode_setup().open_by_url(get_and_verify_env("NEWS_SHEET_URL"))
+    return open_spreadsheet(get_and_verify_env("NEWS_SHEET_URL"))
@@ -6,10 +6,18 @@ from pendulum.datetime import DateTime
 
 from supermod._utils import get_and_verify_env
 from supermod.album_classes import Release
+from supermod.features.newsletter._constants import news_sheet
 
 logger = logging.getLogger(__name__)
 
 
+def news_values(sheet: Optional[str] = None) -> list[list[str]]:
+    """Read a newsletter worksheet by title, or the current (first) one."""
+    if sheet is None:
+        return news_sheet().sheet1.get_all_values()
+    return news_sheet().worksheet(sheet).get_all_values()
+
+
 def news_get(sheet_data: list[list[str]], week: int) -> list[Release]:
     releases_as_lists = [
         release_as_list
@@ -6,6 +6,7 @@ import pendulum
 from discord.ext import commands
 from discord.ext.commands import Bot, Cog, Context
 
+from supermod._sheets import run_sheets
 from supermod._utils import is_staff, text_channel
 from supermod.features.newsletter._constants import *
 from supermod.features.newsletter._utils import *
@@ -45,11 +46,10 @@ class Newsletter(Cog, description="Functions to fetch the weekly newsletter."):
 
         sheet = f"{date.year} OL Rock Albums List"
         try:
-            worksheet = news_sheet().worksheet(sheet)
+            sheet_data = await run_sheets(news_values, sheet)
         except gspread.exceptions.WorksheetNotFound:
             await ctx.send(f"No newsletter exists for {date.year}.")
             return
-        sheet_data = worksheet.get_all_values()
         await self._newsletter_post(ctx, sheet_data, date)
 
     @commands.command(
@@ -66,7 +66,7 @@ class Newsletter(Cog, description="Functions to fetch the weekly newsletter."):
             return
 
         date = pendulum.now("America/Toronto")
-        sheet_data = news_sheet().sheet1.get_all_values()
+        sheet_data = await run_sheets(news_values)
         await self._newsletter_post(ctx, sheet_data, date, ending_message)
 
     @commands.command(
@@ -85,7 +85,7 @@ class Newsletter(Cog, description="Functions to fetch the weekly newsletter."):
             return
 
         date = pendulum.now("America/Toronto")
-        sheet_data = news_sheet().sheet1.get_all_values()
+        sheet_data = await run_sheets(news_values)
         await self._newsletter_post(
             ctx,
             sheet_data,
@@ -105,7 +105,7 @@ class Newsletter(Cog, description="Functions to fetch the weekly newsletter."):
     )
     @is_staff(STAFF_ROLE)
     async def news_by_genre(self, ctx: Context, arg: Optional[str] = None):
-        sheet_data = news_sheet().sheet1.get_all_values()
+        sheet_data = await run_sheets(news_values)
         genre_categories_posts, errors_message = news_by_genre(sheet_data)
         for genre_category, long_post in genre_categories_posts.items():
             posts = post_split(long_post, 2000)
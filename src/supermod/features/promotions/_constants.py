@@ -1,6 +1,7 @@
 from functools import lru_cache
 
-from supermod._mode_setup import load_local_env, mode_setup
+from supermod._mode_setup import load_local_env
+from supermod._sheets import open_spreadsheet
 from supermod._utils import get_and_verify_env
 
 load_local_env()
@@ -15,4 +16,4 @@ STAFF_ROLE = int(get_and_verify_env("STAFF_ROLE"))
 @lru_cache(maxsize=1)
 def promos_wks():
     """Lazily open and memoize the promotions worksheet (second tab)."""
-    return mode_setup().open_by_url(get_and_verify_env("QOTD_SHEET_URL")).get_worksheet(1)
+    return open_spreadsheet(get_and_verify_env("QOTD_SHEET_URL")).get_worksheet(1)
@@ -1,9 +1,19 @@
 from discord import Colour, Embed
 
+from supermod._sheets import sheets_mirror
 from supermod.features.newsletter._utils import post_split
 from supermod.features.promotions._constants import *
 
 
+def promos_get() -> list[list[str]]:
+    """Read every promo row (header excluded)."""
+    return sheets_mirror.rows(promos_wks())[1:]
+
+
+def promo_add(promo_data: list[str]) -> None:
+    promos_wks().append_row(promo_data)
+
+
 def promo_make(promo_data: list[str]) -> Embed | str:
     """Build the formatted promo message from the promo data list."""
     # Embed
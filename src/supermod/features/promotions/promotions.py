@@ -8,6 +8,7 @@ from discord.ext import commands, tasks
 from discord.ext.commands import Bot, Cog, Context
 
 from supermod._mode_setup import is_local
+from supermod._sheets import background_priority, run_sheets
 from supermod._utils import is_staff, text_channel
 from supermod.features.newsletter._utils import ordinal
 from supermod.features.promotions._utils import *
@@ -29,13 +30,14 @@ class Promotions(
     @tasks.loop(minutes=60)
     async def promos_loop(self):
         time_now = pendulum.now("America/Toronto")
-        promos_as_lists = promos_wks().get_all_values()[1:]
+        with background_priority():
+            promos_as_lists = await run_sheets(promos_get)
         for promo_as_list in promos_as_lists:
             try:
                 promo_as_list = [i.strip() for i in promo_as_list]
                 promo_as_list[5] = promo_as_list[5].split(":")[0]
                 if promo_as_list[4].lower().startswith("last"):
-                    promo_as_list[4] = time_now.last_of("month").day
+                    promo_as_list[4] = str(time_now.last_of("month").day)
                 if (time_now.day, time_now.hour) == (
                     int(promo_as_list[4]),
                     int(promo_as_list[5]),
@@ -138,9 +140,7 @@ class Promotions(
             await channel.send(promo_formatted)
 
     async def _promo_add_interaction(self, ctx: Context) -> None:
-        dates = [
-            f"{promo[4]}/{promo[5]}" for promo in promos_wks().get_all_values()[1:]
-        ]
+        dates = [f"{promo[4]}/{promo[5]}" for promo in await run_sheets(promos_get)]
         new_promo_data = []
 
         def check(resp: Message):
@@ -219,7 +219,7 @@ class Promotions(
         await ctx.send("Do you want to submit (y/n)?")
         confirm = await self.bot.wait_for("message", timeout=30, check=check)
         if confirm.content.lower().startswith("y"):
-            promos_wks().append_row(new_promo_data)
+            await run_sheets(promo_add, new_promo_data)
             await ctx.send("The promo was submitted.")
         elif confirm.content.lower().startswith("n"):
             await ctx.send("The promo was rejected.")
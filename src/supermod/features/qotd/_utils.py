@@ -1,11 +1,20 @@
 import random
 from typing import Optional
 
+from supermod._sheets import sheets_mirror, write_buffer
 from supermod.features.qotd._constants import *
 
 
+def _count(value: str) -> int:
+    """Parse a used-count cell, treating blanks and junk as 0."""
+    try:
+        return int(float(value))
+    except ValueError:
+        return 0
+
+
 def qotd_get() -> Optional[list[str]]:
-    questions: list[list[str]] = qotd_wks().get_all_values()
+    questions: list[list[str]] = sheets_mirror.rows(qotd_wks())
     questions = [
         question
         for question in questions
@@ -18,10 +27,34 @@ def qotd_get() -> Optional[list[str]]:
     return question_full
 
 
+def add_question(qotd_type: str, repeatable: str, question: str) -> None:
+    qotd_wks().append_row([qotd_type, repeatable, question])
+
+
+def reset_uses() -> None:
+    """
+    Set the number of uses of every question to 0, sent as one batched write
+    covering only the rows that are not at 0 already.
+    """
+    wks = qotd_wks()
+    # Counts may have been changed by hand since the last cached read.
+    wks.refresh()
+    q_rows = wks.get_all_values()
+    buffer = write_buffer(wks)
+    for i, q_row in enumerate(q_rows[1:], start=2):
+        if q_row[2] and q_row[3:4] != ["0"]:
+            buffer.update_cell(i, 4, 0)
+    buffer.flush()
+
+
 def mark_as_used(question: list[str]) -> None:
+    # Locate the question and its count in one live read (the row number must
+    # match the sheet as it is now), then write once.
     wks = qotd_wks()
-    cell = wks.find(question[2])
-    assert cell is not None
-    question_row = cell.row
-    current = wks.cell(question_row, 4).numeric_value or 0
-    wks.update_cell(question_row, 4, int(current) + 1)
+    wks.refresh()
+    for question_row, row in enumerate(wks.get_all_values(), start=1):
+        if len(row) > 2 and row[2] == question[2]:
+            current = row[3] if len(row) > 3 else ""
+            wks.update_cell(question_row, 4, _count(current) + 1)
+            return
+    raise ValueError(f"Question {question[2]!r} is not in the QOTD sheet.")
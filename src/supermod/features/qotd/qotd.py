@@ -9,6 +9,7 @@ from discord.ext import commands, tasks
 from discord.ext.commands import Bot, Cog, Context
 
 from supermod._mode_setup import is_local
+from supermod._sheets import background_priority, run_sheets
 from supermod._utils import is_staff, text_channel
 from supermod.features.qotd._constants import *
 from supermod.features.qotd._utils import *
@@ -38,7 +39,8 @@ class QOTD(Cog, description="Submit and retrieve a QOTD."):
                         QOTD_APPROVAL_CHANNEL,
                     )
                     return
-                await self._qotd_interact(channel, timeout=1800)
+                with background_priority():
+                    await self._qotd_interact(channel, timeout=1800)
         except Exception:
             logger.exception("Error in qotd_loop tick. Skipping this QOTD loop tick.")
             return
@@ -117,7 +119,7 @@ class QOTD(Cog, description="Submit and retrieve a QOTD."):
             )
             response = await self.bot.wait_for("message", timeout=30, check=check)
             if response.content.lower().startswith("y"):
-                qotd_wks().append_row([qotd_type, repeatable, qotd])
+                await run_sheets(add_question, qotd_type, repeatable, qotd)
                 await ctx.send("The QOTD was added to the spreadsheet.")
             elif response.content.lower().startswith("n"):
                 await ctx.send("The QOTD was not added to the spreadsheet.")
@@ -143,16 +145,11 @@ class QOTD(Cog, description="Submit and retrieve a QOTD."):
     )
     @is_staff(STAFF_ROLE)
     async def qotd_reset(self, ctx: Context):
-        wks = qotd_wks()
-        q_rows = wks.get_all_values()
-        for i, q_row in enumerate(q_rows[1:], start=2):
-            if q_row[2]:
-                wks.update_cell(i, 4, 0)
-
+        await run_sheets(reset_uses)
         await ctx.send("Number of uses for all questions set to 0.")
 
     async def _qotd_interact(self, ctx: Messageable, timeout):
-        question = qotd_get()
+        question = await run_sheets(qotd_get)
         if question is None:
             await ctx.send("There are no questions available.")
             return
@@ -245,7 +242,7 @@ class QOTD(Cog, description="Submit and retrieve a QOTD."):
                 f"__**{question[0].capitalize()} of the Day {date_str}:**__"
                 + f"\n\n{overwrite}"
             )
-        mark_as_used(question)
+        await run_sheets(mark_as_used, question)
         conf_msg = f"QOTD has been posted ({date_str})."
         logger.info(conf_msg)
         await ctx.send(conf_msg)
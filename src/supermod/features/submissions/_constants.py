@@ -1,10 +1,14 @@
 from functools import lru_cache
+from os import getenv
 
-from supermod._mode_setup import load_local_env, mode_setup
+from supermod._mode_setup import load_local_env
+from supermod._paths import REPO_ROOT
+from supermod._sheets import open_spreadsheet
 from supermod._utils import get_and_verify_env
 
 load_local_env()
 
+SERVER = int(get_and_verify_env("SERVER"))
 SUB_APPROVAL_CHANNEL = int(get_and_verify_env("QOTD_APPROVAL_CHANNEL"))
 
 SUBMISSIONS_CHANNEL = int(get_and_verify_env("SUBMISSIONS_CHANNEL"))
@@ -24,16 +28,68 @@ MASTERLIST_CHANNEL_DICT = {
     "anything": ANYTHING_CHANNEL,
 }
 
+CHANNEL_MASTERLIST_DICT = {
+    channel: masterlist for masterlist, channel in MASTERLIST_CHANNEL_DICT.items()
+}
+
+# How many masterlists ,update_sheet and ,update_masterlist sync at once (the
+# periodic sync works through them one at a time).
+SUBS_SYNC_CONCURRENCY = int(
+    getenv("SUBS_SYNC_CONCURRENCY", str(len(MASTERLIST_CHANNEL_DICT)))
+)
+
+# How often the masterlist sheets are synced with their channels, and how
+# many requests a sync may send before it rewrites a sheet in one go instead.
+SUBS_SYNC_INTERVAL = float(getenv("SUBS_SYNC_INTERVAL", "15"))
+SUBS_SYNC_MAX_REQUESTS = 3
+
+# Where the feature keeps the state it needs after a restart: the position of
+# the #submissions scans and the checkpoints of the masterlist rebuilds.
+SUBS_STATE_PATH = getenv(
+    "SUBS_STATE_PATH", str(REPO_ROOT / ".submissions-state.sqlite3")
+)
+# The first read of #submissions, with no position saved, takes the newest
+# messages only, as ,subs always did.
+SUBS_FIRST_READ = 100
+# A rebuild posts this many messages, then waits out the rest of the pace
+# (Discord lets a channel take 5 messages every 5 seconds).
+SUBS_REBUILD_BATCH = 5
+SUBS_REBUILD_PACE = float(getenv("SUBS_REBUILD_PACE", "5"))
+
+# Post each masterlist entry as a message of its own, or pack as many as fit
+# into each message. The sheet records an entry's line within its message.
+SUBS_PACKED_POSTS = getenv("SUBS_PACKED_POSTS", "").lower() in ("1", "true", "yes")
+SUBS_POST_LENGTH = 2000
+
+# Confirm, after a ,subs review is posted, that the masterlist posts its
+# warnings link to are still up (one fetch per link, in the background).
+SUBS_CHECK_LINKS = getenv("SUBS_CHECK_LINKS", "").lower() in ("1", "true", "yes")
+
+# How many reactions in #submissions the bot adds or takes off at once;
+# discord.py waits out the rate limit for the rest.
+SUBS_REACTION_CONCURRENCY = int(getenv("SUBS_REACTION_CONCURRENCY", "5"))
+
+SUBS_SHEET_HEADER = [
+    "Title",
+    "Artist",
+    "Year",
+    "Genre",
+    "Submitter Name",
+    "Submitter ID",
+    "Message ID",
+    "Line",
+]
+
 STAFF_ROLE = int(get_and_verify_env("STAFF_ROLE"))
 
 
 @lru_cache(maxsize=1)
 def albums_wks():
     """Lazily open and memoize the discussed-albums worksheet."""
-    return mode_setup().open_by_url(get_and_verify_env("ALBUMS_SHEET_URL")).sheet1
+    return open_spreadsheet(get_and_verify_env("ALBUMS_SHEET_URL")).sheet1
 
 
 @lru_cache(maxsize=1)
 def subs_sheet():
     """Lazily open and memoize the submissions spreadsheet."""
-    return mode_setup().open_by_url(get_and_verify_env("SUBS_SHEET_URL"))
+    return open_spreadsheet(get_and_verify_env("SUBS_SHEET_URL"))
@@ -0,0 +1,167 @@
+"""
+State of the submissions feature that has to outlive the bot, kept in a small
+SQLite file (``SUBS_STATE_PATH``).
+
+``scan_cursors`` holds where the reads of #submissions start: the bot reads
+the channel once when it starts, forward from the oldest submission it left
+unresolved, so it covers exactly the unresolved window however far back that
+goes rather than reading the channel from the start. With no position saved
+yet it reads the newest ``SUBS_FIRST_READ`` messages only.
+
+``rebuild_journal`` checkpoints the masterlist rebuilds run by
+``,update_masterlist``. A rebuild reposts a masterlist from its sheet in a
+random order, and only once every new post is up deletes the posts that were
+there before. Before the first post goes out the job is recorded: the sheet
+rows it posts, the seed of their shuffle and the newest message already in the
+channel, which tells the old posts from the new. Each new post's message id is
+recorded as soon as it is sent. A job that outlives the bot (a restart
+mid-rebuild) can then be resumed, posting the rest in the same order, or
+rolled back, deleting its posts and leaving the old ones in place.
+"""
+
+import json
+import sqlite3
+from dataclasses import dataclass, field
+from typing import Optional
+
+from supermod.features.submissions._constants import SUBS_STATE_PATH
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scan_cursors (
+    name TEXT PRIMARY KEY,
+    after INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS rebuilds (
+    masterlist TEXT PRIMARY KEY,
+    seed INTEGER NOT NULL,
+    last_old INTEGER NOT NULL,
+    rows TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS rebuild_posts (
+    masterlist TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    message_id INTEGER NOT NULL,
+    PRIMARY KEY (masterlist, position)
+);
+"""
+
+
+class ScanCursors:
+    """
+    SQLite record of the scans' positions, each the message id a scan next
+    reads after.
+    """
+
+    def __init__(self, path: str = SUBS_STATE_PATH):
+        self.path = path
+        self._db = sqlite3.connect(path)
+        self._db.executescript(_SCHEMA)
+
+    def __repr__(self) -> str:
+        return f"ScanCursors({self.path!r})"
+
+    def get(self, name: str) -> Optional[int]:
+        """Where a scan starts; None if it has not run yet."""
+        after = self._db.execute(
+            "SELECT after FROM scan_cursors WHERE name = ?", (name,)
+        ).fetchone()
+        return after[0] if after is not None else None
+
+    def set(self, name: str, after: int) -> None:
+        with self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO scan_cursors (name, after) VALUES (?, ?)",
+                (name, after),
+            )
+
+
+@dataclass
+class RebuildJob:
+    """
+    A masterlist rebuild: the sheet rows it posts (shuffled by ``seed``), the
+    id of the newest post from before it (0 for an empty channel) and the ids
+    of the posts it has sent so far, in order.
+    """
+
+    masterlist: str
+    seed: int
+    last_old: int
+    rows: list[list[str]]
+    posted: list[int] = field(default_factory=list)
+
+
+class RebuildJournal:
+    """SQLite record of the rebuilds that have not finished."""
+
+    def __init__(self, path: str = SUBS_STATE_PATH):
+        self.path = path
+        self._db = sqlite3.connect(path)
+        self._db.executescript(_SCHEMA)
+
+    def __repr__(self) -> str:
+        return f"RebuildJournal({self.path!r})"
+
+    def start(
+        self, masterlist: str, rows: list[list[str]], seed: int, last_old: int
+    ) -> RebuildJob:
+        """Record a new rebuild, replacing any unfinished one of the list."""
+        with self._db:
+            self._db.execute(
+                "DELETE FROM rebuild_posts WHERE masterlist = ?", (masterlist,)
+            )
+            self._db.execute(
+                "INSERT OR REPLACE INTO rebuilds (masterlist, seed, last_old, rows) "
+                "VALUES (?, ?, ?, ?)",
+                (masterlist, seed, last_old, json.dumps(rows)),
+            )
+        return RebuildJob(masterlist, seed, last_old, rows)
+
+    def get(self, masterlist: str) -> Optional[RebuildJob]:
+        """The unfinished rebuild of a masterlist, if there is one."""
+        job = self._db.execute(
+            "SELECT seed, last_old, rows FROM rebuilds WHERE masterlist = ?",
+            (masterlist,),
+        ).fetchone()
+        if job is None:
+            return None
+        seed, last_old, rows = job
+        posted = [
+            message_id
+            for (message_id,) in self._db.execute(
+                "SELECT message_id FROM rebuild_posts WHERE masterlist = ? "
+                "ORDER BY position",
+                (masterlist,),
+            )
+        ]
+        return RebuildJob(masterlist, seed, last_old, json.loads(rows), posted)
+
+    def unfinished(self) -> list[str]:
+        """The masterlists with an unfinished rebuild."""
+        return [
+            masterlist
+            for (masterlist,) in self._db.execute(
+                "SELECT masterlist FROM rebuilds ORDER BY masterlist"
+            )
+        ]
+
+    def record(self, job: RebuildJob, message_id: int) -> None:
+        """Record the next post of a rebuild as sent."""
+        with self._db:
+            self._db.execute(
+                "INSERT INTO rebuild_posts (masterlist, position, message_id) "
+                "VALUES (?, ?, ?)",
+                (job.masterlist, len(job.posted), message_id),
+            )
+        job.posted.append(message_id)
+
+    def finish(self, masterlist: str) -> None:
+        """Forget a rebuild that has finished or been rolled back."""
+        with self._db:
+            self._db.execute(
+                "DELETE FROM rebuild_posts WHERE masterlist = ?", (masterlist,)
+            )
+            self._db.execute("DELETE FROM rebuilds WHERE masterlist = ?", (masterlist,))
+
+
+scan_cursors = ScanCursors()
+rebuild_journal = RebuildJournal()
@@ -1,15 +1,129 @@
 import logging
-from random import choice
-from typing import Optional
+from collections import Counter
+from dataclasses import dataclass
+from random import Random, choice
+from typing import Iterable, Optional
 
 from discord import Message
 
+from supermod._sheets import sheets_mirror, write_buffer
 from supermod.album_classes import Sub, SubError
 from supermod.features.submissions._constants import *
 
 logger = logging.getLogger(__name__)
 
 
+class SubmissionIndex:
+    """
+    The open submissions in #submissions by status: new (no reaction yet) or
+    halted (reacted 🇭). Each is indexed with its message and how many of each
+    reaction it has, so the channel's reaction events can move it from one
+    status to the other. One that is resolved (any other reaction) is dropped;
+    only the id of the newest submission seen is kept.
+    """
+
+    def __init__(self):
+        self._reactions: dict[int, Counter[str]] = {}
+        self._messages: dict[int, Message] = {}
+        self._verdicts: dict[int, Verdict] = {}
+        self._newest: Optional[int] = None
+
+    def __contains__(self, msg_id: int) -> bool:
+        return msg_id in self._reactions
+
+    def status(self, msg_id: int) -> Optional[str]:
+        """
+        The status of an indexed submission, or None if it is not indexed.
+        It is "resolved" only in the update that drops it.
+        """
+        reactions = self._reactions.get(msg_id)
+        if reactions is None:
+            return None
+        if not +reactions:
+            return "new"
+        return "halted" if reactions["🇭"] > 0 else "resolved"
+
+    def _update(self, msg_id: int, msg: Optional[Message] = None) -> Optional[str]:
+        status = self.status(msg_id)
+        if status == "resolved":
+            self.remove([msg_id])
+        elif msg is not None and msg is not self._messages.get(msg_id):
+            self._messages[msg_id] = msg
+            self._verdicts.pop(msg_id, None)
+        return status
+
+    def add(self, msg: Message) -> None:
+        """Index a submission as it is now, replacing what was known of it."""
+        self._newest = max(self._newest or 0, msg.id)
+        self._reactions[msg.id] = Counter(
+            {str(reaction.emoji): reaction.count for reaction in msg.reactions}
+        )
+        self._update(msg.id, msg)
+
+    def edit(self, msg: Message) -> None:
+        """Keep the edited content of an open submission."""
+        if msg.id in self._messages:
+            self._messages[msg.id] = msg
+            self._verdicts.pop(msg.id, None)
+
+    def verdicts(self) -> dict[int, "Verdict"]:
+        """The verdicts reached on the open submissions so far."""
+        return dict(self._verdicts)
+
+    def judge(self, msg: Message, verdict: "Verdict") -> None:
+        """Keep a submission's verdict, unless it was edited or resolved since."""
+        if self._messages.get(msg.id) is msg:
+            self._verdicts[msg.id] = verdict
+
+    def react(self, msg_id: int, emoji: str, change: int) -> Optional[str]:
+        """
+        Count a reaction added (change 1) or removed (change -1) and return
+        the submission's status after it.
+        """
+        reactions = self._reactions.get(msg_id)
+        if reactions is None:
+            return None
+        reactions[emoji] = max(reactions[emoji] + change, 0)
+        return self._update(msg_id)
+
+    def clear(self, msg_id: int, emoji: Optional[str] = None) -> Optional[str]:
+        """Forget a submission's reactions (of one emoji, or all of them)."""
+        reactions = self._reactions.get(msg_id)
+        if reactions is None:
+            return None
+        if emoji is None:
+            reactions.clear()
+        else:
+            reactions.pop(emoji, None)
+        return self._update(msg_id)
+
+    def remove(self, msg_ids: Iterable[int]) -> None:
+        for msg_id in msg_ids:
+            self._reactions.pop(msg_id, None)
+            self._messages.pop(msg_id, None)
+            self._verdicts.pop(msg_id, None)
+
+    def open(self, halted: bool = False) -> list[Message]:
+        """The new submissions, or the halted ones, newest first."""
+        status = "halted" if halted else "new"
+        return [
+            self._messages[msg_id]
+            for msg_id in sorted(self._messages, reverse=True)
+            if self.status(msg_id) == status
+        ]
+
+    def oldest(self, *statuses: str) -> Optional[int]:
+        """The id of the oldest submission with one of these statuses."""
+        return min(
+            (msg_id for msg_id in self._reactions if self.status(msg_id) in statuses),
+            default=None,
+        )
+
+    def newest(self) -> Optional[int]:
+        """The id of the newest submission indexed, resolved ones included."""
+        return self._newest
+
+
 def msgs_by_index(
     response: Message, subs_dict: dict[str, Sub | SubError]
 ) -> tuple[list[str], list[Message]]:
@@ -30,6 +144,34 @@ def msgs_by_index(
     return sub_indices, sub_msgs
 
 
+def reaction_summary(indices: list[str], failed: list[str], action: str) -> str:
+    """
+    Report a reaction put on the submissions numbered ``indices``, e.g.
+    "Albums 1, 2 were rejected. Album 3 could not be rejected; try again."
+    """
+    done = [ind for ind in indices if ind not in failed]
+    summary = []
+    if len(done) == 1:
+        summary.append(f"Album {done[0]} was {action}.")
+    elif done:
+        summary.append("Albums " + ", ".join(done) + f" were {action}.")
+    if len(failed) == 1:
+        summary.append(f"Album {failed[0]} could not be {action}; try again.")
+    elif failed:
+        summary.append(
+            "Albums " + ", ".join(failed) + f" could not be {action}; try again."
+        )
+    return " ".join(summary)
+
+
+def masterlist_link(masterlist: str, msg_id: int) -> str:
+    """Link to a masterlist post, built from its ids rather than fetched."""
+    return (
+        "https://discord.com/channels/"
+        f"{SERVER}/{MASTERLIST_CHANNEL_DICT[masterlist]}/{msg_id}"
+    )
+
+
 def _safe_int(value: str) -> int:
     """Parse an int, returning -1 on failure (e.g. blank or non-numeric cell)."""
     try:
@@ -38,8 +180,13 @@ def _safe_int(value: str) -> int:
         return -1
 
 
+def masterlist_wks(masterlist: str):
+    """Open the worksheet backing a masterlist."""
+    return subs_sheet().worksheet(masterlist.upper())
+
+
 def random_album(masterlist: str) -> Optional[Sub]:
-    rows = subs_sheet().worksheet(masterlist.upper()).get_all_values()[1:]
+    rows = sheets_mirror.rows(masterlist_wks(masterlist))[1:]
     unique: dict[tuple[str, str], list[str]] = {}
     for row in rows:
         unique.setdefault((row[0], row[1]), row)
@@ -60,99 +207,443 @@ def random_album(masterlist: str) -> Optional[Sub]:
     return sub
 
 
-def get_existing_subs_and_submitters(
-    masterlist: str,
-) -> tuple[list[tuple[str, str]], list[int]]:
-    """Get all submitters and submissions in a masterlist."""
-    subs: list[list[str]] = subs_sheet().worksheet(masterlist.upper()).get_all_values()[
-        1:
-    ]
-    existing_subs_in_masterlist = [(sub[0], sub[1]) for sub in subs]
-    submitters_in_masterlist = [_safe_int(sub[5]) for sub in subs]
+AlbumIndex = dict[tuple[str, str], int]
+"""(title, artist) -> the week an album was discussed, or its masterlist message id."""
+
+SubmitterIndex = dict[int, int]
+"""Submitter id -> the masterlist message id of their submission."""
+
+
+def _cell(row: list[str], col: int) -> str:
+    return row[col] if len(row) > col else ""
+
 
-    return existing_subs_in_masterlist, submitters_in_masterlist
+def album_index(rows: list[list[str]], value_col: int) -> AlbumIndex:
+    """
+    Index sheet rows by (title, artist), keeping the value in ``value_col``
+    (0-based) of the first row for each album. Blank or non-numeric values are
+    kept as -1, which the checks treat as no match.
+    """
+    index: AlbumIndex = {}
+    for row in rows:
+        index.setdefault(
+            (_cell(row, 0), _cell(row, 1)), _safe_int(_cell(row, value_col))
+        )
+    return index
+
+
+def masterlist_indexes(rows: list[list[str]]) -> tuple[AlbumIndex, SubmitterIndex]:
+    """Index the submissions and submitters in a masterlist sheet's rows."""
+    subs = rows[1:]
+    submitters: SubmitterIndex = {}
+    for sub in subs:
+        submitters.setdefault(_safe_int(_cell(sub, 5)), _safe_int(_cell(sub, 6)))
+
+    return album_index(subs, 6), submitters
+
+
+# The indexes last built from each sheet, with the mirror version they match.
+_indexes: dict[str, tuple[int, tuple[AlbumIndex, SubmitterIndex]]] = {}
+_discussed_index: dict[str, tuple[int, AlbumIndex]] = {}
 
 
 def get_check_data(
     masterlist: Optional[str],
-) -> tuple[
-    dict[str, list[tuple[str, str]]], dict[str, list[int]], list[tuple[str, str]]
-]:
+) -> tuple[dict[str, AlbumIndex], dict[str, SubmitterIndex], AlbumIndex]:
     """
     Get the data required for masterlist checks (submitters, submissions,
-    previously discussed albums).
+    previously discussed albums), indexed so that each check is a lookup. The
+    masterlist tabs that have to be read from Sheets are read in one request,
+    and a sheet that has not changed since it was last indexed is not read.
     """
-    existing_subs_dict: dict[str, list[tuple[str, str]]] = {}
-    submitters_dict: dict[str, list[int]] = {}
     if masterlist is None or masterlist == "halted":
-        for list_name in MASTERLIST_CHANNEL_DICT:
-            (
-                existing_subs_dict[list_name],
-                submitters_dict[list_name],
-            ) = get_existing_subs_and_submitters(list_name)
+        list_names = list(MASTERLIST_CHANNEL_DICT)
     elif masterlist in MASTERLIST_CHANNEL_DICT:
-        (
-            existing_subs_dict[masterlist],
-            submitters_dict[masterlist],
-        ) = get_existing_subs_and_submitters(masterlist)
-
-    discussed_albums = [
-        (entry[0], entry[1]) for entry in albums_wks().get_all_values()[1:]
-    ]
+        list_names = [masterlist]
+    else:
+        list_names = []
+
+    # Versions are taken before the reads, so an index built from rows that
+    # changed meanwhile is filed under the older version and not reused.
+    versions = {
+        list_name: sheets_mirror.version(masterlist_wks(list_name))
+        for list_name in list_names
+    }
+    indexes = {
+        list_name: _indexes[list_name][1]
+        for list_name, version in versions.items()
+        if version is not None
+        and list_name in _indexes
+        and _indexes[list_name][0] == version
+    }
+    to_read = [list_name for list_name in list_names if list_name not in indexes]
+    tabs = sheets_mirror.rows_many(
+        subs_sheet(), [list_name.upper() for list_name in to_read]
+    )
+    for list_name, rows in zip(to_read, tabs):
+        indexes[list_name] = masterlist_indexes(rows)
+        version = versions[list_name]
+        if version is not None:
+            _indexes[list_name] = (version, indexes[list_name])
+
+    existing_subs_dict: dict[str, AlbumIndex] = {}
+    submitters_dict: dict[str, SubmitterIndex] = {}
+    for list_name in list_names:
+        existing_subs_dict[list_name], submitters_dict[list_name] = indexes[list_name]
+
+    # A spreadsheet of its own, so a request of its own when it is not mirrored.
+    version = sheets_mirror.version(albums_wks())
+    cached = _discussed_index.get("albums")
+    if version is not None and cached is not None and cached[0] == version:
+        discussed_albums = cached[1]
+    else:
+        discussed_albums = album_index(sheets_mirror.rows(albums_wks())[1:], 2)
+        if version is not None:
+            _discussed_index["albums"] = (version, discussed_albums)
 
     return existing_subs_dict, submitters_dict, discussed_albums
 
 
-def discussed_check(
-    sub: Sub, discussed_albums: list[tuple[str, str]]
-) -> tuple[bool, int]:
-    """Check if a submission has been reviewed before in the server."""
-    try:
-        row = discussed_albums.index((sub.title, sub.artist))
-        cell = albums_wks().acell(f"C{row + 2}")
-        assert cell is not None
-        value = cell.value
-        assert value is not None
-        return True, int(value)
-    except (ValueError, AssertionError):
+def check_version(masterlist: str) -> Optional[tuple[int, int]]:
+    """
+    The mirror versions of the sheets a submission to a masterlist is checked
+    against (its tab and the discussed albums), or None if either is unknown.
+    """
+    listed = sheets_mirror.version(masterlist_wks(masterlist))
+    discussed = sheets_mirror.version(albums_wks())
+    if listed is None or discussed is None:
+        return None
+    return listed, discussed
+
+
+def _found(value: Optional[int]) -> tuple[bool, int]:
+    if value is None or value < 0:
         return False, 0
+    return True, value
+
+
+def discussed_check(sub: Sub, discussed_albums: AlbumIndex) -> tuple[bool, int]:
+    """Check if a submission has been reviewed before in the server."""
+    return _found(discussed_albums.get((sub.title, sub.artist)))
 
 
 def duplicate_check(
-    sub: Sub, existing_subs_dict: dict[str, list[tuple[str, str]]]
+    sub: Sub, existing_subs_dict: dict[str, AlbumIndex]
 ) -> tuple[bool, int]:
     """Check if an album is already in the masterlist."""
-    try:
-        row = existing_subs_dict[sub.masterlist].index((sub.title, sub.artist))
-        cell = subs_sheet().worksheet(sub.masterlist.upper()).acell(f"G{row + 2}")
-        assert cell is not None
-        value = cell.value
-        assert value is not None
-        return True, int(value)
-    except (ValueError, AssertionError):
-        return False, 0
+    return _found(existing_subs_dict[sub.masterlist].get((sub.title, sub.artist)))
 
 
 def user_already_in_masterlist_check(
-    sub: Sub, submitters_dict: dict[str, list[int]]
+    sub: Sub, submitters_dict: dict[str, SubmitterIndex]
 ) -> tuple[bool, int]:
     """Check if a user has already submitted an album in the masterlist."""
-    try:
-        row = submitters_dict[sub.masterlist].index(sub.submitter_id)
-        cell = subs_sheet().worksheet(sub.masterlist.upper()).acell(f"G{row + 2}")
-        assert cell is not None
-        value = cell.value
-        assert value is not None
-        return True, int(value)
-    except (ValueError, AssertionError):
-        return False, 0
+    return _found(submitters_dict[sub.masterlist].get(sub.submitter_id))
+
+
+def user_submission(masterlist: str, user_id: int) -> Optional[list[str]]:
+    """Return the sheet row of a user's submission in a masterlist, if any."""
+    rows = sheets_mirror.find_rows(masterlist_wks(masterlist), 6, f"{user_id}")
+    return rows[0] if rows else None
+
+
+def previous_submission(
+    masterlist: str, submitter_id: int
+) -> Optional[tuple[int, Optional[int]]]:
+    """
+    Return the masterlist message id of a submitter's existing entry in a
+    masterlist sheet and, for a packed message, the entry's line in it; None if
+    they have no entry.
+    """
+    rows = sheets_mirror.find_rows(masterlist_wks(masterlist), 6, f"{submitter_id}")
+    if not rows:
+        return None
+    line = _cell(rows[0], 7)
+    return int(rows[0][6]), int(line) if line.isdigit() else None
+
+
+def delete_submission_row(
+    masterlist: str, submitter_id: int, msg_id: int, line: Optional[int] = None
+) -> bool:
+    """
+    Delete a submitter's entry (matched on both submitter and message id) from
+    a masterlist sheet. The row is located in live data right before the
+    delete, as staff may have moved rows since the last cached read. When the
+    entry was taken out of a packed message at ``line``, the entries below it
+    in the message move up a line. Return whether an entry was found.
+    """
+    wks = masterlist_wks(masterlist)
+    found = None
+    shifted = []
+    for number, values in enumerate(live_rows(wks), start=1):
+        if number == 1 or _cell(values, 6) != f"{msg_id}":
+            continue
+        if found is None and _cell(values, 5) == f"{submitter_id}":
+            found = number
+        elif line is not None and _safe_int(_cell(values, 7)) > line:
+            shifted.append((number, _safe_int(_cell(values, 7)) - 1))
+    if found is None:
+        return False
+    if shifted:
+        wks.batch_update(
+            [{"range": f"H{number}", "values": [[f"{new}"]]} for number, new in shifted]
+        )
+    wks.delete_rows(found)
+    return True
+
+
+def edit_message_rows(masterlist: str, msg_id: int, rows: list[list[str]]) -> bool:
+    """
+    Replace the sheet rows of a masterlist message, located in live data as in
+    delete_submission_row: in place when the message holds as many entries as
+    before, otherwise by deleting them and appending the new ones. Return
+    whether the message had rows.
+    """
+    wks = masterlist_wks(masterlist)
+    numbers = [
+        number
+        for number, values in enumerate(live_rows(wks), start=1)
+        if number > 1 and _cell(values, 6) == f"{msg_id}"
+    ]
+    if not numbers:
+        return False
+    if len(numbers) == len(rows):
+        wks.batch_update(
+            [
+                {"range": f"A{number}:H{number}", "values": [row]}
+                for number, row in zip(numbers, rows)
+            ]
+        )
+        return True
+    # Highest first, so the rows above keep their numbers.
+    for start, end in _row_ranges(numbers[::-1]):
+        wks.delete_rows(start, end)
+    wks.append_rows(rows)
+    return True
+
+
+def delete_message_rows(masterlist: str, msg_ids: set[int]) -> int:
+    """
+    Delete the sheet rows of masterlist messages, located in live data, and
+    return how many there were.
+    """
+    wks = masterlist_wks(masterlist)
+    ids = {f"{msg_id}" for msg_id in msg_ids}
+    numbers = [
+        number
+        for number, values in enumerate(live_rows(wks), start=1)
+        if number > 1 and _cell(values, 6) in ids
+    ]
+    # Highest first, so the rows above keep their numbers.
+    for start, end in _row_ranges(numbers[::-1]):
+        wks.delete_rows(start, end)
+    return len(numbers)
+
+
+def submission_row(sub: Sub, msg_id: int, line: Optional[int] = None) -> list[str]:
+    """
+    Format a submission as a masterlist sheet row. ``line`` is its line in a
+    packed message, left blank for a message of its own.
+    """
+    return [
+        sub.title,
+        sub.artist,
+        sub.release_date,
+        ", ".join(sub.genres),
+        sub.submitter_name,
+        f"{sub.submitter_id}",
+        f"{msg_id}",
+        f"{line}" if line is not None else "",
+    ]
+
+
+def append_submission(sub: Sub, msg_id: int, line: Optional[int] = None) -> None:
+    """Queue a submission's sheet row (sent on the next write flush)."""
+    write_buffer(masterlist_wks(sub.masterlist)).append_row(
+        submission_row(sub, msg_id, line)
+    )
+
+
+def flush_submissions(masterlist: str) -> None:
+    """Send the rows queued for a masterlist's sheet, in one append_rows."""
+    write_buffer(masterlist_wks(masterlist)).flush()
+
+
+def append_submissions(masterlist: str, rows: list[list[str]]) -> None:
+    """
+    Send sheet rows to a masterlist's sheet, along with those queued for it,
+    in one append_rows.
+    """
+    buffer = write_buffer(masterlist_wks(masterlist))
+    buffer.append_rows(rows)
+    buffer.flush()
+
+
+def post_lines(post: str) -> list[str]:
+    """The entries of a masterlist post, one per (non-blank) line."""
+    return [line for line in post.split("\n") if line.strip()]
+
+
+def message_lines(count: int) -> list[Optional[int]]:
+    """
+    The lines to record for the ``count`` entries of a message: none for an
+    entry with a message of its own, unless it was posted to be packed.
+    """
+    if count == 1 and not SUBS_PACKED_POSTS:
+        return [None]
+    return list(range(count))
+
+
+def pack_posts(posts: list[str], limit: int = SUBS_POST_LENGTH) -> list[str]:
+    """Join masterlist posts, a line each, into as few messages as fit."""
+    packed: list[str] = []
+    for post in posts:
+        if packed and len(packed[-1]) + 1 + len(post) <= limit:
+            packed[-1] += "\n" + post
+        else:
+            packed.append(post)
+    return packed
+
+
+def masterlist_post_subs(post: str, masterlist: str) -> list[Sub]:
+    """Create the submissions in a masterlist post, one per line."""
+    return [masterlist_post_sub(line, masterlist) for line in post_lines(post)]
+
+
+def masterlist_post_sub(post: str, masterlist: str) -> Sub:
+    """
+    Create a submission from a formatted masterlist post string. The post only
+    mentions the submitter, so their name is left blank.
+    """
+    post_split_list = post.split("_by_")
+    title = post_split_list[0]
+    post_split_list = post_split_list[1].split("(", 1)
+    artist = post_split_list[0]
+    post_split_list = post_split_list[1].split(")", 1)
+    release_date = post_split_list[0]
+    post_split_list = post_split_list[1][2:].split(")")
+    genres = post_split_list[0]
+    sub_id = "".join(char for char in post_split_list[1] if char.isnumeric())
+
+    return Sub(
+        artist=artist,
+        title=title,
+        genres=genres,
+        release_date=release_date,
+        submitter_name="",
+        submitter_id=int(sub_id),
+        masterlist=masterlist,
+        message=None,
+    )
+
+
+def sheet_row_sub(row: list[str], masterlist: str) -> Sub:
+    """Create a submission from a masterlist sheet row."""
+    return Sub(
+        artist=row[1],
+        title=row[0],
+        genres=row[3],
+        release_date=row[2],
+        submitter_name=row[4],
+        submitter_id=_safe_int(row[5]),
+        masterlist=masterlist,
+        message=None,
+    )
+
+
+def rebuild_posts(rows: list[list[str]], seed: int, masterlist: str) -> list[str]:
+    """
+    The posts of a masterlist rebuild: its sheet rows, shuffled by seed, and
+    packed into as few messages as fit if SUBS_PACKED_POSTS is set.
+    """
+    rows = list(rows)
+    Random(seed).shuffle(rows)
+    posts = [sheet_row_sub(row, masterlist).masterlist_format() for row in rows]
+    return pack_posts(posts) if SUBS_PACKED_POSTS else posts
+
+
+def live_rows(wks) -> list[list[str]]:
+    """Read a worksheet past its snapshot, to address rows by number."""
+    wks.refresh()
+    return wks.get_all_values()
+
+
+def sheet_diff(
+    old_rows: list[list[str]], new_rows: list[list[str]]
+) -> tuple[list[tuple[int, list[str]]], list[int], list[list[str]]]:
+    """
+    Compare a masterlist sheet's rows with the rows it should hold, matching
+    them on their message id and line (columns G and H) and leaving out the
+    header. Return the rows to edit as (row number, new row), the row numbers
+    to delete (highest first) and the rows to append. Columns past the new
+    rows' width are not compared, so notes kept there survive.
+    """
+    wanted = {(row[6], row[7]): row for row in new_rows[1:]}
+    edits = []
+    deletes = []
+    kept = set()
+    for number, row in enumerate(old_rows[1:], start=2):
+        key = (_cell(row, 6), _cell(row, 7))
+        new = wanted.get(key)
+        if new is None or key in kept:
+            deletes.append(number)
+            continue
+        kept.add(key)
+        if [_cell(row, col) for col in range(len(new))] != new:
+            edits.append((number, new))
+    inserts = [row for row in new_rows[1:] if (row[6], row[7]) not in kept]
+
+    return edits, deletes[::-1], inserts
+
+
+def _row_ranges(numbers: list[int]) -> list[tuple[int, int]]:
+    """Merge row numbers (highest first) into (start, end) runs, highest first."""
+    ranges: list[tuple[int, int]] = []
+    for number in numbers:
+        if ranges and ranges[-1][0] == number + 1:
+            ranges[-1] = (number, ranges[-1][1])
+        else:
+            ranges.append((number, number))
+    return ranges
+
+
+def sync_sheet(wks, old_rows: list[list[str]], new_rows: list[list[str]]) -> int:
+    """
+    Bring a masterlist sheet holding ``old_rows`` (read live) to ``new_rows``
+    by sending only what changed, and return how many rows that was. When the
+    changes would take more requests than SUBS_SYNC_MAX_REQUESTS, or the header
+    is off, the sheet is rewritten in one go instead.
+    """
+    edits, deletes, inserts = sheet_diff(old_rows, new_rows)
+    ranges = _row_ranges(deletes)
+    changed = len(edits) + len(deletes) + len(inserts)
+    requests = bool(edits) + len(ranges) + bool(inserts)
+    width = len(new_rows[0])
+    header = [_cell(old_rows[0], col) for col in range(width)] if old_rows else []
+    if header != new_rows[0] or requests > SUBS_SYNC_MAX_REQUESTS:
+        wks.replace_all(new_rows)
+        return max(changed, 1)
+
+    if edits:
+        wks.batch_update(
+            [
+                {"range": f"A{number}:H{number}", "values": [row]}
+                for number, row in edits
+            ]
+        )
+    # Highest first, so the rows above keep their numbers.
+    for start, end in ranges:
+        wks.delete_rows(start, end)
+    if inserts:
+        wks.append_rows(inserts)
+    return changed
 
 
 def submission_check(
     sub: Sub,
-    existing_subs_dict: dict[str, list[tuple[str, str]]],
-    submitters_dict: dict[str, list[int]],
-    discussed_albums: list[tuple[str, str]],
+    existing_subs_dict: dict[str, AlbumIndex],
+    submitters_dict: dict[str, SubmitterIndex],
+    discussed_albums: AlbumIndex,
 ) -> int:
     # Check whether the album has been discussed before.
     check_1, week = discussed_check(sub, discussed_albums)
@@ -207,6 +698,16 @@ def submission_make(msg: Message) -> Sub | SubError:
     return sub_album
 
 
+def in_selection(sub_album: Sub | SubError, masterlist: Optional[str]) -> bool:
+    """Whether a submission is among those `,subs <masterlist>` shows."""
+    return (
+        masterlist is None
+        or masterlist == "halted"
+        or (isinstance(sub_album, Sub) and sub_album.masterlist == masterlist)
+        or (isinstance(sub_album, SubError) and masterlist == "error")
+    )
+
+
 def masterlist_dict(
     msgs: list[Message], masterlist: Optional[str]
 ) -> dict[str, Sub | SubError]:
@@ -218,13 +719,80 @@ def masterlist_dict(
     entry = 1
     for msg in msgs:
         sub_album = submission_make(msg)
-        if (
-            masterlist is None
-            or masterlist == "halted"
-            or (isinstance(sub_album, Sub) and sub_album.masterlist == masterlist)
-            or (isinstance(sub_album, SubError) and masterlist == "error")
-        ):
+        if in_selection(sub_album, masterlist):
             subs_dict[str(entry)] = sub_album
             entry += 1
 
     return subs_dict
+
+
+@dataclass
+class Verdict:
+    """
+    A submission as parsed and checked: its Sub (with its warning) or
+    SubError, the id the warning points at (a week or a masterlist message)
+    and the versions of the sheets it was checked against.
+    """
+
+    sub: Sub | SubError
+    error_id: int = 0
+    version: Optional[tuple[int, int]] = None
+
+
+def submission_verdicts(
+    msgs: list[Message], verdicts: dict[int, Verdict]
+) -> list[Verdict]:
+    """
+    The verdicts on some submissions, reusing those already reached (keyed
+    by message id) that were checked against the sheets as they are now.
+    The rest are parsed and checked, with the check data read once.
+    """
+    versions: dict[str, Optional[tuple[int, int]]] = {}
+
+    def version_of(masterlist: str) -> Optional[tuple[int, int]]:
+        if masterlist not in versions:
+            versions[masterlist] = check_version(masterlist)
+        return versions[masterlist]
+
+    results: list[Optional[Verdict]] = []
+    to_check: list[tuple[int, Sub, Optional[tuple[int, int]]]] = []
+    for msg in msgs:
+        verdict = verdicts.get(msg.id)
+        if verdict is not None and (
+            isinstance(verdict.sub, SubError)
+            or (
+                verdict.version is not None
+                and verdict.version == version_of(verdict.sub.masterlist)
+            )
+        ):
+            results.append(verdict)
+            continue
+        sub = submission_make(msg)
+        if isinstance(sub, Sub) and sub.masterlist not in MASTERLIST_CHANNEL_DICT:
+            logger.warning(
+                "Submission %s names no masterlist: %s", msg.id, sub.masterlist
+            )
+            sub = SubError(message=msg)
+        if isinstance(sub, SubError):
+            results.append(Verdict(sub))
+            continue
+        to_check.append((len(results), sub, version_of(sub.masterlist)))
+        results.append(None)
+
+    if to_check:
+        masterlists = {sub.masterlist for _, sub, _ in to_check}
+        selection = masterlists.pop() if len(masterlists) == 1 else None
+        if any(version is None for _, _, version in to_check):
+            # The sheets are not all in the mirror yet: read them in first, so
+            # the verdicts can be filed under the versions they are checked on.
+            get_check_data(selection)
+            versions.clear()
+            to_check = [
+                (position, sub, version_of(sub.masterlist))
+                for position, sub, _ in to_check
+            ]
+        data = get_check_data(selection)
+        for position, sub, version in to_check:
+            results[position] = Verdict(sub, submission_check(sub, *data), version)
+
+    return [verdict for verdict in results if verdict is not None]
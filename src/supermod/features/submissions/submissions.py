@@ -1,19 +1,45 @@
 import asyncio
 import logging
 from asyncio.exceptions import TimeoutError
-from random import shuffle
-from typing import Optional
-
-from discord import Message
+from functools import partial
+from random import randrange
+from typing import Any, Awaitable, Callable, Coroutine, Optional
+
+from discord import (
+    HTTPException,
+    Message,
+    NotFound,
+    Object,
+    RawBulkMessageDeleteEvent,
+    RawMessageDeleteEvent,
+    RawMessageUpdateEvent,
+    RawReactionActionEvent,
+    RawReactionClearEmojiEvent,
+    RawReactionClearEvent,
+    TextChannel,
+)
 from discord.abc import Messageable
 from discord.ext import commands, tasks
 from discord.ext.commands import Bot, Cog, Context
 
 from supermod._mode_setup import is_local
-from supermod._utils import is_staff, text_channel
+from supermod._sheets import background_priority, flush_writes, run_sheets
+from supermod._utils import (
+    DisplayNames,
+    RWLock,
+    is_staff,
+    text_channel,
+    with_retries,
+)
 from supermod.features.newsletter._utils import post_split
 from supermod.features.submissions._constants import *
+from supermod.features.submissions._state import (
+    RebuildJob,
+    rebuild_journal,
+    scan_cursors,
+)
 from supermod.features.submissions._utils import *
+from supermod.features.submissions._utils import _cell, _safe_int
 
 logger = logging.getLogger(__name__)
 
@@ -25,21 +51,45 @@ class Submissions(
 ):
     def __init__(self, bot: Bot):
         self.bot = bot
-        self.sheet_updating: bool = False
-        self.masterlist_updating: bool = False
+        # A sync rebuilds a masterlist's sheet or channel from scratch, so it
+        # holds that list's lock alone; adding submissions to the list shares
+        # it. Reads take no lock.
+        self.locks: dict[str, RWLock] = {
+            masterlist: RWLock() for masterlist in MASTERLIST_CHANNEL_DICT
+        }
+        self.display_names = DisplayNames(bot, SERVER)
+        # Each rewrite of a masterlist's packed posts reads the message and
+        # writes it whole, so they go one at a time.
+        self._packing: dict[str, asyncio.Lock] = {
+            masterlist: asyncio.Lock() for masterlist in MASTERLIST_CHANNEL_DICT
+        }
+        # Masterlist posts the bot deletes itself, and takes off the sheet.
+        self._own_deletes: set[int] = set()
+        # Masterlists whose channel changed while they were being synced.
+        self._missed: set[str] = set()
+        # The submissions in #submissions, read in once and then kept current
+        # from the channel's events.
+        self.submissions = SubmissionIndex()
+        self._submissions_read = False
+        self._submissions_lock = asyncio.Lock()
+        # Background work: submissions checked as they come in, and the
+        # links of a review confirmed after it is posted.
+        self._checks: set[asyncio.Task] = set()
+        # Reactions in #submissions share one rate limit.
+        self._reacting = asyncio.Semaphore(SUBS_REACTION_CONCURRENCY)
+        for masterlist in rebuild_journal.unfinished():
+            logger.warning(
+                "The last %s masterlist update did not finish.", masterlist.upper()
+            )
 
         if is_local():
             logger.info("Submission sheets will not be updated (local mode).")
         else:
             self.subs_sheet_update.start()
+            self.read_submissions.start()
 
-    @tasks.loop(hours=12)
+    @tasks.loop(minutes=SUBS_SYNC_INTERVAL)
     async def subs_sheet_update(self):
-        if self.sheet_updating or self.masterlist_updating:
-            logger.info(
-                "subs_sheet_update loop: a manual update is in progress; skipping."
-            )
-            return
         try:
             approval_channel = text_channel(self.bot, SUB_APPROVAL_CHANNEL)
             if approval_channel is None:
@@ -47,40 +97,260 @@ class Submissions(
                     "subs_sheet_update loop: approval channel not found; skipping."
                 )
                 return
-            self.sheet_updating = True
-            for masterlist in MASTERLIST_CHANNEL_DICT:
-                await self._update_subs_sheet(approval_channel, masterlist)
+            # Only the changes are sent, so this can run often; it posts in the
+            # approval channel only if a list fails. One list at a time, so the
+            # others stay open to ,subs ok and ,submit meanwhile.
+            with background_priority():
+                await self._sync_masterlists(
+                    approval_channel,
+                    list(MASTERLIST_CHANNEL_DICT),
+                    partial(self._update_subs_sheet, quiet=True),
+                    quiet=True,
+                    concurrency=1,
+                )
         except Exception:
             logger.exception("subs_sheet_update loop error.")
-        finally:
-            self.sheet_updating = False
 
     @subs_sheet_update.before_loop
     async def before_subs_sheet_update(self) -> None:
         await self.bot.wait_until_ready()
+        unfinished = rebuild_journal.unfinished()
+        approval_channel = text_channel(self.bot, SUB_APPROVAL_CHANNEL)
+        if unfinished and approval_channel is not None:
+            await approval_channel.send(
+                "These masterlist updates did not finish: "
+                + ", ".join(masterlist.upper() for masterlist in unfinished)
+                + ". Their sheets will not be synced until they are resumed with "
+                "`,update_masterlist <masterlist>` or undone with "
+                "`,rollback_masterlist <masterlist>`."
+            )
+
+    @tasks.loop(count=1)
+    async def read_submissions(self):
+        submissions_channel = text_channel(self.bot, SUBMISSIONS_CHANNEL)
+        if submissions_channel is None:
+            logger.warning("read_submissions: submissions channel not found.")
+            return
+        try:
+            index = await self._submissions_index(submissions_channel)
+            await self._background_check(index.open() + index.open(halted=True))
+        except Exception:
+            logger.exception("read_submissions error.")
+
+    @read_submissions.before_loop
+    async def before_read_submissions(self) -> None:
+        await self.bot.wait_until_ready()
+
+    # --- keeping the sheets current between syncs -----------------------------
+    # Changes made in a masterlist channel go straight to its sheet; the
+    # periodic sync is left to catch anything missed. While a list is being
+    # synced its events are not applied; the list is marked instead, and its
+    # sheet synced again from the channel as soon as the sync is over.
+
+    @Cog.listener()
+    async def on_message(self, msg: Message):
+        if msg.channel.id == SUBMISSIONS_CHANNEL:
+            self.submissions.add(msg)
+            self._check_in_background([msg])
+            return
+        masterlist = CHANNEL_MASTERLIST_DICT.get(msg.channel.id)
+        # The bot's own posts are put on the sheet by whatever posted them.
+        if masterlist is None or msg.author == self.bot.user:
+            return
+        subs = await self._listed_subs(msg, masterlist)
+        if subs is None or self._syncing(masterlist):
+            return
+        async with self.locks[masterlist].read():
+            for sub, line in zip(subs, message_lines(len(subs))):
+                await run_sheets(append_submission, sub, msg.id, line)
+            await flush_writes()
+        logger.info("Added message %s to the %s sheet.", msg.id, masterlist.upper())
+
+    @Cog.listener()
+    async def on_raw_message_edit(self, payload: RawMessageUpdateEvent):
+        if payload.channel_id == SUBMISSIONS_CHANNEL:
+            self.submissions.edit(payload.message)
+            self._check_in_background([payload.message])
+            return
+        masterlist = CHANNEL_MASTERLIST_DICT.get(payload.channel_id)
+        # The bot's own edits (to packed posts) update the sheet themselves.
+        if masterlist is None or payload.message.author == self.bot.user:
+            return
+        cached = payload.cached_message
+        if cached is not None and cached.content == payload.message.content:
+            return  # An embed loading, not an edit.
+        subs = await self._listed_subs(payload.message, masterlist)
+        if subs is None or self._syncing(masterlist):
+            return
+        rows = [
+            submission_row(sub, payload.message_id, line)
+            for sub, line in zip(subs, message_lines(len(subs)))
+        ]
+        async with self.locks[masterlist].read():
+            await flush_writes()
+            await run_sheets(edit_message_rows, masterlist, payload.message_id, rows)
+        logger.info(
+            "Updated message %s on the %s sheet.",
+            payload.message_id,
+            masterlist.upper(),
+        )
+
+    @Cog.listener()
+    async def on_raw_message_delete(self, payload: RawMessageDeleteEvent):
+        if payload.channel_id == SUBMISSIONS_CHANNEL:
+            self.submissions.remove({payload.message_id})
+            return
+        await self._delete_rows(payload.channel_id, {payload.message_id})
+
+    @Cog.listener()
+    async def on_raw_bulk_message_delete(self, payload: RawBulkMessageDeleteEvent):
+        if payload.channel_id == SUBMISSIONS_CHANNEL:
+            self.submissions.remove(payload.message_ids)
+            return
+        await self._delete_rows(payload.channel_id, payload.message_ids)
+
+    # --- keeping the submissions index current --------------------------------
+    # A reaction moves a submission between new, halted and resolved. One that
+    # is reopened (its last reaction taken off) has its message fetched again,
+    # as the index drops the submissions it resolves.
+
+    @Cog.listener()
+    async def on_raw_reaction_add(self, payload: RawReactionActionEvent):
+        if payload.channel_id == SUBMISSIONS_CHANNEL:
+            self.submissions.react(payload.message_id, str(payload.emoji), 1)
+
+    @Cog.listener()
+    async def on_raw_reaction_remove(self, payload: RawReactionActionEvent):
+        if payload.channel_id == SUBMISSIONS_CHANNEL:
+            self.submissions.react(payload.message_id, str(payload.emoji), -1)
+            await self._reopened(payload.message_id)
+
+    @Cog.listener()
+    async def on_raw_reaction_clear(self, payload: RawReactionClearEvent):
+        if payload.channel_id == SUBMISSIONS_CHANNEL:
+            self.submissions.clear(payload.message_id)
+            await self._reopened(payload.message_id)
+
+    @Cog.listener()
+    async def on_raw_reaction_clear_emoji(self, payload: RawReactionClearEmojiEvent):
+        if payload.channel_id == SUBMISSIONS_CHANNEL:
+            self.submissions.clear(payload.message_id, str(payload.emoji))
+            await self._reopened(payload.message_id)
+
+    async def _reopened(self, msg_id: int) -> None:
+        """
+        Fetch a submission that may have been reopened: one the index does not
+        know (resolved, or from before its window).
+        """
+        if msg_id in self.submissions:
+            return
+        submissions_channel = text_channel(self.bot, SUBMISSIONS_CHANNEL)
+        if submissions_channel is None or not self._submissions_read:
+            return
+        try:
+            msg = await submissions_channel.fetch_message(msg_id)
+        except HTTPException as e:
+            logger.warning("Could not fetch submission %s: %s", msg_id, e)
+            return
+        self.submissions.add(msg)
+        self._check_in_background([msg])
+
+    def _check_in_background(self, msgs: list[Message]) -> None:
+        self._in_background(self._background_check(msgs))
+
+    def _in_background(self, work: Coroutine[Any, Any, None]) -> None:
+        task = asyncio.create_task(work)
+        self._checks.add(task)
+        task.add_done_callback(self._background_done)
+
+    def _background_done(self, task: asyncio.Task) -> None:
+        self._checks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Background task failed.", exc_info=task.exception())
+
+    async def _background_check(self, msgs: list[Message]) -> None:
+        with background_priority():
+            await self._check_submissions(msgs)
+
+    async def _check_submissions(self, msgs: list[Message]) -> list[Verdict]:
+        """
+        Parse and check submissions (those whose verdict is missing or was
+        reached against sheets that have changed since) and keep the verdicts
+        in the index. Only the open submissions are checked.
+        """
+        msgs = [
+            msg for msg in msgs if self.submissions.status(msg.id) in ("new", "halted")
+        ]
+        if not msgs:
+            return []
+        verdicts = await run_sheets(
+            submission_verdicts, msgs, self.submissions.verdicts()
+        )
+        for msg, verdict in zip(msgs, verdicts):
+            self.submissions.judge(msg, verdict)
+        return verdicts
+
+    async def _listed_subs(self, msg: Message, masterlist: str) -> Optional[list[Sub]]:
+        """The submissions in a masterlist post, or None if it is not one."""
+        try:
+            subs = masterlist_post_subs(msg.content, masterlist)
+        except Exception as e:
+            logger.warning("Could not read masterlist message %s: %s", msg.id, e)
+            return None
+        mentioned = {user.id: user.display_name for user in msg.mentions}
+        names = await self.display_names.resolve(
+            sub.submitter_id for sub in subs if sub.submitter_id not in mentioned
+        )
+        names.update(mentioned)
+        if not subs or any(sub.submitter_id not in names for sub in subs):
+            return None
+        for sub in subs:
+            sub.submitter_name = names[sub.submitter_id]
+        return subs
+
+    def _syncing(self, masterlist: str) -> bool:
+        """Whether a masterlist is being synced, marking it as missing a change."""
+        if not self.locks[masterlist].writing:
+            return False
+        self._missed.add(masterlist)
+        return True
+
+    async def _delete_rows(self, channel_id: int, msg_ids: set[int]) -> None:
+        masterlist = CHANNEL_MASTERLIST_DICT.get(channel_id)
+        if masterlist is None:
+            return
+        own = msg_ids & self._own_deletes
+        self._own_deletes -= own
+        msg_ids = msg_ids - own
+        if not msg_ids or self._syncing(masterlist):
+            return
+        async with self.locks[masterlist].read():
+            # A row can only be found once its append has gone out.
+            await flush_writes()
+            deleted = await run_sheets(delete_message_rows, masterlist, msg_ids)
+        logger.info("Deleted %s rows from the %s sheet.", deleted, masterlist.upper())
 
     @commands.command(
         brief="Search for your submissions.",
         description="Search for your submissions. Optional argument: masterlist name.",
     )
     async def my_subs(self, ctx: Context, masterlist: Optional[str] = None):
-        if await self._updating_check(ctx):
-            return
-
         async def retrieve_sub(ctx: Context, masterlist: str):
-            wks = subs_sheet().worksheet(masterlist.upper())
-            sub_cell = wks.find(f"{ctx.author.id}")
-            if sub_cell is None:
+            sub_data = await run_sheets(user_submission, masterlist, ctx.author.id)
+            if sub_data is None:
                 return f"{masterlist}: No submission."
-            sub_data = wks.row_values(sub_cell.row)
             return f"{masterlist}: {sub_data[0]} by {sub_data[1]} ({sub_data[2]}) ({sub_data[3]})"
 
         if masterlist is None:
+            # The per-list lookups are independent, so run them side by side on
+            # the Sheets pool rather than one round-trip after another.
             message = f"<@!{ctx.author.id}> submissions:\n\n" + "\n".join(
-                [
-                    await retrieve_sub(ctx, masterlist.upper())
-                    for masterlist in MASTERLIST_CHANNEL_DICT
-                ]
+                await asyncio.gather(
+                    *(
+                        retrieve_sub(ctx, masterlist.upper())
+                        for masterlist in MASTERLIST_CHANNEL_DICT
+                    )
+                )
             )
             for chunk in post_split(message, 2000):
                 await ctx.send(chunk)
@@ -101,9 +371,6 @@ class Submissions(
     )
     @is_staff(STAFF_ROLE)
     async def submit(self, ctx: Context):
-        if await self._updating_check(ctx):
-            return
-
         await ctx.send(
             "You have 5 minutes to respond with your submission, "
             + "or with 'stop' to stop the submission process."
@@ -125,9 +392,11 @@ class Submissions(
                     "There is something wrong with the format of your submission."
                 )
                 return
+            if await self._updating_check(ctx, sub.masterlist):
+                return
 
-            existing_subs_dict, submitters_dict, discussed_albums = get_check_data(
-                sub.masterlist
+            existing_subs_dict, submitters_dict, discussed_albums = await run_sheets(
+                get_check_data, sub.masterlist
             )
             error_id = submission_check(
                 sub, existing_subs_dict, submitters_dict, discussed_albums
@@ -138,39 +407,20 @@ class Submissions(
                     f"**WARNING:** This album seems to have been discussed already on week {error_id}."
                 )
             elif sub.warning == "duplicate":
-                channel = text_channel(
-                    self.bot, MASTERLIST_CHANNEL_DICT[sub.masterlist]
-                )
-                if channel is None:
-                    logger.warning(
-                        "submit: masterlist channel for %s not found; "
-                        "skipping duplicate warning link.",
-                        sub.masterlist,
-                    )
-                    return
-                sub_msg = await channel.fetch_message(error_id)
                 await ctx.send(
                     f"**WARNING:** This album seems to be in {sub.masterlist.upper()} already. "
-                    + f"Link to existing submission: <{sub_msg.jump_url}>."
+                    + f"Link to existing submission: <{masterlist_link(sub.masterlist, error_id)}>."
                 )
             elif sub.warning == "user already in masterlist":
-                channel = text_channel(
-                    self.bot, MASTERLIST_CHANNEL_DICT[sub.masterlist]
-                )
-                if channel is None:
-                    logger.warning(
-                        "submit: masterlist channel for %s not found; "
-                        "skipping user-already-in-masterlist warning link.",
-                        sub.masterlist,
-                    )
-                    return
-                sub_msg = await channel.fetch_message(error_id)
                 await ctx.send(
                     f"**WARNING:** You seem to have a submission in {sub.masterlist.upper()} already. "
-                    + f"Link to existing submission: <{sub_msg.jump_url}>."
+                    + f"Link to existing submission: <{masterlist_link(sub.masterlist, error_id)}>."
                 )
             else:
-                await self._submit_album(sub)
+                async with self.locks[sub.masterlist].read():
+                    row = await self._submit_album(sub)
+                    if row is not None:
+                        await run_sheets(append_submissions, sub.masterlist, [row])
         except TimeoutError:
             await ctx.send("Time has run out.")
         except Exception:
@@ -192,9 +442,6 @@ class Submissions(
     )
     @is_staff(STAFF_ROLE)
     async def subs(self, ctx: Context, masterlist: Optional[str] = None):
-        if await self._updating_check(ctx):
-            return
-
         if masterlist is not None:
             masterlist = masterlist.lower()
 
@@ -258,72 +505,54 @@ class Submissions(
                     await ctx.send(
                         "I can't add submissions with errors to the masterlist."
                     )
-                elif masterlist == "halted":
-                    for _, sub in list(subs_dict.items()):
-                        if isinstance(sub, Sub) and sub.warning is None:
-                            assert sub.message is not None
-                            await sub.message.clear_reaction("🇭")
-                            await self._submit_album(sub)
-                    await ctx.send(
-                        "All new submissions without errors or warnings were added to the masterlists."
-                    )
-                elif masterlist is None:
-                    for _, sub in subs_dict.items():
-                        if isinstance(sub, Sub) and sub.warning is None:
-                            await self._submit_album(sub)
-                    await ctx.send(
-                        "All new submissions without errors or warnings were added to the masterlists."
-                    )
                 else:
-                    for _, sub in subs_dict.items():
-                        if (
-                            isinstance(sub, Sub)
-                            and sub.warning is None
-                            and sub.masterlist == masterlist
-                        ):
-                            await self._submit_album(sub)
-                    await ctx.send(
-                        "All new submissions without errors or warnings were added to the "
-                        f"{masterlist.upper()} masterlist."
+                    approved = [
+                        sub
+                        for sub in subs_dict.values()
+                        if isinstance(sub, Sub)
+                        and sub.warning is None
+                        and masterlist in (None, "halted", sub.masterlist)
+                    ]
+                    skipped, failed = await self._approve(
+                        approved, unhalt=masterlist == "halted"
                     )
+                    if failed:
+                        await ctx.send(
+                            "Something went wrong while adding submissions to "
+                            f"{', '.join(failed)} — it's been logged. Run `,subs` "
+                            "again to add the rest."
+                        )
+                    elif masterlist in (None, "halted"):
+                        await ctx.send(
+                            "All new submissions without errors or warnings were added to the masterlists."
+                        )
+                    elif not skipped:
+                        await ctx.send(
+                            "All new submissions without errors or warnings were added to the "
+                            f"{masterlist.upper()} masterlist."
+                        )
+                    if skipped:
+                        await ctx.send(
+                            f"Submissions for {', '.join(skipped)} were not added, as "
+                            "that masterlist is currently updating. Run `,subs` again "
+                            "once it is done."
+                        )
 
             # Reject submissions
             elif response.content.lower().startswith("reject"):
-                rej_sub_indices, rej_sub_msgs = msgs_by_index(response, subs_dict)
-                for msg in rej_sub_msgs:
-                    await msg.add_reaction("❌")
-                if len(rej_sub_indices) == 1:
-                    await ctx.send(f"Album {rej_sub_indices[0]} was rejected.")
-                elif len(rej_sub_indices) > 1:
-                    await ctx.send(
-                        "Albums " + ", ".join(rej_sub_indices) + " were rejected."
-                    )
+                await self._react_by_index(ctx, response, subs_dict, "❌", "rejected")
 
             # Halt submissions for later consideration.
             elif response.content.lower().startswith("halt") and masterlist != "halted":
-                halt_sub_indices, halt_sub_msgs = msgs_by_index(response, subs_dict)
-                for msg in halt_sub_msgs:
-                    await msg.add_reaction("🇭")
-                if len(halt_sub_indices) == 1:
-                    await ctx.send(f"Album {halt_sub_indices[0]} was halted.")
-                elif len(halt_sub_indices) > 1:
-                    await ctx.send(
-                        "Albums " + ", ".join(halt_sub_indices) + " were halted."
-                    )
+                await self._react_by_index(ctx, response, subs_dict, "🇭", "halted")
 
             # Unhalt halted submissions.
             elif (
                 response.content.lower().startswith("unhalt") and masterlist == "halted"
             ):
-                unhalt_sub_indices, unhalt_sub_msgs = msgs_by_index(response, subs_dict)
-                for msg in unhalt_sub_msgs:
-                    await msg.clear_reaction("🇭")
-                if len(unhalt_sub_indices) == 1:
-                    await ctx.send(f"Album {unhalt_sub_indices[0]} was unhalted.")
-                elif len(unhalt_sub_indices) > 1:
-                    await ctx.send(
-                        "Albums " + ", ".join(unhalt_sub_indices) + " were unhalted."
-                    )
+                await self._react_by_index(
+                    ctx, response, subs_dict, "🇭", "unhalted", clear=True
+                )
 
             else:
                 await ctx.send(
@@ -349,20 +578,17 @@ class Submissions(
     )
     @is_staff(STAFF_ROLE)
     async def get_random(self, ctx: Context, masterlist: Optional[str] = None):
-        if await self._updating_check(ctx):
-            return
-
         if masterlist is None:
             for mlist in [
                 key for key in MASTERLIST_CHANNEL_DICT.keys() if key != "voted"
             ]:
-                sub = random_album(mlist)
+                sub = await run_sheets(random_album, mlist)
                 if sub is None:
                     await ctx.send(f"No albums found in {mlist.upper()}.")
                     continue
                 await ctx.send(f"{mlist.upper()} choice: {sub.masterlist_format()}")
         elif masterlist.lower() in MASTERLIST_CHANNEL_DICT:
-            sub = random_album(masterlist)
+            sub = await run_sheets(random_album, masterlist)
             if sub is None:
                 await ctx.send(f"No albums found in {masterlist.upper()}.")
                 return
@@ -381,24 +607,19 @@ class Submissions(
     )
     @is_staff(STAFF_ROLE)
     async def update_sheet(self, ctx: Context, masterlist: Optional[str] = None):
-        if await self._updating_check(ctx):
-            return
-
-        self.sheet_updating = True
-
-        try:
-            if masterlist is None:
-                for mlist in MASTERLIST_CHANNEL_DICT:
-                    await self._update_subs_sheet(ctx, mlist)
-            elif masterlist.lower() in MASTERLIST_CHANNEL_DICT:
-                await self._update_subs_sheet(ctx, masterlist.lower())
-            else:
-                await ctx.send(
-                    "Please provide a valid masterlist name, or no name if you wish to update "
-                    + "all masterlists from the sheet data."
-                )
-        finally:
-            self.sheet_updating = False
+        if masterlist is None:
+            await self._sync_masterlists(
+                ctx, list(MASTERLIST_CHANNEL_DICT), self._update_subs_sheet
+            )
+        elif masterlist.lower() in MASTERLIST_CHANNEL_DICT:
+            await self._sync_masterlists(
+                ctx, [masterlist.lower()], self._update_subs_sheet
+            )
+        else:
+            await ctx.send(
+                "Please provide a valid masterlist name, or no name if you wish to update "
+                + "all masterlists from the sheet data."
+            )
 
     @commands.command(
         brief="Pass all submissions from a sheet to its corresponding masterlist in a random order.",
@@ -408,55 +629,253 @@ class Submissions(
     )
     @is_staff(STAFF_ROLE)
     async def update_masterlist(self, ctx: Context, masterlist: Optional[str] = None):
-        if await self._updating_check(ctx):
-            return
+        if masterlist is None:
+            await self._sync_masterlists(
+                ctx,
+                list(MASTERLIST_CHANNEL_DICT),
+                self._sheet_to_masterlist,
+                self._update_subs_sheet,
+            )
+        elif masterlist.lower() in MASTERLIST_CHANNEL_DICT:
+            await self._sync_masterlists(
+                ctx,
+                [masterlist.lower()],
+                self._sheet_to_masterlist,
+                self._update_subs_sheet,
+            )
+        else:
+            await ctx.send(
+                "Please provide a valid masterlist name, or no name if you wish to update "
+                + "all masterlists from the sheet data."
+            )
 
-        self.masterlist_updating = True
+    @commands.command(
+        brief="Undo a masterlist update that did not finish.",
+        description="Undo a masterlist update that did not finish (e.g. because the bot "
+        + "restarted): delete the posts it made and keep the masterlist as it was before. "
+        + "Argument: masterlist name (i.e. one of 'voted', 'new', 'modern', 'classic', 'theme', 'anything').",
+    )
+    @is_staff(STAFF_ROLE)
+    async def rollback_masterlist(self, ctx: Context, masterlist: str):
+        if masterlist.lower() in MASTERLIST_CHANNEL_DICT:
+            await self._sync_masterlists(
+                ctx, [masterlist.lower()], self._rollback_masterlist
+            )
+        else:
+            await ctx.send("Please provide a valid masterlist name.")
+
+    async def _sync_masterlists(
+        self,
+        ctx: Messageable,
+        masterlists: list[str],
+        *steps: Callable[[Messageable, str], Awaitable[None]],
+        quiet: bool = False,
+        concurrency: int = SUBS_SYNC_CONCURRENCY,
+    ) -> None:
+        """
+        Sync several masterlists side by side, at most ``concurrency`` at a
+        time. Each list reports its own progress, and one that fails is
+        reported without stopping the others. A quiet sync only reports
+        failures.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
 
-        try:
-            if masterlist is None:
-                for mlist in MASTERLIST_CHANNEL_DICT:
-                    await self._sheet_to_masterlist(ctx, mlist)
-                    await self._update_subs_sheet(ctx, mlist)
-            elif masterlist.lower() in MASTERLIST_CHANNEL_DICT:
-                await self._sheet_to_masterlist(ctx, masterlist.lower())
-                await self._update_subs_sheet(ctx, masterlist.lower())
-            else:
+        async def sync(masterlist: str) -> bool:
+            async with semaphore:
+                return await self._sync_masterlist(ctx, masterlist, *steps, quiet=quiet)
+
+        results = await asyncio.gather(
+            *(sync(masterlist) for masterlist in masterlists), return_exceptions=True
+        )
+        updated = 0
+        for masterlist, result in zip(masterlists, results):
+            if isinstance(result, BaseException):
+                logger.error(
+                    "Sync of the %s masterlist failed.",
+                    masterlist.upper(),
+                    exc_info=result,
+                )
                 await ctx.send(
-                    "Please provide a valid masterlist name, or no name if you wish to update "
-                    + "all masterlists from the sheet data."
+                    f"Something went wrong while updating {masterlist.upper()} "
+                    "— it's been logged."
                 )
-        finally:
-            self.masterlist_updating = False
-
-    async def _updating_check(self, ctx: Context):
-        if self.sheet_updating:
-            await ctx.send("Submission sheets are currently updating. Try again later.")
-            return True
-
-        if self.masterlist_updating:
+            elif result:
+                updated += 1
+        if len(masterlists) > 1 and not quiet:
+            await ctx.send(f"{updated}/{len(masterlists)} masterlists updated.")
+
+    async def _sync_masterlist(
+        self,
+        ctx: Messageable,
+        masterlist: str,
+        *steps: Callable[[Messageable, str], Awaitable[None]],
+        quiet: bool = False,
+    ) -> bool:
+        """
+        Run the steps of a masterlist sync holding the list's lock alone, after
+        the submissions being added to it have gone in. A list that is being
+        synced already is skipped, and False returned. Changes made in the
+        channel meanwhile are then brought onto the sheet.
+        """
+        lock = self.locks[masterlist]
+        if lock.writing:
+            if not quiet:
+                await ctx.send(
+                    f"The {masterlist.upper()} masterlist is already updating. "
+                    "Skipping."
+                )
+            return False
+        async with lock.write():
+            for step in steps:
+                await step(ctx, masterlist)
+        while masterlist in self._missed:
+            self._missed.discard(masterlist)
+            async with lock.write():
+                await self._update_subs_sheet(ctx, masterlist, quiet=True)
+        return True
+
+    async def _updating_check(self, ctx: Context, masterlist: str) -> bool:
+        """Tell the user (and return True) if a masterlist is being synced."""
+        lock = self.locks.get(masterlist)
+        if lock is not None and lock.writing:
             await ctx.send(
-                "Masterlist channels are currently updating. Try again later."
+                f"The {masterlist.upper()} masterlist is currently updating. "
+                "Try again later."
             )
             return True
-
         return False
 
-    async def _submit_album(self, sub: Sub):
-        """Submit an album."""
+    async def _approve(
+        self, subs: list[Sub], unhalt: bool = False
+    ) -> tuple[list[str], list[str]]:
+        """
+        Add approved submissions to their masterlists: the lists side by side,
+        each under a share of its lock, and the submissions to one list in
+        order. Submissions for a list that is being synced are left for later.
+        Return the names of those lists, and of the lists that failed.
+        """
+        by_masterlist: dict[str, list[Sub]] = {}
+        for sub in subs:
+            by_masterlist.setdefault(sub.masterlist, []).append(sub)
+        results = await asyncio.gather(
+            *(
+                self._approve_list(masterlist, approved, unhalt)
+                for masterlist, approved in by_masterlist.items()
+            ),
+            return_exceptions=True,
+        )
+        skipped = []
+        failed = []
+        for masterlist, result in zip(by_masterlist, results):
+            if isinstance(result, BaseException):
+                logger.error(
+                    "Approving submissions to %s failed.",
+                    masterlist.upper(),
+                    exc_info=result,
+                )
+                failed.append(masterlist.upper())
+            elif not result:
+                skipped.append(masterlist.upper())
+        return skipped, failed
+
+    async def _approve_list(
+        self, masterlist: str, approved: list[Sub], unhalt: bool
+    ) -> bool:
+        """
+        Post approved submissions to a masterlist, then mark them approved in
+        #submissions all at once. False if the list is being synced.
+        """
+        lock = self.locks[masterlist]
+        if lock.writing:
+            return False
+        submitted: list[Sub] = []
+        # The sheet rows are kept until the list is posted, then sent in one
+        # request, however long the posting takes.
+        rows: list[list[str]] = []
+        async with lock.read():
+            try:
+                for sub in approved:
+                    if sub.request == "replace" and any(
+                        _cell(row, 5) == f"{sub.submitter_id}" for row in rows
+                    ):
+                        # The entry to replace has to be on the sheet first.
+                        await run_sheets(append_submissions, masterlist, rows)
+                        rows = []
+                    row = await self._submit_album(sub, react=False)
+                    if row is not None:
+                        rows.append(row)
+                    submitted.append(sub)
+            finally:
+                # Those posted go on the sheet (before a sync can clear it under
+                # them) and are marked even if a later one failed, so that they
+                # are not approved again.
+                try:
+                    await run_sheets(append_submissions, masterlist, rows)
+                finally:
+                    await asyncio.gather(
+                        *(self._mark_approved(sub, unhalt) for sub in submitted)
+                    )
+        return True
+
+    async def _mark_approved(self, sub: Sub, unhalt: bool) -> None:
+        assert sub.message is not None
+        if unhalt:
+            await self._react(sub.message, "🇭", clear=True)
+        await self._react(sub.message, "🆗")
+
+    async def _react(self, msg: Message, emoji: str, clear: bool = False) -> None:
+        """Add a reaction to a submission, or clear it, retrying what may pass."""
+        async with self._reacting:
+            if clear:
+                await with_retries(lambda: msg.clear_reaction(emoji))
+            else:
+                await with_retries(lambda: msg.add_reaction(emoji))
+
+    async def _react_by_index(
+        self,
+        ctx: Context,
+        response: Message,
+        subs_dict: dict[str, Sub | SubError],
+        emoji: str,
+        action: str,
+        clear: bool = False,
+    ) -> None:
+        """
+        Add (or clear) a reaction on the submissions a response names by
+        number, all at once, and report how it went in one message.
+        """
+        indices, msgs = msgs_by_index(response, subs_dict)
+        results = await asyncio.gather(
+            *(self._react(msg, emoji, clear) for msg in msgs), return_exceptions=True
+        )
+        failed = []
+        for ind, msg, result in zip(indices, msgs, results):
+            if isinstance(result, BaseException):
+                logger.error(
+                    "Could not mark submission %s %s.", msg.id, action, exc_info=result
+                )
+                failed.append(ind)
+        summary = reaction_summary(indices, failed, action)
+        if summary:
+            await ctx.send(summary)
+
+    async def _submit_album(self, sub: Sub, react: bool = True) -> Optional[list[str]]:
+        """
+        Submit an album, marking its message approved unless told not to.
+        Return its sheet row for the caller to send, or None if it could not be
+        posted.
+        """
 
         # If the submitter asks for a replacement:
         if sub.request == "replace":
-            wks = subs_sheet().worksheet(sub.masterlist.upper())
-            # Locate the submitter in the spreadsheet.
-            prev_sub_cell = wks.find(f"{sub.submitter_id}")
-            if prev_sub_cell is not None:
-                # If the submitter is in the spreadsheet, locate the message id of
-                # their previous submission in the same row as their user id.
-                prev_sub_row = prev_sub_cell.row
-                prev_sub_msg_id = wks.acell(f"G{prev_sub_row}").value
-                assert prev_sub_msg_id is not None
-                prev_sub_msg_id = int(prev_sub_msg_id)
+            # Their previous entry may still be sitting in the write buffer.
+            await run_sheets(flush_submissions, sub.masterlist)
+            # Locate the submitter in the spreadsheet, along with the message id
+            # of their previous submission in the same row as their user id.
+            prev_sub = await run_sheets(
+                previous_submission, sub.masterlist, sub.submitter_id
+            )
+            if prev_sub is not None:
                 # Get the channel corresponding to the requested masterlist and delete
                 # their previous submission.
                 channel = text_channel(
@@ -469,10 +888,23 @@ class Submissions(
                         sub.masterlist,
                     )
                 else:
-                    prev_sub_msg = await channel.fetch_message(prev_sub_msg_id)
-                    await prev_sub_msg.delete()
-                    # Delete their submission from the spreadsheet.
-                    wks.delete_rows(prev_sub_row)
+                    prev_sub_msg_id, line = prev_sub
+                    async with self._packing[sub.masterlist]:
+                        prev_sub_msg = await channel.fetch_message(prev_sub_msg_id)
+                        removed, line = await self._remove_entry(
+                            prev_sub_msg, sub.submitter_id, line
+                        )
+                    # Delete their submission from the spreadsheet, unless it
+                    # could not be found in the channel: the row is then the
+                    # only record of it.
+                    if removed:
+                        await run_sheets(
+                            delete_submission_row,
+                            sub.masterlist,
+                            sub.submitter_id,
+                            prev_sub_msg_id,
+                            line,
+                        )
 
         # Submit the album in the requested masterlist.
         masterlist_channel = text_channel(
@@ -484,23 +916,66 @@ class Submissions(
                 "cannot submit album.",
                 sub.masterlist,
             )
-            return
-        sub_msg = await masterlist_channel.send(sub.masterlist_format())
-        # Add the submission to the spreadsheet.
-        subs_sheet().worksheet(sub.masterlist.upper()).append_row(
-            [
-                sub.title,
-                sub.artist,
-                sub.release_date,
-                ", ".join(sub.genres),
-                sub.submitter_name,
-                f"{sub.submitter_id}",
-                f"{sub_msg.id}",
-            ]
-        )
+            return None
+        if SUBS_PACKED_POSTS:
+            async with self._packing[sub.masterlist]:
+                sub_msg_id, line = await self._post_packed(
+                    masterlist_channel, sub.masterlist_format()
+                )
+        else:
+            sub_msg_id = (await masterlist_channel.send(sub.masterlist_format())).id
+            line = None
         # Mark the submission as accepted.
-        assert sub.message is not None
-        await sub.message.add_reaction("🆗")
+        if react:
+            assert sub.message is not None
+            await sub.message.add_reaction("🆗")
+        return submission_row(sub, sub_msg_id, line)
+
+    async def _post_packed(self, channel: TextChannel, post: str) -> tuple[int, int]:
+        """
+        Add a post to the channel's last message if that is a packed post of
+        the bot's with room for it, or else send it as a new one. Return the
+        message id and the post's line in it. Callers hold the masterlist's
+        packing lock.
+        """
+        last = [msg async for msg in channel.history(limit=1)]
+        if last and last[0].author == self.bot.user:
+            lines = post_lines(last[0].content)
+            content = "\n".join(lines + [post])
+            if len(content) <= SUBS_POST_LENGTH:
+                await last[0].edit(content=content)
+                return last[0].id, len(lines)
+        return (await channel.send(post)).id, 0
+
+    async def _remove_entry(
+        self, msg: Message, submitter_id: int, line: Optional[int]
+    ) -> tuple[bool, Optional[int]]:
+        """
+        Take a submitter's entry out of a masterlist message: edit it out of a
+        packed message, or delete a message holding nothing else. The entry is
+        looked for at ``line`` first, then by its submitter mention. Return
+        whether it was taken out, and the line it was taken from (None if the
+        message was deleted). Callers hold the masterlist's packing lock.
+        """
+        lines = post_lines(msg.content)
+        mention = f"<@!{submitter_id}>"
+        if line is None or line >= len(lines) or not lines[line].endswith(mention):
+            matches = [i for i, text in enumerate(lines) if text.endswith(mention)]
+            line = matches[0] if matches else None
+        if len(lines) <= 1:
+            self._own_deletes.add(msg.id)
+            await msg.delete()
+            return True, None
+        if line is None:
+            logger.warning(
+                "Entry of %s not found in masterlist message %s; leaving its "
+                "sheet row.",
+                submitter_id,
+                msg.id,
+            )
+            return False, None
+        await msg.edit(content="\n".join(lines[:line] + lines[line + 1 :]))
+        return True, line
 
     async def _subs_check_msg(
         self, ctx: Context, masterlist: Optional[str]
@@ -509,8 +984,6 @@ class Submissions(
         Create the mod approval message for any new submissions and return
         the submissions dictionary.
         """
-        # Fetch submission history and keep those with no reaction.
-        msgs = []
         submissions_channel = text_channel(self.bot, SUBMISSIONS_CHANNEL)
         if submissions_channel is None:
             logger.warning("_subs_check_msg: submissions channel not found; aborting.")
@@ -519,17 +992,20 @@ class Submissions(
                 "configuration problem, so retrying won't help. Please let the staff know."
             )
             return {}
-        if masterlist == "halted":
-            async for msg in submissions_channel.history(limit=100):
-                if "🇭" in [reaction.emoji for reaction in msg.reactions]:
-                    msgs.append(msg)
-        else:
-            async for msg in submissions_channel.history(limit=100):
-                if not msg.reactions:
-                    msgs.append(msg)
-
-        # Create the appropriate submissions dictionary.
-        subs_dict = masterlist_dict(msgs, masterlist)
+        # Keep the submissions with no reaction, or those halted.
+        index = await self._submissions_index(submissions_channel)
+        msgs = index.open(halted=masterlist == "halted")
+
+        # Most were checked as they came in; those that were not, or that were
+        # checked against sheets that have changed since, are checked now.
+        verdicts = [
+            verdict
+            for verdict in await self._check_submissions(msgs)
+            if in_selection(verdict.sub, masterlist)
+        ]
+        subs_dict = {
+            str(ind): verdict.sub for ind, verdict in enumerate(verdicts, start=1)
+        }
 
         # Check if there are any new submissions.
         if not subs_dict:
@@ -546,14 +1022,11 @@ class Submissions(
 
             return {}
 
-        # Fetch the relevant data from the submissions spreadsheet and the discussed albums.
-        existing_subs_dict, submitters_dict, discussed_albums = get_check_data(
-            masterlist
-        )
-
-        # Perform the various checks on new submissions.
         check_list = []
-        for ind, sub in subs_dict.items():
+        # The masterlist entries the warnings link to, by submission number.
+        linked: dict[str, tuple[str, int]] = {}
+        for ind, verdict in enumerate(verdicts, start=1):
+            sub = verdict.sub
             # Check for errors.
             if isinstance(sub, SubError):
                 check_list.append(
@@ -561,12 +1034,9 @@ class Submissions(
                 )
                 continue
 
-            # Check whether the album has been reviewed before, whether it is already in the
-            # specified masterlist, or whether the user has a submission already in the
-            # specified masterlist.
-            error_id = submission_check(
-                sub, existing_subs_dict, submitters_dict, discussed_albums
-            )
+            # The album may have been reviewed before or already be in the
+            # specified masterlist, or the user may have a submission in it.
+            error_id = verdict.error_id
 
             # Append the relevant warning to the submissions check message.
             check_msg = f"**{ind}.** {sub.sub_check_msg_full()}"
@@ -576,40 +1046,20 @@ class Submissions(
                     f"**WARNING:** This album seems to have been discussed already on week {error_id}."
                 )
             elif sub.warning == "duplicate":
-                channel = text_channel(
-                    self.bot, MASTERLIST_CHANNEL_DICT[sub.masterlist]
+                linked[str(ind)] = (sub.masterlist, error_id)
+                check_msg += (
+                    "\n"
+                    f"**WARNING:** This album seems to be in {sub.masterlist.upper()} already. "
+                    f"Link to existing submission: <{masterlist_link(sub.masterlist, error_id)}>."
                 )
-                if channel is None:
-                    logger.warning(
-                        "_subs_check_msg: masterlist channel for %s not found; "
-                        "omitting duplicate warning link.",
-                        sub.masterlist,
-                    )
-                else:
-                    sub_msg = await channel.fetch_message(error_id)
-                    check_msg += (
-                        "\n"
-                        f"**WARNING:** This album seems to be in {sub.masterlist.upper()} already. "
-                        f"Link to existing submission: <{sub_msg.jump_url}>."
-                    )
             elif sub.warning == "user already in masterlist":
-                channel = text_channel(
-                    self.bot, MASTERLIST_CHANNEL_DICT[sub.masterlist]
+                linked[str(ind)] = (sub.masterlist, error_id)
+                check_msg += (
+                    "\n"
+                    f"**WARNING:** {sub.submitter_name} ({sub.submitter_id}) "
+                    f"seems to have a submission in {sub.masterlist.upper()} already. "
+                    f"Link to existing submission: <{masterlist_link(sub.masterlist, error_id)}>."
                 )
-                if channel is None:
-                    logger.warning(
-                        "_subs_check_msg: masterlist channel for %s not found; "
-                        "omitting user-already-in-masterlist warning link.",
-                        sub.masterlist,
-                    )
-                else:
-                    sub_msg = await channel.fetch_message(error_id)
-                    check_msg += (
-                        "\n"
-                        f"**WARNING:** {sub.submitter_name} ({sub.submitter_id}) "
-                        f"seems to have a submission in {sub.masterlist.upper()} already. "
-                        f"Link to existing submission: <{sub_msg.jump_url}>."
-                    )
 
             check_list.append(check_msg)
 
@@ -618,44 +1068,89 @@ class Submissions(
         subs_check = post_split(subs_check_msg_full, 2000)
         for sub_check in subs_check:
             await ctx.send(sub_check)
+        if SUBS_CHECK_LINKS and linked:
+            self._in_background(self._confirm_links(ctx, linked))
 
         return subs_dict
 
-    async def _masterlist_sub_make(self, post: str, masterlist: str) -> Sub:
-        """Create a submission from a formatted masterlist post string."""
-        post_split_list = post.split("_by_")
-        sub_data = [post_split_list[0]]
-        post_split_list = post_split_list[1].split("(", 1)
-        sub_data.append(post_split_list[0])
-        post_split_list = post_split_list[1].split(")", 1)
-        sub_data.append(post_split_list[0])
-        post_split_list = post_split_list[1][2:].split(")")
-        sub_data.append(post_split_list[0])
-        sub_id = ""
-        for i in post_split_list[1]:
-            if i.isnumeric():
-                sub_id += i
-        sub_data.append(sub_id)
-        user = await self.bot.fetch_user(int(sub_id))
-        sub_data.append(user.display_name)
-
-        sub_album = Sub(
-            artist=sub_data[1],
-            title=sub_data[0],
-            genres=sub_data[3],
-            release_date=sub_data[2],
-            submitter_name=sub_data[5],
-            submitter_id=int(sub_data[4]),
-            masterlist=masterlist,
-            message=None,
-        )
-
-        return sub_album
+    async def _confirm_links(
+        self, ctx: Context, linked: dict[str, tuple[str, int]]
+    ) -> None:
+        """
+        Confirm that the masterlist entries a review linked to are still up,
+        one at a time as nobody is waiting, and point out those that are not.
+        """
+        missing = set()
+        for masterlist, msg_id in set(linked.values()):
+            channel = text_channel(self.bot, MASTERLIST_CHANNEL_DICT[masterlist])
+            if channel is None:
+                continue
+            try:
+                await channel.fetch_message(msg_id)
+            except NotFound:
+                missing.add((masterlist, msg_id))
+            except HTTPException as e:
+                logger.warning("Could not confirm masterlist post %s: %s", msg_id, e)
+        if missing:
+            numbers = [ind for ind, entry in linked.items() if entry in missing]
+            await ctx.send(
+                "The existing submissions linked for "
+                + ", ".join(numbers)
+                + " are no longer in their masterlists. Run `,update_sheet` to "
+                "bring the sheets up to date."
+            )
 
-    async def _update_subs_sheet(self, ctx: Messageable, masterlist: str) -> None:
-        """Pass all submissions from a masterlist to its corresponding sheet."""
+    async def _submissions_index(self, channel: TextChannel) -> SubmissionIndex:
+        """
+        The index of the submissions in #submissions, read in on first use:
+        the channel is read forward from just before the oldest submission
+        left open when the bot last ran (the newest 100 messages the very first
+        time). The cursor is moved up to the oldest open submission each time
+        the index is used.
+        """
+        async with self._submissions_lock:
+            if not self._submissions_read:
+                after = scan_cursors.get("open")
+                if after is None:
+                    history = channel.history(limit=SUBS_FIRST_READ)
+                else:
+                    history = channel.history(
+                        limit=None, after=Object(id=after), oldest_first=True
+                    )
+                async for msg in history:
+                    self.submissions.add(msg)
+                self._submissions_read = True
+            oldest_open = self.submissions.oldest("new", "halted")
+            newest = self.submissions.newest()
+            if oldest_open is not None:
+                scan_cursors.set("open", oldest_open - 1)
+            elif newest is not None:
+                scan_cursors.set("open", newest)
+        return self.submissions
+
+    async def _update_subs_sheet(
+        self, ctx: Messageable, masterlist: str, quiet: bool = False
+    ) -> None:
+        """
+        Bring a masterlist's sheet in line with its channel, sending only the
+        rows that changed. A quiet sync reports to the logs alone.
+        """
+        if rebuild_journal.get(masterlist) is not None:
+            # Its channel holds old and new posts side by side until then.
+            logger.warning(
+                "%s masterlist update did not finish; skipping sheet update.",
+                masterlist.upper(),
+            )
+            if not quiet:
+                await ctx.send(
+                    f"The last {masterlist.upper()} masterlist update did not "
+                    f"finish. Resume it with `,update_masterlist {masterlist}` or "
+                    f"undo it with `,rollback_masterlist {masterlist}` first."
+                )
+            return
         logger.info("Updating %s sheet.", masterlist.upper())
-        await ctx.send(f"Updating {masterlist.upper()} sheet.")
+        if not quiet:
+            await ctx.send(f"Updating {masterlist.upper()} sheet.")
 
         masterlist_channel = text_channel(self.bot, MASTERLIST_CHANNEL_DICT[masterlist])
         if masterlist_channel is None:
@@ -664,53 +1159,72 @@ class Submissions(
                 "skipping sheet update.",
                 masterlist,
             )
-            await ctx.send(
-                f"Could not find the {masterlist.upper()} channel. Skipping."
-            )
+            if not quiet:
+                await ctx.send(
+                    f"Could not find the {masterlist.upper()} channel. Skipping."
+                )
             return
 
-        subs_wks = subs_sheet().worksheet(masterlist.upper())
-        subs_wks.clear()
+        posts: list[tuple[Message, Sub, Optional[int]]] = []
         problem_subs = []
-        subs_wks.append_row(
-            [
-                "Title",
-                "Artist",
-                "Year",
-                "Genre",
-                "Submitter Name",
-                "Submitter ID",
-                "Message ID",
-            ]
-        )
-        async for msg in masterlist_channel.history():
+        async for msg in masterlist_channel.history(limit=None):
             try:
-                sub = await self._masterlist_sub_make(msg.content, masterlist)
-                subs_wks.append_row(
-                    [
-                        sub.title,
-                        sub.artist,
-                        sub.release_date,
-                        ", ".join(sub.genres),
-                        sub.submitter_name,
-                        f"{sub.submitter_id}",
-                        f"{msg.id}",
-                    ]
+                subs = masterlist_post_subs(msg.content, masterlist)
+                posts += zip([msg] * len(subs), subs, message_lines(len(subs)))
+            except Exception as e:
+                logger.warning(
+                    "Could not transfer submission %s to sheet: %s", msg.id, e
                 )
-                await asyncio.sleep(1)
-            except Exception:
-                logger.exception("Could not transfer submission %s to sheet.", msg.id)
                 problem_subs.append(msg.jump_url)
 
-        logger.info("%s sheet updated.", masterlist.upper())
-        await ctx.send(f"{masterlist.upper()} sheet updated.")
+        # A sync is the biggest consumer of Sheets quota; let commands that are
+        # waiting on a reply go first.
+        with background_priority():
+            subs_wks = await run_sheets(masterlist_wks, masterlist)
+            old_rows = await run_sheets(live_rows, subs_wks)
+            # Every submitter is looked up, so renames reach the sheet; the name
+            # already on it stands in for one who can no longer be found.
+            names = {
+                _safe_int(_cell(row, 5)): _cell(row, 4)
+                for row in old_rows[1:]
+                if _cell(row, 4)
+            }
+            names.update(
+                await self.display_names.resolve(
+                    sub.submitter_id for _, sub, _ in posts
+                )
+            )
+            rows = [SUBS_SHEET_HEADER]
+            for msg, sub, line in posts:
+                name = names.get(sub.submitter_id)
+                if name is None:
+                    logger.warning(
+                        "Could not transfer submission %s to sheet: submitter %s "
+                        "not found.",
+                        msg.id,
+                        sub.submitter_id,
+                    )
+                    problem_subs.append(msg.jump_url)
+                    continue
+                sub.submitter_name = name
+                rows.append(submission_row(sub, msg.id, line))
+            changed = await run_sheets(sync_sheet, subs_wks, old_rows, rows)
+
+        logger.info("%s sheet updated: %s rows changed.", masterlist.upper(), changed)
+        if quiet:
+            return
+        await ctx.send(f"{masterlist.upper()} sheet updated ({changed} rows changed).")
 
         if problem_subs:
             await ctx.send(f"Problem subs in {masterlist.upper()}:")
             await ctx.send("\n".join(problem_subs))
 
-    async def _sheet_to_masterlist(self, ctx: Context, masterlist: str) -> None:
-        """Pass all submissions from a sheet to its corresponding masterlist."""
+    async def _sheet_to_masterlist(self, ctx: Messageable, masterlist: str) -> None:
+        """
+        Repost all submissions from a sheet to its masterlist in a random order,
+        then delete the posts that were there before. The job is checkpointed,
+        so one that was cut short is resumed where it stopped.
+        """
         logger.info("Updating %s masterlist.", masterlist.upper())
 
         await ctx.send(f"Updating {masterlist.upper()} masterlist.")
@@ -726,23 +1240,45 @@ class Submissions(
                 f"Could not find the {masterlist.upper()} channel. Skipping."
             )
             return
-        await channel.purge(limit=100)
-        subs_wks = subs_sheet().worksheet(masterlist.upper())
-        albums = subs_wks.get_all_values()[1:]
-        shuffle(albums)
-        for album in albums:
-            sub = Sub(
-                artist=album[1],
-                title=album[0],
-                genres=album[3],
-                release_date=album[2],
-                submitter_name=album[4],
-                submitter_id=album[5],
-                masterlist=masterlist,
-                message=None,
-            )
-
-            await channel.send(sub.masterlist_format())
+        job = rebuild_journal.get(masterlist)
+        if job is None:
+            subs_wks = await run_sheets(masterlist_wks, masterlist)
+            albums = (await run_sheets(subs_wks.get_all_values))[1:]
+            newest = [msg.id async for msg in channel.history(limit=1)]
+            job = rebuild_journal.start(
+                masterlist, albums, randrange(2**32), newest[0] if newest else 0
+            )
+        else:
+            await self._adopt_posts(channel, job)
+            logger.info(
+                "Resuming %s masterlist update at post %s/%s.",
+                masterlist.upper(),
+                len(job.posted),
+                len(job.rows),
+            )
+            await ctx.send(
+                f"Resuming the unfinished {masterlist.upper()} update "
+                f"({len(job.posted)}/{len(job.rows)} posted)."
+            )
+
+        posts = rebuild_posts(job.rows, job.seed, masterlist)
+        loop = asyncio.get_running_loop()
+        while len(job.posted) < len(posts):
+            batch_start = loop.time()
+            start = len(job.posted)
+            for post in posts[start : start + SUBS_REBUILD_BATCH]:
+                msg = await channel.send(post)
+                rebuild_journal.record(job, msg.id)
+            if len(job.posted) < len(posts):
+                await asyncio.sleep(
+                    max(SUBS_REBUILD_PACE - (loop.time() - batch_start), 0)
+                )
+
+        # The old posts go only once the new ones are all up, however many
+        # there are; purge deletes them a hundred at a time.
+        if job.last_old:
+            await channel.purge(limit=None, before=Object(id=job.last_old + 1))
+        rebuild_journal.finish(masterlist)
 
         logger.info(
             "%s masterlist has been updated in a random order.", masterlist.upper()
@@ -751,3 +1287,44 @@ class Submissions(
         await ctx.send(
             f"{masterlist.upper()} masterlist has been updated in a random order."
         )
+
+    async def _rollback_masterlist(self, ctx: Messageable, masterlist: str) -> None:
+        """Delete the posts of an unfinished rebuild, keeping the old ones."""
+        job = rebuild_journal.get(masterlist)
+        if job is None:
+            await ctx.send(
+                f"The {masterlist.upper()} masterlist has no update to undo."
+            )
+            return
+        channel = text_channel(self.bot, MASTERLIST_CHANNEL_DICT[masterlist])
+        if channel is None:
+            logger.warning(
+                "_rollback_masterlist: masterlist channel for %s not found; "
+                "skipping rollback.",
+                masterlist,
+            )
+            await ctx.send(
+                f"Could not find the {masterlist.upper()} channel. Skipping."
+            )
+            return
+        await self._adopt_posts(channel, job)
+        posted = set(job.posted)
+        await channel.purge(
+            limit=None, after=Object(id=job.last_old), check=lambda m: m.id in posted
+        )
+        rebuild_journal.finish(masterlist)
+        logger.info("%s masterlist update rolled back.", masterlist.upper())
+        await ctx.send(f"The {masterlist.upper()} masterlist update has been undone.")
+
+    async def _adopt_posts(self, channel: TextChannel, job: RebuildJob) -> None:
+        """
+        Record the posts of a rebuild that went out after its last checkpoint:
+        the messages past it that read as the rebuild's next posts.
+        """
+        posts = rebuild_posts(job.rows, job.seed, job.masterlist)
+        after = Object(id=job.posted[-1] if job.posted else job.last_old)
+        async for msg in channel.history(limit=None, after=after, oldest_first=True):
+            if len(job.posted) == len(posts):
+                break
+            if msg.content == posts[len(job.posted)]:
+                rebuild_journal.record(job, msg.id)
@@ -0,0 +1,132 @@
+"""
+Fixtures for the end-to-end benchmarks. ``bench`` builds a fresh world for
+one data size: fake Sheets behind the production cache layer (with per-call
+latency and Google's 60 requests/minute quota), fake Discord channels holding
+the matching messages, and the cogs' lookups pointed at both.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+
+import pendulum
+import pytest
+
+from supermod.features.newsletter import _utils as news_utils
+from supermod.features.newsletter import newsletter
+from supermod.features.promotions import _utils as promo_utils
+from supermod.features.promotions import promotions
+from supermod.features.qotd import _utils as qotd_utils
+from supermod.features.qotd import qotd
+from supermod.features.submissions import _utils as sub_utils
+from supermod.features.submissions import submissions
+from supermod.features.submissions._state import RebuildJournal, ScanCursors
+from tests.bench import harness, micro
+from tests.bench.harness import (
+    MASTERLISTS,
+    SIZES,
+    Bench,
+    DiscordAPI,
+    FakeBot,
+    sheets,
+    worksheet,
+)
+from tests.fakes import SheetsBackend
+
+# Wednesday 2026-06-17 at the daily QOTD time; the promos due "now" use it too.
+NOW = pendulum.datetime(
+    2026, 6, 17, qotd.QOTD_HOUR, qotd.QOTD_MINUTE, tz="America/Toronto"
+)
+
+
+@pytest.fixture(params=list(SIZES))
+def bench(request, monkeypatch) -> Bench:
+    size = request.param
+    counts = SIZES[size]
+    latency = request.config.getoption("--bench-latency")
+    backend = SheetsBackend(latency=latency, per_minute=60)
+    api = DiscordAPI(latency=latency)
+    bot = FakeBot(api)
+    result = Bench(size, backend, api, bot)
+    rng = random.Random(470)
+
+    # Deliberate pauses (e.g. between sheet writes) are recorded, not waited.
+    real_sleep = asyncio.sleep
+
+    async def recorded_sleep(delay, result_=None):
+        result.slept.append(delay)
+        return await real_sleep(0, result_)
+
+    monkeypatch.setattr(asyncio, "sleep", recorded_sleep)
+    monkeypatch.setattr(
+        pendulum, "now", lambda tz=None: NOW.in_timezone(tz) if tz else NOW
+    )
+    for module in (submissions, newsletter, qotd, promotions):
+        monkeypatch.setattr(module, "is_local", lambda: True, raising=False)
+        monkeypatch.setattr(
+            module, "text_channel", lambda bot, channel_id: bot.get_channel(channel_id)
+        )
+
+    # Submissions: the masterlist channels and sheets, #submissions, albums.
+    masterlist_sheets = {}
+    for masterlist in MASTERLISTS:
+        channel = bot.channel(sub_utils.MASTERLIST_CHANNEL_DICT[masterlist], masterlist)
+        masterlist_sheets[masterlist.upper()] = harness.masterlist_rows(
+            masterlist, counts["masterlist_rows"], channel
+        )
+    monkeypatch.setattr(submissions, "rebuild_journal", RebuildJournal(":memory:"))
+    # The bot has run before: its scan of #submissions starts ahead of the
+    # pending submissions, however many there are.
+    cursors = ScanCursors(":memory:")
+    cursors.set("open", 0)
+    monkeypatch.setattr(submissions, "scan_cursors", cursors)
+    subs_sheet, _ = sheets(backend, masterlist_sheets)
+    monkeypatch.setattr(sub_utils, "subs_sheet", lambda: subs_sheet)
+    albums = worksheet(backend, harness.discussed_rows(counts["discussed_albums"]))
+    monkeypatch.setattr(sub_utils, "albums_wks", lambda: albums)
+    harness.pending_submissions(
+        counts["pending_subs"],
+        bot.channel(sub_utils.SUBMISSIONS_CHANNEL, "submissions"),
+        rng,
+    )
+    bot.channel(sub_utils.SUB_APPROVAL_CHANNEL, "approval")
+
+    # Newsletter.
+    news_sheet, _ = sheets(
+        backend,
+        {
+            f"{NOW.year} OL Rock Albums List": harness.newsletter_rows(
+                counts["newsletter_rows"], NOW.year
+            )
+        },
+    )
+    monkeypatch.setattr(news_utils, "news_sheet", lambda: news_sheet)
+
+    # QOTD and promotions.
+    questions = worksheet(backend, harness.question_rows(counts["questions"]))
+    monkeypatch.setattr(qotd_utils, "qotd_wks", lambda: questions)
+    bot.channel(qotd.QOTD_CHANNEL, "qotd")
+    promos = worksheet(backend, harness.promo_rows(counts["promos"], NOW.day, NOW.hour))
+    monkeypatch.setattr(promo_utils, "promos_wks", lambda: promos)
+    bot.channel(promotions.PROMOS_CHANNEL, "promos")
+
+    return result
+
+
+def pytest_sessionfinish(session):
+    if session.config.getoption("--bench-save-baseline") and micro.results:
+        micro.save_baseline(micro.results)
+
+
+def pytest_terminal_summary(terminalreporter):
+    if harness.results:
+        terminalreporter.section("benchmarks")
+        terminalreporter.write_line(harness.REPORT_HEADER)
+        for result in harness.results:
+            terminalreporter.write_line(result.row())
+    if micro.results:
+        terminalreporter.section("micro-benchmarks")
+        terminalreporter.write_line(micro.MICRO_HEADER)
+        for result in micro.results:
+            terminalreporter.write_line(result.row())
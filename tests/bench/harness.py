@@ -0,0 +1,437 @@
+"""
+Harness for the end-to-end benchmarks: a Discord stand-in whose REST calls
+are counted (and optionally slowed down), generators for realistic sheet and
+channel data, and the ``Bench`` recorder that runs a scenario and keeps its
+numbers for the end-of-run report.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import Any, Awaitable, Callable, Optional
+
+from supermod._sheets import CachedSpreadsheet, CachedWorksheet, SnapshotCache
+from tests.fakes import FakeWorksheet, LatencyWorksheet, SheetsBackend
+
+# The benchmarks record asyncio.sleep calls instead of waiting them out; the
+# simulated API latency still has to be waited for.
+_real_sleep = asyncio.sleep
+
+GUILD_ID = 6001
+STAFF_ID = 1
+MASTERLISTS = ("voted", "new", "modern", "classic", "theme", "anything")
+
+# Data sizes seen on the server today; the "10x" scenarios scale all of them.
+REALISTIC = {
+    "masterlist_rows": 80,
+    "pending_subs": 25,
+    "discussed_albums": 600,
+    "newsletter_rows": 400,
+    "questions": 250,
+    "promos": 20,
+}
+SIZES = {
+    "realistic": REALISTIC,
+    "10x": {name: count * 10 for name, count in REALISTIC.items()},
+}
+
+
+# --- Discord stand-in ---------------------------------------------------------
+
+
+class DiscordAPI:
+    """Counts the REST calls made through the fakes below, by kind."""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.calls: Counter[str] = Counter()
+
+    @property
+    def total(self) -> int:
+        return sum(self.calls.values())
+
+    async def call(self, name: str) -> None:
+        self.calls[name] += 1
+        if self.latency:
+            await _real_sleep(self.latency)
+
+
+_message_ids = itertools.count(10**17)
+
+
+class FakeMessage:
+    def __init__(
+        self,
+        api: DiscordAPI,
+        content: str,
+        channel: Optional[FakeChannel] = None,
+        author_id: int = STAFF_ID,
+        author_name: str = "tester",
+    ):
+        self.api = api
+        self.id = next(_message_ids)
+        self.content = content
+        self.channel = channel
+        self.author = SimpleNamespace(id=author_id, display_name=author_name)
+        self.reactions: list[SimpleNamespace] = []
+        channel_id = channel.id if channel is not None else 0
+        self.jump_url = (
+            f"https://discord.com/channels/{GUILD_ID}/{channel_id}/{self.id}"
+        )
+
+    async def add_reaction(self, emoji: str) -> None:
+        await self.api.call("add_reaction")
+        self.reactions.append(SimpleNamespace(emoji=emoji, count=1))
+
+    async def edit(self, content: str) -> None:
+        await self.api.call("edit_message")
+        self.content = content
+
+    async def clear_reaction(self, emoji: str) -> None:
+        await self.api.call("clear_reaction")
+        self.reactions = [r for r in self.reactions if r.emoji != emoji]
+
+    async def delete(self) -> None:
+        await self.api.call("delete_message")
+        if self.channel is not None:
+            self.channel.messages.remove(self)
+
+
+class FakeChannel:
+    """A text channel holding its messages oldest first."""
+
+    def __init__(self, api: DiscordAPI, channel_id: int, name: str = "channel"):
+        self.api = api
+        self.id = channel_id
+        self.name = name
+        self.messages: list[FakeMessage] = []
+
+    def add(self, content: str, **author: Any) -> FakeMessage:
+        message = FakeMessage(self.api, content, self, **author)
+        self.messages.append(message)
+        return message
+
+    async def send(self, content: Any = None, **kwargs: Any) -> FakeMessage:
+        await self.api.call("send")
+        # Posted by the bot (FakeBot.user).
+        return self.add(
+            str(content if content is not None else kwargs),
+            author_id=0,
+            author_name="Supermod",
+        )
+
+    async def fetch_message(self, message_id: int) -> FakeMessage:
+        await self.api.call("fetch_message")
+        for message in self.messages:
+            if message.id == message_id:
+                return message
+        raise LookupError(message_id)
+
+    def _between(self, before: Any = None, after: Any = None) -> list[FakeMessage]:
+        return [
+            m
+            for m in self.messages
+            if (before is None or m.id < before.id)
+            and (after is None or m.id > after.id)
+        ]
+
+    async def history(
+        self,
+        limit: Optional[int] = 100,
+        before: Any = None,
+        after: Any = None,
+        oldest_first: Optional[bool] = None,
+    ):
+        """One API call per page of 100 (as discord.py pages), newest first."""
+        messages = self._between(before, after)
+        if not (oldest_first or (oldest_first is None and after is not None)):
+            messages = messages[::-1]
+        messages = messages[:limit]
+        for start in range(0, max(len(messages), 1), 100):
+            await self.api.call("history")
+            for message in messages[start : start + 100]:
+                yield message
+
+    async def purge(
+        self,
+        limit: Optional[int] = 100,
+        check: Callable[[FakeMessage], bool] = lambda m: True,
+        before: Any = None,
+        after: Any = None,
+    ) -> list:
+        doomed = [m for m in self._between(before, after)[::-1][:limit] if check(m)]
+        # Bulk delete takes up to 100 messages a call.
+        for _ in range(0, max(len(doomed), 1), 100):
+            await self.api.call("purge")
+        self.messages = [m for m in self.messages if m not in doomed]
+        return doomed
+
+
+class FakeContext(FakeChannel):
+    """Command context: the channel the command was typed in, by staff."""
+
+    def __init__(self, api: DiscordAPI):
+        super().__init__(api, 9999, "staff-commands")
+        self.author = SimpleNamespace(id=STAFF_ID, display_name="staff")
+        self.channel = self
+
+
+class FakeBot:
+    """
+    The parts of discord.py's Bot the cogs use. ``wait_for`` answers with the
+    queued ``replies``, each a callable taking the bot.
+    """
+
+    def __init__(self, api: DiscordAPI):
+        self.api = api
+        self.user = SimpleNamespace(id=0, display_name="Supermod")
+        self.channels: dict[int, FakeChannel] = {}
+        self.replies: list[Callable[[FakeBot], Any]] = []
+        self.last_sent: Optional[FakeMessage] = None
+
+    def channel(self, channel_id: int, name: str = "channel") -> FakeChannel:
+        channel = self.channels.get(channel_id)
+        if channel is None:
+            channel = self.channels[channel_id] = FakeChannel(
+                self.api, channel_id, name
+            )
+        return channel
+
+    def get_channel(self, channel_id: int) -> Optional[FakeChannel]:
+        return self.channels.get(channel_id)
+
+    def get_guild(self, guild_id: int) -> SimpleNamespace:
+        async def fetch_member(member_id: int) -> SimpleNamespace:
+            await self.api.call("fetch_member")
+            return SimpleNamespace(id=member_id)
+
+        # An empty member cache, so every name is looked up.
+        return SimpleNamespace(
+            id=guild_id, fetch_member=fetch_member, get_member=lambda member_id: None
+        )
+
+    async def fetch_user(self, user_id: int) -> SimpleNamespace:
+        await self.api.call("fetch_user")
+        return SimpleNamespace(id=user_id, display_name=f"user{user_id}")
+
+    async def wait_for(self, event: str, *, timeout: float = 0, check=None) -> Any:
+        if not self.replies:
+            raise asyncio.TimeoutError
+        return self.replies.pop(0)(self)
+
+    async def wait_until_ready(self) -> None:
+        return None
+
+
+def invoke(cog: Any, command: str, ctx: FakeContext, *args: Any) -> Awaitable[Any]:
+    """Run a cog command's callback directly, skipping its checks."""
+    return getattr(cog, command).callback(cog, ctx, *args)
+
+
+def reply(content: str) -> Callable[[FakeBot], FakeMessage]:
+    """A wait_for("message") answer from staff."""
+    return lambda bot: FakeMessage(bot.api, content)
+
+
+def react(emoji: str, message: Callable[[FakeBot], Any]) -> Callable[[FakeBot], Any]:
+    """A wait_for("reaction_add") answer on the message picked by ``message``."""
+    user = SimpleNamespace(id=STAFF_ID, display_name="staff")
+    return lambda bot: (SimpleNamespace(emoji=emoji, message=message(bot)), user)
+
+
+# --- data generators ----------------------------------------------------------
+
+
+def album(i: int) -> tuple[str, str]:
+    return f"Album {i}", f"Artist {i}"
+
+
+SUBS_HEADER = [
+    "Title",
+    "Artist",
+    "Year",
+    "Genre",
+    "Submitter Name",
+    "Submitter ID",
+    "Message ID",
+    "Line",
+]
+
+
+def masterlist_rows(masterlist: str, count: int, channel: FakeChannel) -> list[list]:
+    """Post ``count`` albums in a masterlist channel and return its sheet rows."""
+    rows = [list(SUBS_HEADER)]
+    offset = MASTERLISTS.index(masterlist) * 100_000
+    for i in range(count):
+        title, artist = album(offset + i)
+        submitter = 10_000 + offset + i
+        message = channel.add(
+            f"{title} _by_ {artist} (2020) (Rock, Pop) <@!{submitter}>",
+            author_id=0,
+        )
+        rows.append(
+            [title, artist, "2020", "Rock, Pop", f"user{submitter}", f"{submitter}"]
+            + [f"{message.id}", ""]
+        )
+    return rows
+
+
+def pending_submissions(count: int, channel: FakeChannel, rng: random.Random) -> None:
+    """Post new submissions in #submissions; some repeat what is already listed."""
+    for i in range(count):
+        masterlist = MASTERLISTS[i % len(MASTERLISTS)]
+        if i % 5 == 4:
+            # An album that is in its masterlist already.
+            title, artist = album(MASTERLISTS.index(masterlist) * 100_000)
+        else:
+            title, artist = album(900_000 + i)
+        channel.add(
+            f"{title} // {artist} // 2021 // Rock // {masterlist}",
+            author_id=50_000 + rng.randrange(10 * count),
+            author_name=f"member{i}",
+        )
+
+
+def discussed_rows(count: int) -> list[list[str]]:
+    rows = [["Title", "Artist", "Week"]]
+    rows += [[*album(500_000 + i), f"{i // 10 + 1}"] for i in range(count)]
+    return rows
+
+
+def newsletter_rows(count: int, year: int) -> list[list[str]]:
+    """A newsletter sheet: five header rows, then releases spread over a year."""
+    rows = [["Header"] for _ in range(5)]
+    for i in range(count):
+        day = i % 360
+        month, mday = day // 30 + 1, day % 30 + 1
+        rows.append(
+            [
+                f"Artist {i}",
+                f"Release {i}",
+                f"{month}/{min(mday, 28)}/{year}",
+                "LP" if i % 3 else "EP",
+                "Rock, Pop",
+                "",
+                "Canada",
+                "",
+                "",
+                "",
+                "",
+                "Hard Rock, Soft Rock",
+            ]
+        )
+    return rows
+
+
+def question_rows(count: int) -> list[list[str]]:
+    rows = [["Type", "Repeatable", "Question", "Uses"]]
+    rows += [
+        ["Question", "Y" if i % 2 else "N", f"Question {i}?", "" if i % 3 else "1"]
+        for i in range(count)
+    ]
+    return rows
+
+
+def promo_rows(count: int, day: int, hour: int) -> list[list[str]]:
+    rows = [["Type", "Embed", "Name", "Message", "Day", "Time", "Members"]]
+    for i in range(count):
+        # One promo in ten is due at the benchmarked hour.
+        due = i % 10 == 0
+        rows.append(
+            [
+                "Creator" if i % 2 else "Partner",
+                "Yes" if i % 2 else "No",
+                f"Project {i}",
+                f"Check out project {i}!",
+                f"{day if due else (day % 27) + 1}",
+                f"{hour if due else (hour + 1) % 24}:00",
+                f"<@{70_000 + i}>" if i % 2 else "N/A",
+            ]
+        )
+    return rows
+
+
+# --- Sheets wiring ------------------------------------------------------------
+
+
+def sheets(
+    backend: SheetsBackend, worksheets: dict[str, list[list]]
+) -> tuple[CachedSpreadsheet, LatencyWorksheet]:
+    """
+    A spreadsheet with the given worksheets (the first one is also sheet1),
+    wrapped in the production cache layer with a cache of its own.
+    """
+    first = next(iter(worksheets.values()))
+    spreadsheet = LatencyWorksheet(first, backend=backend)
+    for title, rows in worksheets.items():
+        spreadsheet.add_worksheet(title, FakeWorksheet(rows))
+    return CachedSpreadsheet(spreadsheet, SnapshotCache()), spreadsheet
+
+
+def worksheet(backend: SheetsBackend, rows: list[list]) -> CachedWorksheet:
+    return CachedWorksheet(LatencyWorksheet(rows, backend=backend), SnapshotCache())
+
+
+# --- recording ----------------------------------------------------------------
+
+
+@dataclass
+class BenchResult:
+    scenario: str
+    size: str
+    wall_time: float
+    sheets_calls: Counter[str]
+    over_quota: int
+    discord_calls: Counter[str]
+    slept: float
+
+    def row(self) -> str:
+        return (
+            f"{self.scenario:<20} {self.size:<10} {self.wall_time:>8.2f} "
+            f"{sum(self.sheets_calls.values()):>7} {self.over_quota:>6} "
+            f"{sum(self.discord_calls.values()):>8} {self.slept:>8.0f}"
+        )
+
+
+REPORT_HEADER = (
+    f"{'scenario':<20} {'size':<10} {'wall s':>8} {'sheets':>7} {'>quota':>6} "
+    f"{'discord':>8} {'slept s':>8}"
+)
+
+results: list[BenchResult] = []
+
+
+@dataclass
+class Bench:
+    """The fake backends of one scenario, plus what it measured."""
+
+    size: str
+    sheets: SheetsBackend
+    discord: DiscordAPI
+    bot: FakeBot
+    slept: list[float] = field(default_factory=list)
+
+    async def measure(self, scenario: str, run: Awaitable[Any]) -> BenchResult:
+        """Run a scenario from a clean slate of counters and record it."""
+        self.sheets.reset()
+        self.discord.calls.clear()
+        self.slept.clear()
+        start = time.perf_counter()
+        await run
+        result = BenchResult(
+            scenario,
+            self.size,
+            time.perf_counter() - start,
+            Counter(self.sheets.calls),
+            self.sheets.over_quota,
+            Counter(self.discord.calls),
+            sum(self.slept),
+        )
+        results.append(result)
+        return result
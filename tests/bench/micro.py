@@ -0,0 +1,127 @@
+"""
+Micro-benchmark recorder for the pure hot functions. ``measure`` times a call
+(best of a few runs), measures its peak allocation with tracemalloc and checks
+the throughput against the stored baseline in ``baseline.json``.
+
+The baseline is machine-specific, so it is not committed: record it on the
+machine that runs the benchmarks with
+``pytest --bench --bench-save-baseline tests/bench``. It notes the machine it
+was recorded on, and a baseline from another machine (or none at all) is not
+compared against.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+
+# Inputs from a hundred rows / messages up to the 100k a busy server could reach.
+MICRO_SIZES = (100, 1_000, 10_000, 100_000)
+
+# Repeat short runs until this much time is spent, to smooth out noise.
+MIN_RUN_TIME = 0.2
+MAX_RUNS = 5
+
+MACHINE_KEY = "_machine"
+
+
+@dataclass
+class MicroResult:
+    name: str
+    size: int
+    seconds: float
+    throughput: float
+    peak_kib: float
+    baseline: float | None = None
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}[{self.size}]"
+
+    def change(self) -> float | None:
+        """Relative throughput change against the baseline (-0.3 = 30% slower)."""
+        if not self.baseline:
+            return None
+        return self.throughput / self.baseline - 1
+
+    def row(self) -> str:
+        change = self.change()
+        return (
+            f"{self.name:<20} {self.size:>7} {self.seconds * 1000:>10.2f} "
+            f"{self.throughput:>12.0f} {self.peak_kib:>10.0f} "
+            + (f"{change:>+8.0%}" if change is not None else f"{'new':>8}")
+        )
+
+
+MICRO_HEADER = (
+    f"{'function':<20} {'size':>7} {'ms':>10} {'items/s':>12} {'peak KiB':>10} "
+    f"{'vs base':>8}"
+)
+
+results: list[MicroResult] = []
+
+
+def machine() -> str:
+    """What a baseline's numbers depend on: the hardware and the interpreter."""
+    return (
+        f"{platform.machine()} {platform.processor()} "
+        f"cpus={os.cpu_count()} python={sys.version_info[0]}.{sys.version_info[1]}"
+    )
+
+
+def load_baseline() -> dict[str, dict[str, Any]]:
+    """The stored baseline, or none if it is missing or from another machine."""
+    if not BASELINE_PATH.exists():
+        return {}
+    baseline = json.loads(BASELINE_PATH.read_text())
+    if baseline.pop(MACHINE_KEY, None) != machine():
+        return {}
+    return baseline
+
+
+def save_baseline(measured: list[MicroResult]) -> None:
+    baseline: dict[str, Any] = dict(load_baseline())
+    baseline[MACHINE_KEY] = machine()
+    for result in measured:
+        entry = asdict(result)
+        del entry["baseline"], entry["name"], entry["size"]
+        baseline[result.key] = entry
+    BASELINE_PATH.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+
+
+def measure(name: str, size: int, run: Callable[[], Any]) -> MicroResult:
+    """Benchmark ``run``, which processes ``size`` items, and record it."""
+    best = float("inf")
+    spent = 0.0
+    runs = 0
+    while runs < MAX_RUNS and (runs == 0 or spent < MIN_RUN_TIME):
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        best = min(best, elapsed)
+        spent += elapsed
+        runs += 1
+
+    # A separate run, as tracing allocations slows the code down.
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    result = MicroResult(name, size, best, size / best, peak / 1024)
+    baseline = load_baseline().get(result.key)
+    if baseline is not None:
+        result.baseline = baseline["throughput"]
+    results.append(result)
+    return result
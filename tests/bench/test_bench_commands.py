@@ -0,0 +1,221 @@
+"""
+End-to-end benchmarks of the Sheets-heavy commands and loops, run against the
+latency-injecting fakes at realistic and 10x data sizes. Run them with
+``pytest --bench``; the call counts and wall times are reported at the end of
+the run (``--bench-latency`` sets the per-call latency).
+"""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from supermod.features.newsletter.newsletter import Newsletter
+from supermod.features.promotions.promotions import Promotions
+from supermod.features.qotd.qotd import QOTD, QOTD_APPROVAL_CHANNEL
+from supermod.features.submissions import _utils as sub_utils
+from supermod.features.submissions import submissions
+from supermod.features.submissions.submissions import (
+    MASTERLIST_CHANNEL_DICT,
+    SUBMISSIONS_CHANNEL,
+    Submissions,
+)
+from tests.bench.harness import Bench, FakeContext, invoke, react, reply
+
+pytestmark = pytest.mark.bench
+
+
+async def test_bench_subs_approve_all(bench: Bench):
+    cog = Submissions(bench.bot)  # type: ignore[arg-type]
+    ctx = FakeContext(bench.discord)
+    bench.bot.replies.append(reply("ok"))
+    result = await bench.measure("subs ok", invoke(cog, "subs", ctx))
+    assert result.discord_calls["add_reaction"] > 0
+    # The lists are approved side by side, each list's rows in one request.
+    assert result.sheets_calls["append_rows"] <= len(MASTERLIST_CHANNEL_DICT)
+
+
+async def test_bench_subs_reject_all(bench: Bench):
+    cog = Submissions(bench.bot)  # type: ignore[arg-type]
+    ctx = FakeContext(bench.discord)
+    count = len(bench.bot.channels[SUBMISSIONS_CHANNEL].messages)
+    numbers = ", ".join(str(i) for i in range(1, count + 1))
+    bench.bot.replies.append(reply(f"reject {numbers}"))
+    result = await bench.measure("subs reject", invoke(cog, "subs", ctx))
+    assert result.discord_calls["add_reaction"] == count
+    assert ctx.messages[-1].content == f"Albums {numbers} were rejected."
+
+
+async def test_bench_subs_after_a_busy_week(bench: Bench):
+    """
+    The pending submissions followed by 250 handled ones, then a second run
+    after the oldest pending one was handled too.
+    """
+    cog = Submissions(bench.bot)  # type: ignore[arg-type]
+    ctx = FakeContext(bench.discord)
+    channel = bench.bot.channels[SUBMISSIONS_CHANNEL]
+    pending = list(channel.messages)
+    for i in range(250):
+        handled = channel.add(f"Album {i} // Artist {i} // 2021 // Rock // new")
+        handled.reactions.append(SimpleNamespace(emoji="🆗", count=1))
+    bench.bot.replies.append(reply("stop"))
+    await invoke(cog, "subs", ctx)
+    assert f"**{len(pending)}.**" in "\n".join(m.content for m in ctx.messages)
+    # Read forward from the start, the channel is read once.
+    assert bench.discord.calls["history"] == -(-len(channel.messages) // 100)
+
+    await pending[0].add_reaction("❌")
+    await cog.on_raw_reaction_add(
+        SimpleNamespace(  # type: ignore[arg-type]
+            channel_id=SUBMISSIONS_CHANNEL, message_id=pending[0].id, emoji="❌"
+        )
+    )
+    sent = len(ctx.messages)
+    bench.bot.replies.append(reply("stop"))
+    result = await bench.measure("subs backlog", invoke(cog, "subs", ctx))
+    # The second run reads the index the reaction event kept current.
+    assert result.discord_calls["history"] == 0
+    listed = "\n".join(m.content for m in ctx.messages[sent:])
+    assert f"**{len(pending) - 1}.**" in listed
+    assert f"**{len(pending)}.**" not in listed
+
+
+async def test_bench_subs_checked_on_arrival(bench: Bench, monkeypatch):
+    """`,subs` once every pending submission was checked as it came in."""
+    cog = Submissions(bench.bot)  # type: ignore[arg-type]
+    ctx = FakeContext(bench.discord)
+    channel = bench.bot.channels[SUBMISSIONS_CHANNEL]
+    index = await cog._submissions_index(channel)  # type: ignore[arg-type]
+    await cog._check_submissions(index.open())
+
+    def not_again(*args):
+        raise AssertionError("a submission was checked again")
+
+    monkeypatch.setattr(sub_utils, "submission_check", not_again)
+    bench.bot.replies.append(reply("stop"))
+    result = await bench.measure("subs checked", invoke(cog, "subs", ctx))
+    assert not result.sheets_calls
+    # The duplicate warnings' links are built from ids, not fetched.
+    assert "Link to existing submission" in "\n".join(m.content for m in ctx.messages)
+    assert not result.discord_calls["fetch_message"]
+    assert f"**{len(channel.messages)}.**" in "\n".join(m.content for m in ctx.messages)
+
+
+async def test_bench_subs_confirms_links_after_the_review(bench: Bench, monkeypatch):
+    monkeypatch.setattr(submissions, "SUBS_CHECK_LINKS", True)
+    cog = Submissions(bench.bot)  # type: ignore[arg-type]
+    ctx = FakeContext(bench.discord)
+    bench.bot.replies.append(reply("stop"))
+    await invoke(cog, "subs", ctx)
+    links = "\n".join(m.content for m in ctx.messages).count("Link to existing")
+    await asyncio.gather(*cog._checks)
+    # One fetch per distinct linked post, none of them missing.
+    assert 0 < bench.discord.calls["fetch_message"] <= links
+    assert not any("no longer" in m.content for m in ctx.messages)
+
+
+async def test_bench_update_sheet(bench: Bench):
+    cog = Submissions(bench.bot)  # type: ignore[arg-type]
+    ctx = FakeContext(bench.discord)
+    result = await bench.measure("update_sheet", invoke(cog, "update_sheet", ctx))
+    # The sheets match their channels already, so nothing is written.
+    assert not result.sheets_calls.keys() & {"update", "append_rows", "delete_rows"}
+
+
+async def test_bench_update_sheet_after_changes(bench: Bench):
+    """Two albums posted to VOTED and one deleted since the last sync."""
+    cog = Submissions(bench.bot)  # type: ignore[arg-type]
+    ctx = FakeContext(bench.discord)
+    voted = bench.bot.channels[MASTERLIST_CHANNEL_DICT["voted"]]
+    for i in range(2):
+        voted.add(f"New {i} _by_ Band {i} (2024) (Rock) <@!{990_000 + i}>")
+    del voted.messages[0]
+    result = await bench.measure("update_sheet +2 -1", invoke(cog, "update_sheet", ctx))
+    assert result.sheets_calls["append_rows"] == 1
+    assert result.sheets_calls["delete_rows"] == 1
+
+
+async def test_bench_update_masterlist(bench: Bench):
+    cog = Submissions(bench.bot)  # type: ignore[arg-type]
+    ctx = FakeContext(bench.discord)
+    result = await bench.measure(
+        "update_masterlist", invoke(cog, "update_masterlist", ctx)
+    )
+    assert result.discord_calls["send"] > 0
+
+
+async def test_bench_update_masterlist_packed(bench: Bench, monkeypatch):
+    monkeypatch.setattr(submissions, "SUBS_PACKED_POSTS", True)
+    monkeypatch.setattr(sub_utils, "SUBS_PACKED_POSTS", True)
+    cog = Submissions(bench.bot)  # type: ignore[arg-type]
+    ctx = FakeContext(bench.discord)
+    voted = bench.bot.channels[MASTERLIST_CHANNEL_DICT["voted"]]
+    listed = len(voted.messages)
+    result = await bench.measure(
+        "masterlist packed", invoke(cog, "update_masterlist", ctx)
+    )
+    # Around 30 entries fit in a message.
+    assert len(voted.messages) <= listed // 20
+    assert result.discord_calls["send"] < listed
+
+
+async def test_bench_update_masterlist_resumed(bench: Bench):
+    """A VOTED rebuild cut short after 12 posts, then resumed."""
+    cog = Submissions(bench.bot)  # type: ignore[arg-type]
+    ctx = FakeContext(bench.discord)
+    voted = bench.bot.channels[MASTERLIST_CHANNEL_DICT["voted"]]
+    old = list(voted.messages)
+    send = voted.send
+
+    async def send_then_stop(content=None, **kwargs):
+        if len(voted.messages) == len(old) + 12:
+            raise ConnectionError("restarted")
+        return await send(content, **kwargs)
+
+    voted.send = send_then_stop  # type: ignore[method-assign]
+    with pytest.raises(ConnectionError):
+        await cog._sheet_to_masterlist(ctx, "voted")  # type: ignore[arg-type]
+    del voted.send
+    assert voted.messages[: len(old)] == old
+
+    await bench.measure(
+        "masterlist resumed",
+        invoke(cog, "update_masterlist", ctx, "voted"),
+    )
+    assert not set(voted.messages) & set(old)
+    assert sorted(m.content for m in voted.messages) == sorted(m.content for m in old)
+
+
+async def test_bench_my_subs(bench: Bench):
+    cog = Submissions(bench.bot)  # type: ignore[arg-type]
+    ctx = FakeContext(bench.discord)
+    await bench.measure("my_subs", invoke(cog, "my_subs", ctx))
+    assert "submissions" in ctx.messages[0].content
+
+
+async def test_bench_news(bench: Bench):
+    cog = Newsletter(bench.bot)  # type: ignore[arg-type]
+    ctx = FakeContext(bench.discord)
+    await bench.measure("news", invoke(cog, "news", ctx))
+    assert ctx.messages
+
+
+async def test_bench_qotd_loop(bench: Bench):
+    cog = QOTD(bench.bot)  # type: ignore[arg-type]
+    approval = bench.bot.channels[QOTD_APPROVAL_CHANNEL]
+    bench.bot.replies.append(react("✅", lambda bot: approval.messages[-1]))
+    result = await bench.measure("qotd_loop", cog.qotd_loop.coro(cog))
+    assert result.sheets_calls["update_cell"] == 1
+
+
+async def test_bench_promos_loop(bench: Bench):
+    cog = Promotions(bench.bot)  # type: ignore[arg-type]
+    result = await bench.measure("promos_loop", cog.promos_loop.coro(cog))
+    assert result.discord_calls["send"] > 0
+
+
+def test_bench_masterlists_are_populated(bench: Bench):
+    for channel_id in MASTERLIST_CHANNEL_DICT.values():
+        assert bench.bot.channels[channel_id].messages
@@ -0,0 +1,159 @@
+"""
+Micro-benchmarks of the pure functions on the bot's hot paths, on generated
+inputs from 100 to 100k rows / messages. Each records its throughput and peak
+memory and fails when the throughput drops by more than ``--bench-threshold``
+from ``baseline.json``. Run them with ``pytest --bench tests/bench``.
+"""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pendulum
+import pytest
+
+from supermod.album_classes import Album, Sub
+from supermod.features.newsletter._utils import (
+    news_by_genre,
+    newsletter_create,
+    post_split,
+)
+from supermod.features.promotions._utils import promo_make
+from supermod.features.submissions import _utils as sub_utils
+from supermod.features.submissions._utils import (
+    get_check_data,
+    masterlist_dict,
+    submission_check,
+)
+from tests.bench import harness
+from tests.bench.micro import MICRO_SIZES, MicroResult, measure
+from tests.fakes import FakeWorksheet
+
+pytestmark = pytest.mark.bench
+
+NOW = pendulum.datetime(2026, 6, 17, 12, tz="America/Toronto")
+
+
+@pytest.fixture(params=MICRO_SIZES, ids=str)
+def size(request) -> int:
+    return request.param
+
+
+@pytest.fixture
+def check(request):
+    """Fail the benchmark if it fell behind its baseline by over the threshold."""
+    threshold = request.config.getoption("--bench-threshold")
+    save = request.config.getoption("--bench-save-baseline")
+
+    def _check(result: MicroResult) -> None:
+        change = result.change()
+        if not save and change is not None and change < -threshold:
+            pytest.fail(
+                f"{result.key} throughput {result.throughput:.0f}/s is "
+                f"{-change:.0%} below its baseline of {result.baseline:.0f}/s "
+                f"(threshold {threshold:.0%})."
+            )
+
+    return _check
+
+
+def _message(i: int, content: str) -> SimpleNamespace:
+    author = SimpleNamespace(id=50_000 + i, display_name=f"member{i}")
+    return SimpleNamespace(id=10**17 + i, content=content, author=author)
+
+
+def test_bench_newsletter_create(size, check):
+    rows = harness.newsletter_rows(size, NOW.year)
+    check(measure("newsletter_create", size, lambda: newsletter_create(rows, NOW)))
+
+
+def test_bench_news_by_genre(size, check, monkeypatch):
+    monkeypatch.setattr(pendulum, "now", lambda tz=None: NOW)
+    rows = harness.newsletter_rows(size, NOW.year)
+    check(measure("news_by_genre", size, lambda: news_by_genre(rows)))
+
+
+def test_bench_post_split(size, check):
+    lines = [f"**Artist {i}** - Release {i} (Rock, Pop) [Canada]" for i in range(size)]
+    long_post = "\n".join(lines)
+    check(measure("post_split", size, lambda: post_split(long_post, 2000)))
+
+
+def test_bench_masterlist_dict(size, check):
+    masterlists = harness.MASTERLISTS
+    msgs = [
+        _message(
+            i,
+            f"Album {i} // Artist {i} // 2021 // Rock, Pop // "
+            f"{masterlists[i % len(masterlists)]}",
+        )
+        for i in range(size)
+    ]
+    check(measure("masterlist_dict", size, lambda: masterlist_dict(msgs, "voted")))  # type: ignore[arg-type]
+
+
+def test_bench_submission_check(size, check, monkeypatch):
+    """
+    A batch of 100 submissions checked against sheets of ``size`` rows,
+    including building the check data from the sheets' rows.
+    """
+    discussed = harness.discussed_rows(size)
+    listed = [list(harness.SUBS_HEADER)] + [
+        [*harness.album(i), "2020", "Rock", f"user{i}", f"{10_000 + i}", f"{i + 1}"]
+        for i in range(size)
+    ]
+    monkeypatch.setattr(sub_utils, "albums_wks", lambda: FakeWorksheet(discussed))
+    subs_sheet = FakeWorksheet()
+    subs_sheet.add_worksheet("VOTED", FakeWorksheet(listed))
+    monkeypatch.setattr(sub_utils, "subs_sheet", lambda: subs_sheet)
+
+    # A quarter each: discussed, duplicate, repeat submitter and clean, all
+    # matching near the end of the sheets (the slowest case for a scan).
+    last = size - 1
+    subs = []
+    for i in range(100):
+        kind = i % 4
+        if kind == 0:
+            title, artist = harness.album(500_000 + last)
+        elif kind == 1:
+            title, artist = harness.album(last)
+        else:
+            title, artist = harness.album(900_000 + i)
+        submitter = 10_000 + last if kind == 2 else 900_000 + i
+        subs.append(
+            Sub(artist, title, "Rock", "2021", f"member{i}", submitter, "voted")
+        )
+
+    def run() -> None:
+        data = get_check_data("voted")
+        for sub in subs:
+            sub.warning = None
+            submission_check(sub, *data)
+
+    result = measure("submission_check", size, run)
+    assert [sub.warning for sub in subs[:4]] == [
+        "discussed",
+        "duplicate",
+        "user already in masterlist",
+        None,
+    ]
+    check(result)
+
+
+def test_bench_make_title(size, check):
+    strings = [
+        f"the {'dark' if i % 2 else 'LOUD'} side of album number {i}  "
+        for i in range(size)
+    ]
+    check(
+        measure(
+            "Album.make_title",
+            size,
+            lambda: [Album.make_title(string) for string in strings],
+        )
+    )
+
+
+def test_bench_promo_make(size, check):
+    promos = harness.promo_rows(size, NOW.day, NOW.hour)[1:]
+    check(measure("promo_make", size, lambda: [promo_make(p) for p in promos]))
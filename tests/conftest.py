@@ -51,12 +51,57 @@ _DUMMY_ENV = {
     "INPUT_RATINGS_HERE_CHANNEL": "7006",
     "FAQS_CHANNEL": "7007",
     "LISTENERS_ROLE": "7008",
+    "SHEETS_MIRROR_PATH": ":memory:",
+    "SUBS_STATE_PATH": ":memory:",
 }
 
 for _key, _value in _DUMMY_ENV.items():
     os.environ[_key] = _value
 
 
+# --- benchmarks (opt-in) -------------------------------------------------------
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("benchmarks")
+    group.addoption(
+        "--bench",
+        action="store_true",
+        help="Also run the benchmarks in tests/bench (marked 'bench').",
+    )
+    group.addoption(
+        "--bench-latency",
+        type=float,
+        default=0.005,
+        help="Seconds each fake Sheets / Discord call takes in the benchmarks.",
+    )
+    group.addoption(
+        "--bench-threshold",
+        type=float,
+        default=0.25,
+        help="Fail a micro-benchmark whose throughput drops by more than this "
+        "fraction of its baseline.",
+    )
+    group.addoption(
+        "--bench-save-baseline",
+        action="store_true",
+        help="Write the micro-benchmark results as the new baseline.",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "bench: slow benchmark, only run with --bench")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--bench"):
+        return
+    skip = pytest.mark.skip(reason="benchmark; run with --bench")
+    for item in items:
+        if "bench" in item.keywords:
+            item.add_marker(skip)
+
+
 # --- fixtures ----------------------------------------------------------------
 
 
@@ -77,6 +122,21 @@ def frozen_now(monkeypatch):
     return frozen
 
 
+@pytest.fixture(autouse=True)
+def _reset_shared_sheets_state():
+    """Drop the shared write buffers (and their timers) and mirror after each test."""
+    from supermod._sheets import sheets_mirror, writes
+
+    yield
+    sheets_mirror.clear()
+    with writes._buffers_lock:
+        for buffer in writes._buffers.values():
+            with buffer._lock:
+                if buffer._timer is not None:
+                    buffer._timer.cancel()
+        writes._buffers.clear()
+
+
 @pytest.fixture
 def set_worksheet(monkeypatch):
     """
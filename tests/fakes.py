@@ -6,7 +6,11 @@ live Discord connection.
 
 from __future__ import annotations
 
+import itertools
 import re
+import threading
+import time
+from collections import Counter, deque
 from typing import Optional
 from unittest.mock import AsyncMock, MagicMock
 
@@ -32,6 +36,8 @@ class FakeCell:
         return f"FakeCell({self.value!r}, row={self.row}, col={self.col})"
 
 
+_worksheet_ids = itertools.count(1)
+
 _A1_RE = re.compile(r"^([A-Za-z]+)(\d+)$")
 
 
@@ -57,6 +63,9 @@ class FakeWorksheet:
     def __init__(self, rows: Optional[list[list[str]]] = None, title: str = "Sheet1"):
         self.rows: list[list[str]] = [list(r) for r in (rows or [])]
         self.title = title
+        # Identity as gspread exposes it (worksheet.id / spreadsheet_id).
+        self.id = next(_worksheet_ids)
+        self.spreadsheet_id = "fake-spreadsheet"
         # Named child worksheets, addressable by title or index.
         self._worksheets: dict[str, "FakeWorksheet"] = {}
 
@@ -96,6 +105,9 @@ class FakeWorksheet:
                     return FakeCell(value, row=r, col=c)
         return None
 
+    def refresh(self) -> None:
+        """Mirror CachedWorksheet.refresh; a fake always reads live rows."""
+
     # --- write ------------------------------------------------------------
 
     def update_cell(self, row: int, col: int, value) -> None:
@@ -105,13 +117,48 @@ class FakeWorksheet:
     def append_row(self, values) -> None:
         self.rows.append(list(values))
 
-    def delete_rows(self, row: int) -> None:
+    def append_rows(self, values) -> None:
+        self.rows.extend(list(row) for row in values)
+
+    def batch_update(self, data) -> None:
+        """Apply ``{"range": "B3" or "A3:G3", "values": [[...]]}`` updates."""
+        for entry in data:
+            top, left = _a1_to_rowcol(entry["range"].split(":")[0])
+            for r, row in enumerate(entry["values"], start=top):
+                for c, value in enumerate(row, start=left):
+                    self.update_cell(r, c, value)
+
+    def delete_rows(self, row: int, end_row: Optional[int] = None) -> None:
         if 1 <= row <= len(self.rows):
-            del self.rows[row - 1]
+            del self.rows[row - 1 : row if end_row is None else end_row]
 
     def clear(self) -> None:
         self.rows = []
 
+    @property
+    def row_count(self) -> int:
+        return len(self.rows)
+
+    @property
+    def col_count(self) -> int:
+        return max((len(row) for row in self.rows), default=0)
+
+    def add_rows(self, rows: int) -> None:
+        self.rows.extend([] for _ in range(rows))
+
+    def add_cols(self, cols: int) -> None:
+        """Columns grow on write."""
+
+    def update(self, values, range_name: str = "A1") -> None:
+        """Write a block of values starting at range_name's top-left cell."""
+        top, left = _a1_to_rowcol(range_name.split(":")[0])
+        for r, row in enumerate(values, start=top):
+            for c, value in enumerate(row, start=left):
+                self.update_cell(r, c, value)
+        # The API leaves off trailing blank rows.
+        while self.rows and not any(self.rows[-1]):
+            self.rows.pop()
+
     # --- spreadsheet-style access ----------------------------------------
 
     def worksheet(self, title: str) -> "FakeWorksheet":
@@ -126,6 +173,20 @@ class FakeWorksheet:
     def get_worksheet(self, index: int) -> "FakeWorksheet":
         return self
 
+    def worksheets(self) -> list["FakeWorksheet"]:
+        return list(self._worksheets.values()) or [self]
+
+    def values_batch_get(self, ranges: list[str]) -> dict:
+        """Read whole worksheets, given as quoted titles ("'VOTED'")."""
+        value_ranges = []
+        for name in ranges:
+            rows = self.worksheet(name.strip("'")).get_all_values()
+            value_range: dict = {"range": name}
+            if rows:
+                value_range["values"] = rows
+            value_ranges.append(value_range)
+        return {"valueRanges": value_ranges}
+
     @property
     def sheet1(self) -> "FakeWorksheet":
         return self
@@ -134,6 +195,125 @@ class FakeWorksheet:
         return self
 
 
+class QuotaExceededError(Exception):
+    """Raised by a strict SheetsBackend, as Google answers 429 over quota."""
+
+
+class SheetsBackend:
+    """
+    Shared "Google" behind a set of LatencyWorksheets: counts every API call
+    by method, sleeps ``latency`` seconds per call and tracks the calls made in
+    the last minute against ``per_minute``. Calls over quota are counted in
+    ``over_quota``, and raise QuotaExceededError if ``strict``.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        per_minute: Optional[int] = None,
+        strict: bool = False,
+    ):
+        self.latency = latency
+        self.per_minute = per_minute
+        self.strict = strict
+        self.calls: Counter[str] = Counter()
+        self.over_quota = 0
+        self._window: deque[float] = deque()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @property
+    def total(self) -> int:
+        return sum(self.calls.values())
+
+    def call(self, name: str) -> bool:
+        """
+        Account for one API call; return False if this is a nested call made
+        by a fake method on behalf of another (already counted) one.
+        """
+        if getattr(self._local, "busy", False):
+            return False
+        with self._lock:
+            self.calls[name] += 1
+            if self.per_minute is not None:
+                now = time.monotonic()
+                while self._window and now - self._window[0] >= 60:
+                    self._window.popleft()
+                if len(self._window) >= self.per_minute:
+                    self.over_quota += 1
+                    if self.strict:
+                        raise QuotaExceededError(f"{name}: over {self.per_minute}/min")
+                self._window.append(now)
+        if self.latency:
+            time.sleep(self.latency)
+        return True
+
+    def reset(self) -> None:
+        with self._lock:
+            self.calls.clear()
+            self.over_quota = 0
+            self._window.clear()
+
+
+def _api_call(name: str):
+    """Make a FakeWorksheet method go through the worksheet's SheetsBackend."""
+    method = getattr(FakeWorksheet, name)
+
+    def counted(self, *args, **kwargs):
+        if not self.backend.call(name):
+            return method(self, *args, **kwargs)
+        self.backend._local.busy = True
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self.backend._local.busy = False
+
+    counted.__name__ = name
+    return counted
+
+
+class LatencyWorksheet(FakeWorksheet):
+    """
+    FakeWorksheet whose API calls are counted, slowed down and rate limited by
+    a SheetsBackend shared with the worksheets it hands out.
+    """
+
+    def __init__(
+        self,
+        rows: Optional[list[list[str]]] = None,
+        title: str = "Sheet1",
+        backend: Optional[SheetsBackend] = None,
+    ):
+        super().__init__(rows, title)
+        self.backend = backend or SheetsBackend()
+
+    def add_worksheet(self, title: str, ws: FakeWorksheet) -> FakeWorksheet:
+        """Add a child worksheet (given as plain rows in a FakeWorksheet)."""
+        child = LatencyWorksheet(ws.rows, title, self.backend)
+        return super().add_worksheet(title, child)
+
+    # Opening a worksheet fetches the spreadsheet metadata.
+    worksheet = _api_call("worksheet")
+    get_worksheet = _api_call("get_worksheet")
+    worksheets = _api_call("worksheets")
+    values_batch_get = _api_call("values_batch_get")
+
+    get_all_values = _api_call("get_all_values")
+    row_values = _api_call("row_values")
+    cell = _api_call("cell")
+    acell = _api_call("acell")
+    find = _api_call("find")
+    update_cell = _api_call("update_cell")
+    append_row = _api_call("append_row")
+    append_rows = _api_call("append_rows")
+    batch_update = _api_call("batch_update")
+    delete_rows = _api_call("delete_rows")
+    clear = _api_call("clear")
+    update = _api_call("update")
+    add_rows = _api_call("add_rows")
+    add_cols = _api_call("add_cols")
+
+
 def make_message(content: str = "", author_id: int = 1, author_name: str = "tester"):
     """Lightweight discord.Message double."""
     msg = MagicMock(name="Message")
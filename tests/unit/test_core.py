@@ -1,11 +1,15 @@
-"""Tests for the core helpers: env reading, local-mode detection, log formatting."""
+"""Tests for the core helpers: env reading, local-mode detection, log formatting,
+the readers-writer lock and the display-name resolver."""
 
 from __future__ import annotations
 
+import asyncio
 import logging
+from types import SimpleNamespace
 
 import pendulum
 import pytest
+from discord import HTTPException
 
 from supermod import _logging, _mode_setup, _utils
 
@@ -82,3 +86,169 @@ def test_formatter_winter_uses_est():
         _record_at(ts)
     )
     assert "EST" in out, out
+
+
+# --- with_retries ----------------------------------------------------------------
+
+
+def _failing(*statuses):
+    """A Discord call failing with each status in turn, then succeeding."""
+    calls = []
+
+    async def call():
+        calls.append(len(calls))
+        if len(calls) <= len(statuses):
+            response = SimpleNamespace(status=statuses[len(calls) - 1], reason="")
+            raise HTTPException(response, "")  # type: ignore[arg-type]
+        return "done"
+
+    return call, calls
+
+
+async def test_with_retries_retries_server_errors_and_rate_limits(monkeypatch):
+    waits = []
+
+    async def sleep(delay):
+        waits.append(delay)
+
+    monkeypatch.setattr(asyncio, "sleep", sleep)
+    call, calls = _failing(503, 429)
+    assert await _utils.with_retries(call) == "done"
+    assert (len(calls), waits) == (3, [1.0, 2.0])
+
+
+async def test_with_retries_gives_up(monkeypatch):
+    async def sleep(delay):
+        pass
+
+    monkeypatch.setattr(asyncio, "sleep", sleep)
+    call, calls = _failing(404)
+    with pytest.raises(HTTPException):
+        await _utils.with_retries(call)
+    assert len(calls) == 1
+    call, calls = _failing(*[500] * 10)
+    with pytest.raises(HTTPException):
+        await _utils.with_retries(call, max_backoff=4)
+    assert len(calls) == 4
+
+
+# --- RWLock --------------------------------------------------------------------
+
+
+async def test_rwlock_readers_share_the_lock():
+    lock = _utils.RWLock()
+    async with lock.read(), lock.read():
+        assert not lock.writing
+
+
+async def test_rwlock_writer_waits_for_readers():
+    lock = _utils.RWLock()
+    order = []
+
+    async def write():
+        async with lock.write():
+            order.append("write")
+
+    async with lock.read():
+        writer = asyncio.create_task(write())
+        await asyncio.sleep(0)
+        assert lock.writing
+        order.append("read done")
+    await writer
+    assert order == ["read done", "write"]
+    assert not lock.writing
+
+
+async def test_rwlock_waiting_writer_holds_back_new_readers():
+    lock = _utils.RWLock()
+    order = []
+
+    async def write():
+        async with lock.write():
+            order.append("write")
+
+    async def read():
+        async with lock.read():
+            order.append("late read")
+
+    async with lock.read():
+        writer = asyncio.create_task(write())
+        await asyncio.sleep(0)
+        reader = asyncio.create_task(read())
+        await asyncio.sleep(0)
+        assert order == []
+    await asyncio.gather(writer, reader)
+    assert order == ["write", "late read"]
+
+
+async def test_rwlock_cancelled_writer_lets_readers_in():
+    lock = _utils.RWLock()
+    async with lock.read():
+        writer = asyncio.create_task(lock.write().__aenter__())
+        await asyncio.sleep(0)
+        writer.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await writer
+    assert not lock.writing
+    async with lock.read():
+        pass
+
+
+# --- DisplayNames ----------------------------------------------------------------
+
+
+class NamesBot:
+    """A bot whose guild caches ``members`` and which counts fetch_user calls."""
+
+    def __init__(self, members=()):
+        self.members = {member_id: f"member{member_id}" for member_id in members}
+        self.fetched: list[int] = []
+
+    def get_guild(self, guild_id):
+        def get_member(member_id):
+            name = self.members.get(member_id)
+            return SimpleNamespace(display_name=name) if name else None
+
+        return SimpleNamespace(id=guild_id, get_member=get_member)
+
+    async def fetch_user(self, user_id):
+        self.fetched.append(user_id)
+        await asyncio.sleep(0)
+        if user_id < 0:
+            response = SimpleNamespace(status=404, reason="Not Found")
+            raise HTTPException(response, "")  # type: ignore[arg-type]
+        return SimpleNamespace(display_name=f"user{user_id}")
+
+
+async def test_display_names_prefers_the_member_cache():
+    bot = NamesBot(members=[1])
+    names = _utils.DisplayNames(bot, 6001)  # type: ignore[arg-type]
+    assert await names.resolve([1, 2]) == {1: "member1", 2: "user2"}
+    assert bot.fetched == [2]
+
+
+async def test_display_names_looks_each_user_up_once():
+    bot = NamesBot()
+    names = _utils.DisplayNames(bot, 6001)  # type: ignore[arg-type]
+    first, second = await asyncio.gather(
+        names.resolve([2, 3, 2]), names.resolve([3, 4])
+    )
+    assert first == {2: "user2", 3: "user3"}
+    assert second == {3: "user3", 4: "user4"}
+    await names.resolve([2, 3, 4])
+    assert sorted(bot.fetched) == [2, 3, 4]
+
+
+async def test_display_names_forgets_the_oldest_past_maxsize():
+    bot = NamesBot()
+    names = _utils.DisplayNames(bot, 6001, maxsize=2)  # type: ignore[arg-type]
+    for user_id in (1, 2, 3):
+        await names.resolve([user_id])
+    await names.resolve([3, 1])
+    assert bot.fetched == [1, 2, 3, 1]
+
+
+async def test_display_names_leaves_out_users_not_found():
+    bot = NamesBot()
+    names = _utils.DisplayNames(bot, 6001)  # type: ignore[arg-type]
+    assert await names.resolve([-1, 5]) == {5: "user5"}
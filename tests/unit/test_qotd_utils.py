@@ -115,3 +115,22 @@ def test_mark_as_used_marks_correct_row_with_duplicate_text(set_worksheet):
 
     assert ws.rows[2][3] == 2   # the intended (second) row incremented
     assert ws.rows[1][3] == ""  # first occurrence left untouched
+
+
+# --- reset_uses -------------------------------------------------------------
+
+
+def test_reset_uses_sends_one_batched_write(set_worksheet):
+    rows = [HEADER] + [
+        [str(i), "Y", f"Question {i}", str(i % 3)] for i in range(1, 501)
+    ]
+    ws = set_worksheet(_utils, "qotd_wks", rows)
+    calls = []
+    original = ws.batch_update
+    ws.batch_update = lambda data: (calls.append(len(data)), original(data))
+
+    _utils.reset_uses()
+
+    # Only the rows not already at 0 are written, all in a single call.
+    assert calls == [len([r for r in rows[1:] if r[3] != "0"])]
+    assert all(str(row[3]) == "0" for row in ws.rows[1:])
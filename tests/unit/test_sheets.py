@@ -0,0 +1,617 @@
+"""Tests for the shared Sheets access layer in ``supermod._sheets``."""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import threading
+import time
+from typing import Any, cast
+
+import pytest
+from requests import Response, Session
+
+from supermod._sheets import (
+    SHEETS_MAX_WORKERS,
+    CachedSpreadsheet,
+    CachedWorksheet,
+    Priority,
+    QuotaScheduler,
+    ScheduledHTTPClient,
+    SheetsMirror,
+    SnapshotCache,
+    WriteBuffer,
+    background_priority,
+    flush_writes,
+    quota,
+    run_sheets,
+    sheets_priority,
+    write_buffer,
+    writes,
+)
+from tests.fakes import FakeWorksheet
+
+# --- run_sheets ----------------------------------------------------------------
+
+
+async def test_run_sheets_runs_off_the_event_loop_thread():
+    loop_thread = threading.get_ident()
+    worker_thread = await run_sheets(threading.get_ident)
+    assert worker_thread != loop_thread
+
+
+async def test_run_sheets_passes_arguments_and_returns_result():
+    assert await run_sheets(lambda a, b=0: a + b, 2, b=3) == 5
+
+
+async def test_run_sheets_propagates_exceptions():
+    def boom():
+        raise ValueError("sheet exploded")
+
+    with pytest.raises(ValueError, match="sheet exploded"):
+        await run_sheets(boom)
+
+
+async def test_run_sheets_carries_context_variables():
+    var: contextvars.ContextVar[str] = contextvars.ContextVar("var", default="unset")
+    var.set("caller")
+    assert await run_sheets(var.get) == "caller"
+
+
+async def test_run_sheets_bounds_concurrency():
+    lock = threading.Lock()
+    running = 0
+    peak = 0
+    release = threading.Event()
+
+    def blocking_call():
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        release.wait(timeout=1)
+        with lock:
+            running -= 1
+
+    calls = [
+        asyncio.ensure_future(run_sheets(blocking_call))
+        for _ in range(SHEETS_MAX_WORKERS * 2)
+    ]
+    await asyncio.sleep(0.05)
+    release.set()
+    await asyncio.gather(*calls)
+    assert peak == SHEETS_MAX_WORKERS
+
+
+# --- CachedWorksheet -----------------------------------------------------------
+
+
+class CountingWorksheet(FakeWorksheet):
+    """FakeWorksheet that counts full-sheet reads."""
+
+    def __init__(self, rows=None, title: str = "Sheet1"):
+        super().__init__(rows, title)
+        self.reads = 0
+
+    def get_all_values(self):
+        self.reads += 1
+        return super().get_all_values()
+
+
+ROWS = [
+    ["Title", "Artist", "Week"],
+    ["Kid A", "Radiohead", "7"],
+    ["Loveless", "My Bloody Valentine", "12"],
+]
+
+
+def _cached(rows=ROWS, ttl: float = 60):
+    ws = CountingWorksheet(rows)
+    return ws, CachedWorksheet(ws, SnapshotCache(ttl=ttl))
+
+
+def test_cached_worksheet_serves_repeat_reads_from_snapshot():
+    ws, cached = _cached()
+    assert cached.get_all_values() == ROWS
+    assert cached.get_all_values() == ROWS
+    assert ws.reads == 1
+
+
+def test_cached_worksheet_refetches_after_ttl():
+    ws, cached = _cached(ttl=0)
+    cached.get_all_values()
+    cached.get_all_values()
+    assert ws.reads == 2
+
+
+def test_cached_worksheet_returns_copies():
+    _, cached = _cached()
+    cached.get_all_values()[1][0] = "mutated"
+    assert cached.get_all_values()[1][0] == "Kid A"
+
+
+def test_cached_worksheet_derived_reads_use_snapshot():
+    ws, cached = _cached()
+    cell = cached.find("Loveless")
+    assert cell is not None and (cell.row, cell.col) == (3, 1)
+    assert cached.acell("C2").value == "7"
+    assert cached.cell(3, 2).value == "My Bloody Valentine"
+    assert cached.row_values(2) == ["Kid A", "Radiohead", "7"]
+    assert cached.find("missing") is None
+    assert ws.reads == 1
+
+
+def test_cached_worksheet_append_row_updates_snapshot():
+    ws, cached = _cached()
+    cached.get_all_values()
+    cached.append_row(["OK Computer", "Radiohead"])
+    assert ws.rows[-1] == ["OK Computer", "Radiohead"]
+    # Appended rows are padded to the grid width, as the API returns them.
+    assert cached.get_all_values()[-1] == ["OK Computer", "Radiohead", ""]
+    assert ws.reads == 1
+
+
+def test_cached_worksheet_update_cell_updates_snapshot():
+    ws, cached = _cached()
+    cached.get_all_values()
+    cached.update_cell(2, 3, 8)
+    assert ws.rows[1][2] == 8
+    assert cached.acell("C2").value == "8"
+    assert ws.reads == 1
+
+
+def test_cached_worksheet_delete_rows_updates_snapshot():
+    ws, cached = _cached()
+    cached.get_all_values()
+    cached.delete_rows(2)
+    assert [row[0] for row in cached.get_all_values()] == ["Title", "Loveless"]
+    assert ws.reads == 1
+
+
+def test_cached_worksheet_clear_empties_snapshot():
+    ws, cached = _cached()
+    cached.get_all_values()
+    cached.clear()
+    assert cached.get_all_values() == []
+    assert ws.reads == 1
+
+
+def test_cached_worksheet_replace_all_writes_once_and_blanks_the_rest():
+    ws, cached = _cached()
+    cached.get_all_values()
+    writes = []
+    original = ws.update
+
+    def update(values, range_name="A1"):
+        writes.append((range_name, [list(row) for row in values]))
+        original(values, range_name)
+
+    ws.update = update
+    cached.replace_all([["Title", "Artist"], ["Doolittle", "Pixies"]])
+    assert writes == [
+        (
+            "A1",
+            [["Title", "Artist", ""], ["Doolittle", "Pixies", ""], ["", "", ""]],
+        )
+    ]
+    assert ws.rows == [["Title", "Artist", ""], ["Doolittle", "Pixies", ""]]
+    assert cached.get_all_values() == [["Title", "Artist"], ["Doolittle", "Pixies"]]
+
+
+def test_cached_spreadsheet_hands_out_cached_worksheets():
+    parent = FakeWorksheet()
+    child = CountingWorksheet(ROWS)
+    parent.add_worksheet("VOTED", child)
+    spreadsheet = CachedSpreadsheet(parent, SnapshotCache())
+    spreadsheet.worksheet("VOTED").get_all_values()
+    spreadsheet.worksheet("VOTED").get_all_values()
+    assert isinstance(spreadsheet.sheet1, CachedWorksheet)
+    assert child.reads == 1
+
+
+def test_cached_spreadsheet_reads_worksheet_metadata_once():
+    metadata_reads = []
+
+    class Spreadsheet(FakeWorksheet):
+        def worksheets(self) -> list[FakeWorksheet]:
+            metadata_reads.append(len(self._worksheets))
+            return super().worksheets()
+
+    parent = Spreadsheet()
+    for title in ("VOTED", "NEW"):
+        parent.add_worksheet(title, FakeWorksheet(title=title))
+    spreadsheet = CachedSpreadsheet(parent, SnapshotCache())
+    voted = spreadsheet.worksheet("VOTED")
+    assert spreadsheet.worksheet("VOTED") is voted
+    assert spreadsheet.worksheet("NEW") is spreadsheet.get_worksheet(1)
+    assert metadata_reads == [2]
+
+    # A tab added since is found by reading the metadata again.
+    parent.add_worksheet("THEME", FakeWorksheet(title="THEME"))
+    assert spreadsheet.worksheet("THEME").title == "THEME"
+    assert spreadsheet.worksheet("VOTED") is voted
+    assert metadata_reads == [2, 3]
+
+
+class BatchSpreadsheet(FakeWorksheet):
+    """FakeWorksheet spreadsheet that records its values_batch_get requests."""
+
+    def __init__(self, tabs: dict[str, list[list[str]]]):
+        super().__init__()
+        self.batches: list[list[str]] = []
+        self.tabs = {
+            title: CountingWorksheet(rows, title) for title, rows in tabs.items()
+        }
+        for title, tab in self.tabs.items():
+            self.add_worksheet(title, tab)
+
+    def values_batch_get(self, ranges: list[str]) -> dict:
+        self.batches.append(ranges)
+        rows = [self.tabs[name.strip("'")].rows for name in ranges]
+        return {"valueRanges": [{"values": tab} if tab else {} for tab in rows]}
+
+
+def test_cached_spreadsheet_reads_stale_worksheets_in_one_request():
+    parent = BatchSpreadsheet({"VOTED": ROWS, "NEW": ROWS[:2], "THEME": []})
+    spreadsheet = CachedSpreadsheet(parent, SnapshotCache())
+    spreadsheet.worksheet("VOTED").get_all_values()
+    tabs = spreadsheet.get_all_values_many(["VOTED", "NEW", "THEME"])
+    assert tabs == [ROWS, ROWS[:2], []]
+    assert parent.batches == [["'NEW'", "'THEME'"]]
+    # The batch is stored as the worksheets' snapshots.
+    assert spreadsheet.worksheet("NEW").get_all_values() == ROWS[:2]
+    assert parent.tabs["NEW"].reads == 0
+
+
+def test_cached_worksheet_refresh_reads_live_data():
+    ws = CountingWorksheet(ROWS)
+    cached = CachedWorksheet(ws, SnapshotCache())
+    cached.get_all_values()
+    ws.rows[1][0] = "moved"
+    cached.refresh()
+    assert cached.get_all_values()[1][0] == "moved"
+    assert ws.reads == 2
+
+
+# --- SheetsMirror --------------------------------------------------------------
+
+
+def _mirrored(rows=ROWS, path: str = ":memory:", ttl: float = 60):
+    ws, cached = _cached(rows, ttl=ttl)
+    return ws, cached, SheetsMirror(path)
+
+
+def test_sheets_mirror_reads_a_worksheet_once():
+    # With no snapshot to fall back on, only the mirror can answer.
+    ws, cached, mirror = _mirrored(ttl=0)
+    assert mirror.rows(cached) == ROWS
+    assert mirror.rows(cached) == ROWS
+    assert ws.reads == 1
+
+
+def test_sheets_mirror_find_rows_uses_the_column():
+    _, cached, mirror = _mirrored()
+    assert mirror.find_rows(cached, 1, "Loveless") == [ROWS[2]]
+    assert mirror.find_rows(cached, 2, "Loveless") == []
+
+
+def test_sheets_mirror_follows_the_bots_writes():
+    ws, cached, mirror = _mirrored()
+    mirror.rows(cached)
+    cached.append_row(["OK Computer", "Radiohead", "3"])
+    cached.update_cell(2, 3, 8)
+    assert mirror.rows(cached)[1:] == [
+        ["Kid A", "Radiohead", "8"],
+        ["Loveless", "My Bloody Valentine", "12"],
+        ["OK Computer", "Radiohead", "3"],
+    ]
+    assert ws.reads == 1
+
+
+def test_sheets_mirror_rereads_a_worksheet_dropped_from_the_cache():
+    ws, cached, mirror = _mirrored()
+    mirror.rows(cached)
+    ws.rows[1][0] = "moved by hand"
+    cached.refresh()
+    assert mirror.rows(cached)[1][0] == "moved by hand"
+    assert ws.reads == 2
+
+
+def test_sheets_mirror_refresh_all_stores_only_changed_rows():
+    ws, cached, mirror = _mirrored()
+    mirror.rows(cached)
+    ws.rows[2][2] = "13"
+    ws.rows.append(["Doolittle", "Pixies", "20"])
+    cached.cache.invalidate()
+    assert mirror.refresh_all() == 2
+    assert mirror.rows(cached)[2:] == [
+        ["Loveless", "My Bloody Valentine", "13"],
+        ["Doolittle", "Pixies", "20"],
+    ]
+
+
+def test_sheets_mirror_ignores_an_overtaken_change():
+    _, cached, mirror = _mirrored()
+    mirror.rows(cached)
+    cached.update_cell(2, 3, 8)
+    # A notification from before the write arriving late changes nothing.
+    mirror._on_change(cached.cache_key, [["stale"]], 0)
+    assert mirror.rows(cached)[1][2] == "8"
+
+
+def test_sheets_mirror_version_changes_with_the_rows():
+    ws, cached, mirror = _mirrored()
+    assert mirror.version(cached) is None
+    mirror.rows(cached)
+    first = mirror.version(cached)
+    assert first is not None and mirror.version(ws) is None
+    mirror.refresh_all()
+    assert mirror.version(cached) == first
+    cached.update_cell(2, 3, 8)
+    assert mirror.version(cached) not in (None, first)
+
+
+def test_sheets_mirror_survives_a_restart(tmp_path):
+    path = str(tmp_path / "mirror.sqlite3")
+    ws, cached, mirror = _mirrored(path=path)
+    mirror.rows(cached)
+    # A new process: empty cache, new mirror object on the same file.
+    restarted = CachedWorksheet(ws, SnapshotCache())
+    assert SheetsMirror(path).rows(restarted) == ROWS
+    assert ws.reads == 1
+
+
+def test_sheets_mirror_rows_many_reads_missing_tabs_together():
+    parent = BatchSpreadsheet({"VOTED": ROWS, "NEW": ROWS[:2]})
+    spreadsheet = CachedSpreadsheet(parent, SnapshotCache(ttl=0))
+    mirror = SheetsMirror(":memory:")
+    assert mirror.rows_many(spreadsheet, ["VOTED", "NEW"]) == [ROWS, ROWS[:2]]
+    assert mirror.rows_many(spreadsheet, ["NEW", "VOTED"]) == [ROWS[:2], ROWS]
+    assert parent.batches == [["'VOTED'", "'NEW'"]]
+
+
+def test_sheets_mirror_reads_unwrapped_worksheets_live():
+    ws = CountingWorksheet(ROWS)
+    mirror = SheetsMirror(":memory:")
+    assert mirror.rows(ws) == ROWS
+    assert mirror.find_rows(ws, 2, "Radiohead") == [ROWS[1]]
+    assert ws.reads == 2
+
+
+# --- WriteBuffer ---------------------------------------------------------------
+
+
+class RecordingWorksheet(FakeWorksheet):
+    """FakeWorksheet that records which write calls reach it."""
+
+    def __init__(self, rows=None, title: str = "Sheet1"):
+        super().__init__(rows, title)
+        self.write_calls: list[str] = []
+
+    def append_rows(self, values):
+        self.write_calls.append("append_rows")
+        super().append_rows(values)
+
+    def batch_update(self, data):
+        self.write_calls.append("batch_update")
+        super().batch_update(data)
+
+
+def test_write_buffer_coalesces_appends_into_one_call():
+    ws = RecordingWorksheet([["Title", "Artist"]])
+    buffer = WriteBuffer(ws)
+    for i in range(40):
+        buffer.append_row([f"Album {i}", "Band"])
+    assert len(ws.rows) == 1  # nothing sent before the flush
+
+    buffer.flush()
+    assert ws.write_calls == ["append_rows"]
+    assert len(ws.rows) == 41
+    assert ws.rows[-1] == ["Album 39", "Band"]
+    assert len(buffer) == 0
+
+
+def test_write_buffer_sends_rows_queued_together_with_those_before():
+    ws = RecordingWorksheet([["Title", "Artist"]])
+    buffer = WriteBuffer(ws)
+    buffer.append_row(["Album 0", "Band"])
+    buffer.append_rows([["Album 1", "Band"], ["Album 2", "Band"]])
+    buffer.flush()
+    assert ws.write_calls == ["append_rows"]
+    assert [row[0] for row in ws.rows[1:]] == ["Album 0", "Album 1", "Album 2"]
+
+
+def test_write_buffer_coalesces_cell_updates_into_one_call():
+    ws = RecordingWorksheet([["a", "1"], ["b", "2"]])
+    buffer = WriteBuffer(ws)
+    buffer.update_cell(1, 2, 0)
+    buffer.update_cell(2, 2, 5)
+    buffer.update_cell(2, 2, 0)  # later write to the same cell wins
+
+    buffer.flush()
+    assert ws.write_calls == ["batch_update"]
+    assert ws.rows == [["a", 0], ["b", 0]]
+
+
+class FlakyWorksheet(RecordingWorksheet):
+    """RecordingWorksheet whose first append_rows call fails."""
+
+    def __init__(self):
+        super().__init__()
+        self.failures = 1
+
+    def append_rows(self, values):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("quota exceeded")
+        super().append_rows(values)
+
+
+def test_write_buffer_requeues_on_failure(monkeypatch):
+    monkeypatch.setattr(writes, "SHEETS_FLUSH_WINDOW", 60)
+    buffer = WriteBuffer(FlakyWorksheet())
+    buffer.append_row(["x"])
+    with pytest.raises(RuntimeError):
+        buffer.flush()
+    assert len(buffer) == 1
+    buffer.flush()
+    assert buffer.worksheet.rows == [["x"]]
+
+
+def test_write_buffer_retries_failed_flush_on_its_own(monkeypatch):
+    monkeypatch.setattr(writes, "SHEETS_FLUSH_WINDOW", 0.01)
+    ws = FlakyWorksheet()
+    buffer = WriteBuffer(ws)
+    buffer.append_row(["x"])
+    with pytest.raises(RuntimeError):
+        buffer.flush()
+    deadline = time.monotonic() + 2
+    while len(buffer) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert ws.rows == [["x"]]
+
+
+def test_write_buffer_flushes_after_window(monkeypatch):
+    monkeypatch.setattr(writes, "SHEETS_FLUSH_WINDOW", 0.01)
+    ws = RecordingWorksheet()
+    buffer = WriteBuffer(ws)
+    buffer.append_row(["x"])
+    deadline = time.monotonic() + 2
+    while ws.write_calls != ["append_rows"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert ws.rows == [["x"]]
+
+
+def test_write_buffer_is_shared_per_worksheet():
+    ws = FakeWorksheet()
+    assert write_buffer(ws) is write_buffer(ws)
+    assert write_buffer(CachedWorksheet(ws)) is write_buffer(ws)
+    assert write_buffer(ws) is not write_buffer(FakeWorksheet())
+
+
+async def test_flush_writes_reports_every_failure(caplog):
+    failing, ok = FlakyWorksheet(), RecordingWorksheet()
+    write_buffer(failing).append_row(["1"])
+    write_buffer(ok).append_row(["2"])
+    with pytest.raises(RuntimeError):
+        await flush_writes()
+    assert ok.rows == [["2"]]
+    assert "Flush of" in caplog.text
+
+
+async def test_flush_writes_flushes_every_buffer():
+    first, second = RecordingWorksheet(), RecordingWorksheet()
+    write_buffer(first).append_row(["1"])
+    write_buffer(second).update_cell(1, 1, "2")
+    await flush_writes()
+    assert first.rows == [["1"]]
+    assert second.rows == [["2"]]
+
+
+def test_write_buffer_flush_keeps_cached_snapshot_current():
+    ws = RecordingWorksheet([["q", "0"], ["r", "3"]])
+    cached = CachedWorksheet(ws, SnapshotCache())
+    cached.get_all_values()
+    buffer = WriteBuffer(cached)
+    buffer.update_cell(2, 2, 0)
+    buffer.append_row(["s", "0"])
+    buffer.flush()
+    assert cached.get_all_values() == [["q", "0"], ["r", "0"], ["s", "0"]]
+
+
+# --- QuotaScheduler -------------------------------------------------------------
+
+
+def test_quota_scheduler_allows_a_burst_without_waiting():
+    scheduler = QuotaScheduler(per_minute=60, burst=3)
+    assert [scheduler.acquire() < 0.05 for _ in range(3)] == [True] * 3
+
+
+def test_quota_scheduler_queues_when_the_bucket_is_empty():
+    scheduler = QuotaScheduler(per_minute=600, burst=1)
+    scheduler.acquire()
+    assert scheduler.acquire() >= 0.05
+
+
+def test_quota_scheduler_background_yields_to_interactive():
+    scheduler = QuotaScheduler(per_minute=600, burst=1)
+    scheduler.acquire()
+    order = []
+
+    def take(priority):
+        scheduler.acquire(priority)
+        order.append(priority)
+
+    background = threading.Thread(target=take, args=(Priority.BACKGROUND,), daemon=True)
+    background.start()
+    time.sleep(0.02)
+    interactive = threading.Thread(
+        target=take, args=(Priority.INTERACTIVE,), daemon=True
+    )
+    interactive.start()
+    background.join(2)
+    interactive.join(2)
+    assert not background.is_alive() and not interactive.is_alive()
+    assert order == [Priority.INTERACTIVE, Priority.BACKGROUND]
+
+
+def test_quota_scheduler_background_reserve_is_capped_by_capacity():
+    scheduler = QuotaScheduler(per_minute=6000, burst=1)
+    assert scheduler.acquire(Priority.BACKGROUND) < 0.05
+
+
+async def test_run_sheets_background_work_does_not_hold_interactive_workers():
+    release = threading.Event()
+    with background_priority():
+        stuck = [
+            asyncio.ensure_future(run_sheets(release.wait, 2))
+            for _ in range(SHEETS_MAX_WORKERS * 2)
+        ]
+    try:
+        assert await asyncio.wait_for(run_sheets(lambda: "ok"), 1) == "ok"
+    finally:
+        release.set()
+        await asyncio.gather(*stuck)
+
+
+def test_quota_scheduler_pause_holds_every_lane():
+    scheduler = QuotaScheduler(per_minute=6000, burst=5)
+    scheduler.pause(0.1)
+    assert scheduler.acquire() >= 0.09
+
+
+def test_background_priority_sets_and_restores_the_lane():
+    assert sheets_priority.get() is Priority.INTERACTIVE
+    with background_priority():
+        assert sheets_priority.get() is Priority.BACKGROUND
+    assert sheets_priority.get() is Priority.INTERACTIVE
+
+
+def _response(status: int, body: bytes) -> Response:
+    response = Response()
+    response.status_code = status
+    response._content = body
+    return response
+
+
+class FakeSession(Session):
+    def __init__(self, responses: list[Response]):
+        super().__init__()
+        self.responses = responses
+        self.calls = 0
+
+    def request(self, *args, **kwargs) -> Response:
+        self.calls += 1
+        return self.responses.pop(0)
+
+
+def test_scheduled_http_client_retries_after_rate_limit(monkeypatch):
+    monkeypatch.setattr(quota, "quota_scheduler", QuotaScheduler(6000, burst=5))
+    paused = []
+    monkeypatch.setattr(quota.quota_scheduler, "pause", paused.append)
+    limited = b'{"error": {"code": 429, "message": "quota", "status": "x"}}'
+    session = FakeSession([_response(429, limited), _response(200, b"{}")])
+    client = ScheduledHTTPClient(cast(Any, None), session=session)
+    assert client.request("get", "https://example.invalid").ok
+    assert session.calls == 2
+    assert paused == [1.0]
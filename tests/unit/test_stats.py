@@ -0,0 +1,98 @@
+"""Tests for the per-command cost accounting in ``supermod._stats``."""
+
+from __future__ import annotations
+
+from supermod import _stats
+from supermod._sheets import run_sheets
+from supermod._stats import (
+    CommandStats,
+    Invocation,
+    instrument_discord_http,
+    percentile,
+    record_backoff,
+    record_sheets_call,
+    stats_table,
+)
+
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile([], 50) == 0.0
+    assert percentile([3.0], 95) == 3.0
+
+
+def test_track_records_costs_made_inside_the_block():
+    stats = CommandStats()
+    with stats.track("subs", "Submissions") as invocation:
+        record_sheets_call(0.5)
+        record_sheets_call(0.25)
+        record_backoff(1.0)
+    assert invocation.sheets_calls == 2
+    assert invocation.sheets_time == 0.75
+    assert invocation.backoff_time == 1.0
+    assert stats.by_command() == {"subs": [invocation]}
+
+
+def test_costs_outside_a_command_are_ignored():
+    record_sheets_call(1.0)
+    assert _stats.current_invocation.get() is None
+
+
+def test_costs_after_the_command_finished_are_ignored():
+    stats = CommandStats()
+    with stats.track("subs", "Submissions") as invocation:
+        pass
+    token = _stats.current_invocation.set(invocation)
+    try:
+        record_sheets_call(1.0)
+    finally:
+        _stats.current_invocation.reset(token)
+    assert invocation.sheets_calls == 0
+
+
+async def test_sheets_worker_threads_record_into_the_command():
+    stats = CommandStats()
+    with stats.track("my_subs", "Submissions") as invocation:
+        await run_sheets(record_sheets_call, 0.1)
+    assert invocation.sheets_calls == 1
+
+
+def test_rolling_window_and_feature_grouping():
+    stats = CommandStats(window=3)
+    for _ in range(5):
+        with stats.track("news", "Newsletter"):
+            pass
+    with stats.track("subs", "Submissions"):
+        pass
+    assert len(stats.by_command()["news"]) == 3
+    assert {name: len(runs) for name, runs in stats.by_feature().items()} == {
+        "Newsletter": 3,
+        "Submissions": 1,
+    }
+
+
+def test_stats_table_fits_in_one_message():
+    groups = {
+        f"command_{i}": [Invocation(f"command_{i}", "Feature")] * (i + 1)
+        for i in range(40)
+    }
+    table = stats_table("Per command", groups)
+    assert len(table) < 2000
+    assert "command_39" in table
+    assert "command_0 " not in table
+
+
+async def test_instrument_discord_http_counts_requests():
+    class FakeHTTP:
+        async def request(self, route, **kwargs):
+            return route
+
+    http = FakeHTTP()
+    instrument_discord_http(http)
+    stats = CommandStats()
+    with stats.track("hello", "General") as invocation:
+        assert await http.request("GET /channels") == "GET /channels"
+        await http.request("POST /messages")
+    assert invocation.discord_calls == 2
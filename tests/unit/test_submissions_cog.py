@@ -0,0 +1,362 @@
+"""
+Unit tests for the Submissions cog: its listeners, its #submissions index and
+the ``,subs`` review. They run against the benchmark harness's Discord fakes
+and fake Sheets behind the production cache layer, with no latency.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from discord import HTTPException
+
+from supermod._sheets import flush_writes, writes
+from supermod.album_classes.sub import Sub
+from supermod.features.submissions import _utils as sub_utils
+from supermod.features.submissions import submissions
+from supermod.features.submissions._state import RebuildJournal, ScanCursors
+from supermod.features.submissions._utils import (
+    _safe_int,
+    masterlist_link,
+    post_lines,
+)
+from supermod.features.submissions.submissions import (
+    MASTERLIST_CHANNEL_DICT,
+    SUB_APPROVAL_CHANNEL,
+    Submissions,
+)
+from tests.bench import harness
+from tests.bench.harness import MASTERLISTS, DiscordAPI, FakeBot, FakeContext
+from tests.fakes import SheetsBackend
+
+ROWS_PER_LIST = 3
+
+
+@pytest.fixture
+def world(monkeypatch) -> SimpleNamespace:
+    """A cog over three albums per masterlist and an empty #submissions."""
+    backend = SheetsBackend()
+    bot = FakeBot(DiscordAPI())
+    monkeypatch.setattr(submissions, "is_local", lambda: True)
+    monkeypatch.setattr(
+        submissions, "text_channel", lambda bot, channel_id: bot.get_channel(channel_id)
+    )
+    monkeypatch.setattr(submissions, "rebuild_journal", RebuildJournal(":memory:"))
+    monkeypatch.setattr(submissions, "scan_cursors", ScanCursors(":memory:"))
+    tabs = {
+        masterlist.upper(): harness.masterlist_rows(
+            masterlist,
+            ROWS_PER_LIST,
+            bot.channel(MASTERLIST_CHANNEL_DICT[masterlist], masterlist),
+        )
+        for masterlist in MASTERLISTS
+    }
+    subs_sheet, raw = harness.sheets(backend, tabs)
+    monkeypatch.setattr(sub_utils, "subs_sheet", lambda: subs_sheet)
+    albums = harness.worksheet(backend, harness.discussed_rows(5))
+    monkeypatch.setattr(sub_utils, "albums_wks", lambda: albums)
+    bot.channel(submissions.SUBMISSIONS_CHANNEL, "submissions")
+    bot.channel(SUB_APPROVAL_CHANNEL, "approval")
+    return SimpleNamespace(
+        bot=bot,
+        cog=Submissions(bot),  # type: ignore[arg-type]
+        backend=backend,
+        tab=lambda masterlist: raw._worksheets[masterlist.upper()].rows,
+    )
+
+
+# --- the periodic sync --------------------------------------------------------
+
+
+async def test_periodic_sync_locks_one_masterlist_at_a_time(world, monkeypatch):
+    held = []
+    most = 0
+
+    async def update(ctx, masterlist, quiet=False):
+        nonlocal most
+        held.append(masterlist)
+        most = max(most, len(held))
+        await asyncio.sleep(0)
+        held.remove(masterlist)
+
+    monkeypatch.setattr(world.cog, "_update_subs_sheet", update)
+    await world.cog.subs_sheet_update.coro(world.cog)
+    assert most == 1
+
+
+# --- masterlist listeners -----------------------------------------------------
+
+
+def _post(world, masterlist: str, title: str, submitter: int = 777):
+    """A member's post in a masterlist channel (its event not yet delivered)."""
+    channel = world.bot.channel(MASTERLIST_CHANNEL_DICT[masterlist])
+    msg = channel.add(
+        f"{title} _by_ Someone (2020) (Rock) <@!{submitter}>", author_id=submitter
+    )
+    msg.mentions = []
+    return msg
+
+
+def _edited(msg, content: str) -> SimpleNamespace:
+    msg.content = content
+    return SimpleNamespace(
+        channel_id=msg.channel.id,
+        message_id=msg.id,
+        message=msg,
+        cached_message=None,
+    )
+
+
+def _listed(world, masterlist: str, msg) -> list[str]:
+    return [row[0] for row in world.tab(masterlist) if row[6] == f"{msg.id}"]
+
+
+async def test_new_post_goes_on_the_sheet(world):
+    msg = _post(world, "new", "Fresh")
+    await world.cog.on_message(msg)
+    assert _listed(world, "new", msg) == ["Fresh"]
+
+
+async def test_edited_post_is_updated_on_the_sheet(world):
+    msg = _post(world, "new", "Fresh")
+    await world.cog.on_message(msg)
+    await world.cog.on_raw_message_edit(
+        _edited(msg, "Fresher _by_ Someone (2020) (Rock) <@!777>")
+    )
+    assert _listed(world, "new", msg) == ["Fresher"]
+
+
+async def test_deleted_posts_leave_the_sheet(world):
+    first, second, third = world.bot.channel(
+        MASTERLIST_CHANNEL_DICT["modern"]
+    ).messages[:3]
+    await world.cog.on_raw_message_delete(
+        SimpleNamespace(channel_id=first.channel.id, message_id=first.id)
+    )
+    await world.cog.on_raw_bulk_message_delete(
+        SimpleNamespace(channel_id=first.channel.id, message_ids={second.id, third.id})
+    )
+    assert world.tab("modern") == [harness.SUBS_HEADER]
+
+
+async def test_post_made_during_a_sync_is_caught_up_after_it(world):
+    msg = _post(world, "classic", "Meanwhile")
+
+    async def step(ctx, masterlist):
+        await world.cog.on_message(msg)
+        assert not _listed(world, "classic", msg)
+
+    await world.cog._sync_masterlist(FakeContext(world.bot.api), "classic", step)
+    assert _listed(world, "classic", msg) == ["Meanwhile"]
+    assert not world.cog._missed
+
+
+# --- the sheet sync -----------------------------------------------------------
+
+
+async def test_sheet_sync_refreshes_submitter_names(world, monkeypatch):
+    rows = world.tab("voted")
+    renamed, gone = _safe_int(rows[1][5]), _safe_int(rows[2][5])
+    rows[1][4] = rows[2][4] = "old name"
+    fetch_user = world.bot.fetch_user
+
+    async def lookup(user_id):
+        if user_id == gone:
+            response = SimpleNamespace(status=404, reason="")
+            raise HTTPException(response, "")  # type: ignore[arg-type]
+        return await fetch_user(user_id)
+
+    monkeypatch.setattr(world.bot, "fetch_user", lookup)
+    await world.cog._update_subs_sheet(FakeContext(world.bot.api), "voted", quiet=True)
+    names = {_safe_int(row[5]): row[4] for row in world.tab("voted")[1:]}
+    assert names[renamed] == f"user{renamed}"
+    assert names[gone] == "old name"
+
+
+# --- posting to the masterlists -----------------------------------------------
+
+
+def _sub(title: str, submitter: int, masterlist: str = "new", **kwargs) -> Sub:
+    return Sub(
+        artist="Someone",
+        title=title,
+        genres="Rock",
+        release_date="2020",
+        submitter_name=f"user{submitter}",
+        submitter_id=submitter,
+        masterlist=masterlist,
+        **kwargs,
+    )
+
+
+@pytest.fixture
+def packed(monkeypatch):
+    monkeypatch.setattr(submissions, "SUBS_PACKED_POSTS", True)
+    monkeypatch.setattr(sub_utils, "SUBS_PACKED_POSTS", True)
+
+
+async def test_packed_posts_made_at_once_all_land(world, packed):
+    channel = world.bot.channel(MASTERLIST_CHANNEL_DICT["new"])
+    rows = [await world.cog._submit_album(_sub("First", 801), react=False)]
+    # Each Discord call now yields, so the two posts interleave.
+    world.bot.api.latency = 0.001
+    rows += await asyncio.gather(
+        world.cog._submit_album(_sub("Second", 802), react=False),
+        world.cog._submit_album(_sub("Third", 803), react=False),
+    )
+    last = channel.messages[-1]
+    assert [line.split(" _by_")[0] for line in post_lines(last.content)] == [
+        "First",
+        "Second",
+        "Third",
+    ]
+    assert [row and row[6:] for row in rows] == [
+        [f"{last.id}", "0"],
+        [f"{last.id}", "1"],
+        [f"{last.id}", "2"],
+    ]
+
+
+async def test_approved_list_goes_on_the_sheet_in_one_request(world, monkeypatch):
+    # Posting outlasts the write buffer's flush window several times over.
+    monkeypatch.setattr(writes, "SHEETS_FLUSH_WINDOW", 0.001)
+    world.bot.api.latency = 0.005
+    titles = [f"Approved {i}" for i in range(4)]
+    msgs = [_submit(world, title) for title in titles]
+    approved = [
+        _sub(title, 900 + i, message=msg)
+        for i, (title, msg) in enumerate(zip(titles, msgs))
+    ]
+    assert await world.cog._approve_list("new", approved, unhalt=False)
+    assert world.backend.calls["append_rows"] == 1
+    assert [row[0] for row in world.tab("new")[-4:]] == titles
+    assert all(msg.reactions for msg in msgs)
+
+
+async def test_replacing_an_entry_missing_from_its_message_keeps_its_row(world):
+    channel = world.bot.channel(MASTERLIST_CHANNEL_DICT["new"])
+    packed_post = await channel.send(
+        "A _by_ Someone (2020) (Rock) <@!801>\nB _by_ Someone (2020) (Rock) <@!802>"
+    )
+    stray = ["C", "Someone", "2020", "Rock", "user803", "803", f"{packed_post.id}", "0"]
+    world.tab("new").append(stray)
+    content = packed_post.content
+    await world.cog._submit_album(
+        _sub("D", 803, request="replace", message=None), react=False
+    )
+    await flush_writes()
+    assert packed_post.content == content
+    assert stray in world.tab("new")
+
+
+# --- the #submissions index ---------------------------------------------------
+
+
+def _submissions(world):
+    return world.bot.channel(submissions.SUBMISSIONS_CHANNEL)
+
+
+def _submit(world, title: str, masterlist: str = "new"):
+    return _submissions(world).add(
+        f"{title} // Someone // 2021 // Rock // {masterlist}",
+        author_id=60_000,
+        author_name="member",
+    )
+
+
+def _reaction(msg, emoji: str = "🆗") -> SimpleNamespace:
+    return SimpleNamespace(channel_id=msg.channel.id, message_id=msg.id, emoji=emoji)
+
+
+async def test_first_read_takes_the_newest_submissions_only(world):
+    posted = [_submit(world, f"Album {i}") for i in range(150)]
+    index = await world.cog._submissions_index(_submissions(world))
+    assert index.oldest("new", "halted") == posted[50].id
+    assert world.bot.api.calls["history"] == 1
+    assert submissions.scan_cursors.get("open") == posted[50].id - 1
+
+
+async def test_scan_cursor_advances_past_resolved_submissions(world):
+    first, second, third = (_submit(world, f"Album {i}") for i in range(3))
+    await world.cog._submissions_index(_submissions(world))
+    assert submissions.scan_cursors.get("open") == first.id - 1
+
+    await world.cog.on_raw_reaction_add(_reaction(first))
+    await world.cog._submissions_index(_submissions(world))
+    assert submissions.scan_cursors.get("open") == second.id - 1
+
+    for msg in (second, third):
+        await world.cog.on_raw_reaction_add(_reaction(msg))
+    await world.cog._submissions_index(_submissions(world))
+    assert submissions.scan_cursors.get("open") == third.id
+
+    # After a restart, the channel is read from there on.
+    fourth = _submit(world, "Album 3")
+    restarted = Submissions(world.bot)  # type: ignore[arg-type]
+    index = await restarted._submissions_index(_submissions(world))
+    assert [msg.id for msg in index.open()] == [fourth.id]
+
+
+async def test_resolved_submission_leaves_the_review(world):
+    kept, approved = _submit(world, "Kept"), _submit(world, "Approved")
+    ctx = FakeContext(world.bot.api)
+    assert len(await world.cog._subs_check_msg(ctx, None)) == 2
+
+    await world.cog.on_raw_reaction_add(_reaction(approved))
+    reviewed = await world.cog._subs_check_msg(ctx, None)
+    assert [getattr(sub, "title") for sub in reviewed.values()] == ["Kept"]
+    assert approved.id not in world.cog.submissions
+    assert kept.id in world.cog.submissions
+
+
+async def test_submission_is_checked_as_it_arrives(world, monkeypatch):
+    msg = _submit(world, "Fresh")
+    await world.cog.on_message(msg)
+    await asyncio.gather(*world.cog._checks)
+    verdict = world.cog.submissions.verdicts()[msg.id]
+    assert getattr(verdict.sub, "title") == "Fresh"
+
+    def not_again(*args):
+        raise AssertionError("a submission was checked again")
+
+    monkeypatch.setattr(sub_utils, "submission_check", not_again)
+    reviewed = await world.cog._subs_check_msg(FakeContext(world.bot.api), None)
+    assert list(reviewed.values()) == [verdict.sub]
+
+
+# --- the review ---------------------------------------------------------------
+
+
+async def test_reactions_by_number_are_reported_in_one_message(world):
+    msgs = [_submit(world, f"Album {i}") for i in range(3)]
+    subs_dict = {
+        f"{i}": _sub(f"Album {i}", 900 + i, message=msg)
+        for i, msg in enumerate(msgs, start=1)
+    }
+
+    async def forbidden(emoji):
+        response = SimpleNamespace(status=403, reason="")
+        raise HTTPException(response, "")  # type: ignore[arg-type]
+
+    msgs[1].add_reaction = forbidden  # type: ignore[method-assign]
+    ctx = FakeContext(world.bot.api)
+    response = harness.reply("1, 2, 3")(world.bot)
+    await world.cog._react_by_index(ctx, response, subs_dict, "❌", "rejected")
+    assert [msg.content for msg in ctx.messages] == [
+        "Albums 1, 3 were rejected. Album 2 could not be rejected; try again."
+    ]
+    assert [bool(msg.reactions) for msg in msgs] == [True, False, True]
+
+
+async def test_duplicate_warning_links_the_entry_without_fetching_it(world):
+    listed = world.tab("new")[1]
+    _submissions(world).add(
+        f"{listed[0]} // {listed[1]} // 2021 // Rock // new", author_id=60_000
+    )
+    ctx = FakeContext(world.bot.api)
+    await world.cog._subs_check_msg(ctx, None)
+    review = "\n".join(msg.content for msg in ctx.messages)
+    assert f"<{masterlist_link('new', int(listed[6]))}>" in review
+    assert not world.bot.api.calls["fetch_message"]
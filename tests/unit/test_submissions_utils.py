@@ -1,15 +1,23 @@
 """
-Unit tests for ``supermod.features.submissions._utils``. The worksheets are
-reached through the lazy ``subs_sheet`` and ``albums_wks`` accessors, bound on
-the ``_utils`` module via the ``_constants`` star-import, so patch them there.
+Unit tests for ``supermod.features.submissions._utils`` and the feature's
+state store. The worksheets are reached through the lazy ``subs_sheet`` and
+``albums_wks`` accessors, bound on the ``_utils`` module via the
+``_constants`` star-import, so patch them there.
 """
 
 from __future__ import annotations
 
+from types import SimpleNamespace
+
 import pytest
 
 from supermod.album_classes import Sub, SubError
 from supermod.features.submissions import _utils
+from supermod.features.submissions._state import (
+    RebuildJob,
+    RebuildJournal,
+    ScanCursors,
+)
 from tests.fakes import FakeWorksheet, make_message
 
 
@@ -105,6 +113,26 @@ def test_submission_make_malformed_returns_suberror():
     assert sub.message is msg
 
 
+# =============================================================================
+# reaction_summary
+# =============================================================================
+
+
+def test_reaction_summary_reports_in_one_message():
+    assert _utils.reaction_summary(["4"], [], "halted") == "Album 4 was halted."
+    assert _utils.reaction_summary(["1", "2", "3"], ["3"], "rejected") == (
+        "Albums 1, 2 were rejected. Album 3 could not be rejected; try again."
+    )
+    assert _utils.reaction_summary([], [], "rejected") == ""
+
+
+def test_masterlist_link_points_at_the_post():
+    assert _utils.masterlist_link("new", 55555) == (
+        f"https://discord.com/channels/{_utils.SERVER}/"
+        f"{_utils.MASTERLIST_CHANNEL_DICT['new']}/55555"
+    )
+
+
 # =============================================================================
 # _safe_int
 # =============================================================================
@@ -123,21 +151,36 @@ def test_safe_int_non_numeric_returns_minus_one():
 
 
 # =============================================================================
-# duplicate_check  (tuple-order fix: existing_subs stored as (title, artist))
+# get_check_data / duplicate_check  (keys stored as (title, artist))
 # =============================================================================
 
 
-def test_duplicate_check_detects_present_album():
-    # Sheet rows used so duplicate_check can read the G-column msg id.
-    rows = [
-        ["Title", "Artist", "Year", "Genre", "Submitter", "ID", "MsgId"],
-        ["Kid A", "Radiohead", "2000", "Electronic", "alice", "99", "55555"],
-    ]
-    _set_subs_sheet("voted", rows)
+VOTED_ROWS = [
+    ["Title", "Artist", "Year", "Genre", "Submitter", "ID", "MsgId"],
+    ["Kid A", "Radiohead", "2000", "Electronic", "alice", "42", "55555"],
+    ["Kid A", "Radiohead", "2000", "Electronic", "bob", "43", "66666"],
+]
+
+
+def _check_data(voted_rows, discussed_rows):
+    """Build the check indexes for VOTED from fake sheets."""
+    _set_subs_sheet("voted", voted_rows)
+    _set_albums_wks(discussed_rows)
+    return _utils.get_check_data("voted")
 
+
+def test_get_check_data_indexes_values_of_first_rows():
+    existing, submitters, discussed = _check_data(
+        VOTED_ROWS, [["Title", "Artist", "Week"], ["Loveless", "MBV", "7"]]
+    )
+    assert existing == {"voted": {("Kid A", "Radiohead"): 55555}}
+    assert submitters == {"voted": {42: 55555, 43: 66666}}
+    assert discussed == {("Loveless", "MBV"): 7}
+
+
+def test_duplicate_check_detects_present_album():
+    existing, _, _ = _check_data(VOTED_ROWS, [["Title", "Artist", "Week"]])
     sub = _make_sub(title="Kid A", artist="Radiohead", masterlist="voted")
-    # existing_subs stored as (title, artist) — matching sub.title/sub.artist.
-    existing = {"voted": [("Kid A", "Radiohead")]}
 
     found, msg_id = _utils.duplicate_check(sub, existing)
     assert found is True
@@ -145,15 +188,22 @@ def test_duplicate_check_detects_present_album():
 
 
 def test_duplicate_check_absent_album():
-    _set_subs_sheet("voted", [["Title", "Artist"]])
+    existing, _, _ = _check_data(VOTED_ROWS, [["Title", "Artist", "Week"]])
     sub = _make_sub(title="OK Computer", artist="Radiohead", masterlist="voted")
-    existing = {"voted": [("Kid A", "Radiohead")]}
 
     found, msg_id = _utils.duplicate_check(sub, existing)
     assert found is False
     assert msg_id == 0
 
 
+def test_discussed_check_blank_week_is_no_match():
+    _, _, discussed = _check_data(
+        VOTED_ROWS, [["Title", "Artist", "Week"], ["Kid A", "Radiohead", ""]]
+    )
+    sub = _make_sub(title="Kid A", artist="Radiohead")
+    assert _utils.discussed_check(sub, discussed) == (False, 0)
+
+
 # =============================================================================
 # submission_check precedence: discussed > duplicate > user-already
 # =============================================================================
@@ -161,85 +211,66 @@ def test_duplicate_check_absent_album():
 
 def test_submission_check_discussed_wins():
     # Discussed takes precedence even if it is also a duplicate / user repeat.
-    _set_subs_sheet(
-        "voted",
-        [
-            ["Title", "Artist", "Year", "Genre", "Submitter", "ID", "MsgId"],
-            ["Kid A", "Radiohead", "2000", "Electronic", "alice", "42", "55555"],
-        ],
+    data = _check_data(
+        VOTED_ROWS, [["Title", "Artist", "Week"], ["Kid A", "Radiohead", "7"]]
     )
-    _set_albums_wks(
-        [
-            ["Title", "Artist", "Week"],
-            ["Kid A", "Radiohead", "7"],
-        ]
+    sub = _make_sub(
+        title="Kid A", artist="Radiohead", masterlist="voted", submitter_id=42
     )
 
-    sub = _make_sub(title="Kid A", artist="Radiohead", masterlist="voted", submitter_id=42)
-    existing = {"voted": [("Kid A", "Radiohead")]}
-    submitters = {"voted": [42]}
-    discussed = [("Kid A", "Radiohead")]
-
-    result = _utils.submission_check(sub, existing, submitters, discussed)
+    result = _utils.submission_check(sub, *data)
     assert sub.warning == "discussed"
     assert result == 7
 
 
 def test_submission_check_duplicate_beats_user_already():
-    _set_subs_sheet(
-        "voted",
-        [
-            ["Title", "Artist", "Year", "Genre", "Submitter", "ID", "MsgId"],
-            ["Kid A", "Radiohead", "2000", "Electronic", "alice", "42", "55555"],
-        ],
+    data = _check_data(VOTED_ROWS, [["Title", "Artist", "Week"]])
+    sub = _make_sub(
+        title="Kid A", artist="Radiohead", masterlist="voted", submitter_id=42
     )
-    _set_albums_wks([["Title", "Artist", "Week"]])
 
-    sub = _make_sub(title="Kid A", artist="Radiohead", masterlist="voted", submitter_id=42)
-    existing = {"voted": [("Kid A", "Radiohead")]}
-    submitters = {"voted": [42]}
-    discussed = []
-
-    result = _utils.submission_check(sub, existing, submitters, discussed)
+    result = _utils.submission_check(sub, *data)
     assert sub.warning == "duplicate"
     assert result == 55555
 
 
 def test_submission_check_user_already():
-    _set_subs_sheet(
-        "voted",
-        [
-            ["Title", "Artist", "Year", "Genre", "Submitter", "ID", "MsgId"],
-            ["Other Album", "Other Band", "1999", "Rock", "alice", "42", "55555"],
-        ],
-    )
-    _set_albums_wks([["Title", "Artist", "Week"]])
-
+    data = _check_data(VOTED_ROWS, [["Title", "Artist", "Week"]])
     # Different album, but same submitter already in the masterlist.
-    sub = _make_sub(title="Kid A", artist="Radiohead", masterlist="voted", submitter_id=42)
-    existing = {"voted": [("Other Album", "Other Band")]}
-    submitters = {"voted": [42]}
-    discussed = []
+    sub = _make_sub(
+        title="OK Computer", artist="Radiohead", masterlist="voted", submitter_id=43
+    )
 
-    result = _utils.submission_check(sub, existing, submitters, discussed)
+    result = _utils.submission_check(sub, *data)
     assert sub.warning == "user already in masterlist"
-    assert result == 55555
+    assert result == 66666
 
 
 def test_submission_check_clean_returns_zero():
-    _set_subs_sheet("voted", [["Title", "Artist"]])
-    _set_albums_wks([["Title", "Artist", "Week"]])
-
-    sub = _make_sub(title="Kid A", artist="Radiohead", masterlist="voted", submitter_id=42)
-    existing = {"voted": []}
-    submitters = {"voted": []}
-    discussed = []
+    data = _check_data([VOTED_ROWS[0]], [["Title", "Artist", "Week"]])
+    sub = _make_sub(
+        title="Kid A", artist="Radiohead", masterlist="voted", submitter_id=42
+    )
 
-    result = _utils.submission_check(sub, existing, submitters, discussed)
+    result = _utils.submission_check(sub, *data)
     assert sub.warning is None
     assert result == 0
 
 
+def test_submission_check_reads_no_cells(monkeypatch):
+    _, voted = _set_subs_sheet("voted", VOTED_ROWS)
+    albums = _set_albums_wks([["Title", "Artist", "Week"]])
+    data = _utils.get_check_data("voted")
+
+    def _no_cell_reads(a1):
+        raise AssertionError(f"unexpected cell read {a1}")
+
+    monkeypatch.setattr(voted, "acell", _no_cell_reads)
+    monkeypatch.setattr(albums, "acell", _no_cell_reads)
+    sub = _make_sub(title="Kid A", artist="Radiohead", masterlist="voted")
+    assert _utils.submission_check(sub, *data) == 55555
+
+
 # =============================================================================
 # random_album
 # =============================================================================
@@ -276,3 +307,303 @@ def test_random_album_header_only_returns_none():
 def test_random_album_empty_returns_none():
     _set_subs_sheet("voted", [])
     assert _utils.random_album("voted") is None
+
+
+# =============================================================================
+# previous_submission / delete_submission_row
+# =============================================================================
+
+
+SUBS_HEADER = [
+    "Title",
+    "Artist",
+    "Year",
+    "Genre",
+    "Submitter",
+    "ID",
+    "Message ID",
+    "Line",
+]
+
+
+def test_previous_submission_returns_message_id_and_line():
+    rows = [
+        SUBS_HEADER,
+        ["Kid A", "Radiohead", "2000", "Electronic", "a", "42", "7"],
+        ["Loveless", "My Bloody Valentine", "1991", "Shoegaze", "b", "12", "8", "2"],
+    ]
+    _set_subs_sheet("voted", rows)
+    assert _utils.previous_submission("voted", 42) == (7, None)
+    assert _utils.previous_submission("voted", 12) == (8, 2)
+    assert _utils.previous_submission("voted", 43) is None
+
+
+def test_delete_submission_row_matches_submitter_and_message():
+    # Rows were reordered since the entry was looked up; the right one must go.
+    rows = [
+        SUBS_HEADER,
+        ["Loveless", "My Bloody Valentine", "1991", "Shoegaze", "b", "12", "8"],
+        ["Kid A", "Radiohead", "2000", "Electronic", "a", "42", "7"],
+    ]
+    _, child = _set_subs_sheet("voted", rows)
+    assert _utils.delete_submission_row("voted", 42, 7) is True
+    assert [row[5] for row in child.rows] == ["ID", "12"]
+    assert _utils.delete_submission_row("voted", 42, 7) is False
+
+
+def test_delete_submission_row_moves_the_later_lines_of_its_message_up():
+    rows = [
+        SUBS_HEADER,
+        ["Kid A", "Radiohead", "2000", "Electronic", "a", "42", "7", "2"],
+        ["Loveless", "My Bloody Valentine", "1991", "Shoegaze", "b", "12", "7", "1"],
+        ["Doolittle", "Pixies", "1989", "Rock", "c", "13", "7", "0"],
+        ["Surfer Rosa", "Pixies", "1988", "Rock", "d", "14", "9", "3"],
+    ]
+    _, child = _set_subs_sheet("voted", rows)
+    assert _utils.delete_submission_row("voted", 12, 7, line=1) is True
+    assert [row[6:8] for row in child.rows[1:]] == [["7", "1"], ["7", "0"], ["9", "3"]]
+
+
+# =============================================================================
+# masterlist_post_sub / sheet_diff / sync_sheet
+# =============================================================================
+
+
+def test_masterlist_post_sub_round_trips_masterlist_format():
+    sub = _make_sub(title="Kid A", artist="Radiohead", submitter_id=42)
+    parsed = _utils.masterlist_post_sub(sub.masterlist_format(), "voted")
+    assert _utils.submission_row(parsed, 7) == [
+        "Kid A",
+        "Radiohead",
+        "2020",
+        "Pop",
+        "",
+        "42",
+        "7",
+        "",
+    ]
+
+
+def test_masterlist_post_subs_reads_a_packed_post_line_by_line():
+    subs = [_make_sub(title=f"Album {i}", submitter_id=i) for i in range(3)]
+    post = "\n".join(sub.masterlist_format() for sub in subs) + "\n"
+    parsed = _utils.masterlist_post_subs(post, "voted")
+    assert [(sub.title, sub.submitter_id) for sub in parsed] == [
+        ("Album 0", 0),
+        ("Album 1", 1),
+        ("Album 2", 2),
+    ]
+
+
+def test_pack_posts_fills_each_message_up_to_the_limit():
+    posts = ["a" * 900, "b" * 900, "c" * 198, "d" * 2000, "e"]
+    assert _utils.pack_posts(posts) == [
+        "a" * 900 + "\n" + "b" * 900 + "\n" + "c" * 198,
+        "d" * 2000,
+        "e",
+    ]
+
+
+def test_message_lines_numbers_packed_posts_only(monkeypatch):
+    assert _utils.message_lines(1) == [None]
+    assert _utils.message_lines(3) == [0, 1, 2]
+    monkeypatch.setattr(_utils, "SUBS_PACKED_POSTS", True)
+    assert _utils.message_lines(1) == [0]
+
+
+KID_A = ["Kid A", "Radiohead", "2000", "Electronic", "a", "42", "7", ""]
+LOVELESS = ["Loveless", "My Bloody Valentine", "1991", "Shoegaze", "b", "12", "8", ""]
+DOOLITTLE = ["Doolittle", "Pixies", "1989", "Rock", "c", "13", "9", ""]
+
+
+def test_sheet_diff_matches_rows_on_message_id():
+    edited = ["Kid A", "Radiohead", "2000", "Electronic, Rock", "a", "42", "7", ""]
+    old = [SUBS_HEADER, KID_A, LOVELESS, KID_A, ["note", "", "", "", "", "", "", ""]]
+    edits, deletes, inserts = _utils.sheet_diff(old, [SUBS_HEADER, DOOLITTLE, edited])
+    assert edits == [(2, edited)]
+    # The removed album, the repeated row and the stray row, highest first.
+    assert deletes == [5, 4, 3]
+    assert inserts == [DOOLITTLE]
+
+
+def test_sheet_diff_matches_the_lines_of_a_packed_message():
+    first, second = KID_A[:7] + ["0"], LOVELESS[:6] + ["7", "1"]
+    edits, deletes, inserts = _utils.sheet_diff(
+        [SUBS_HEADER, second, first], [SUBS_HEADER, first, second]
+    )
+    assert (edits, deletes, inserts) == ([], [], [])
+
+
+def test_sheet_diff_ignores_columns_past_the_row():
+    noted = KID_A + ["staff note"]
+    assert _utils.sheet_diff([SUBS_HEADER, noted], [SUBS_HEADER, KID_A]) == (
+        [],
+        [],
+        [],
+    )
+
+
+def test_sync_sheet_sends_only_the_changes(monkeypatch):
+    ws = FakeWorksheet([SUBS_HEADER, KID_A, LOVELESS, DOOLITTLE])
+    calls = []
+    for name in ("batch_update", "delete_rows", "append_rows", "replace_all"):
+        record = lambda *args, name=name: calls.append((name, args))  # noqa: E731
+        monkeypatch.setattr(ws, name, record, raising=False)
+    surfer_rosa = ["Surfer Rosa", "Pixies", "1988", "Rock", "c", "13", "10", ""]
+    new = [SUBS_HEADER, KID_A, surfer_rosa]
+    assert _utils.sync_sheet(ws, ws.get_all_values(), new) == 3
+    assert calls == [
+        ("delete_rows", (3, 4)),
+        ("append_rows", ([surfer_rosa],)),
+    ]
+
+
+def test_sync_sheet_unchanged_sends_nothing(monkeypatch):
+    ws = FakeWorksheet([SUBS_HEADER, KID_A])
+    monkeypatch.setattr(ws, "append_rows", lambda rows: pytest.fail("wrote"))
+    assert _utils.sync_sheet(ws, ws.get_all_values(), [SUBS_HEADER, KID_A]) == 0
+
+
+def test_sync_sheet_rewrites_a_sheet_without_its_header(monkeypatch):
+    ws = FakeWorksheet([KID_A])
+    rewrites = []
+    monkeypatch.setattr(ws, "replace_all", rewrites.append, raising=False)
+    _utils.sync_sheet(ws, ws.get_all_values(), [SUBS_HEADER, KID_A])
+    assert rewrites == [[SUBS_HEADER, KID_A]]
+
+
+def test_edit_message_rows_rewrites_the_messages_rows():
+    edited = ["Kid A", "Radiohead", "2000", "Rock", "a", "42", "7", ""]
+    _, child = _set_subs_sheet("voted", [SUBS_HEADER, LOVELESS, KID_A])
+    assert _utils.edit_message_rows("voted", 7, [edited]) is True
+    assert child.rows == [SUBS_HEADER, LOVELESS, edited]
+    assert _utils.edit_message_rows("voted", 99, [edited]) is False
+
+
+def test_edit_message_rows_replaces_rows_when_the_count_changes():
+    first, second = KID_A[:7] + ["0"], DOOLITTLE[:6] + ["7", "1"]
+    _, child = _set_subs_sheet("voted", [SUBS_HEADER, KID_A, LOVELESS])
+    assert _utils.edit_message_rows("voted", 7, [first, second]) is True
+    assert child.rows == [SUBS_HEADER, LOVELESS, first, second]
+
+
+def test_delete_message_rows_deletes_every_match():
+    _, child = _set_subs_sheet("voted", [SUBS_HEADER, KID_A, LOVELESS, DOOLITTLE])
+    assert _utils.delete_message_rows("voted", {7, 9, 99}) == 2
+    assert child.rows == [SUBS_HEADER, LOVELESS]
+
+
+# =============================================================================
+# SubmissionIndex
+# =============================================================================
+
+
+def _submission(msg_id, *reactions):
+    msg = make_message("Album // Artist // 2021 // Rock // voted")
+    msg.id = msg_id
+    msg.reactions = [SimpleNamespace(emoji=emoji, count=1) for emoji in reactions]
+    return msg
+
+
+def test_submission_index_sorts_submissions_by_reaction():
+    index = _utils.SubmissionIndex()
+    for msg in (_submission(1), _submission(2, "🇭"), _submission(3, "🆗")):
+        index.add(msg)
+    index.add(_submission(4))
+    assert [msg.id for msg in index.open()] == [4, 1]
+    assert [msg.id for msg in index.open(halted=True)] == [2]
+    # Resolved submissions are not kept, but still count as seen.
+    assert (index.status(3), index.oldest("new", "halted"), index.newest()) == (
+        None,
+        1,
+        4,
+    )
+
+
+def test_submission_index_follows_reactions():
+    index = _utils.SubmissionIndex()
+    index.add(_submission(1))
+    assert index.react(1, "🇭", 1) == "halted"
+    assert index.react(1, "❌", 1) == "halted"
+    assert index.clear(1, "🇭") == "resolved"
+    # Dropped once resolved: a reopened submission has to be fetched again.
+    assert 1 not in index and index.open() == []
+    assert index.react(1, "❌", -1) is None
+
+
+def test_submission_index_forgets_deleted_submissions():
+    index = _utils.SubmissionIndex()
+    index.add(_submission(1))
+    index.add(_submission(2))
+    index.remove({1})
+    assert 1 not in index and [msg.id for msg in index.open()] == [2]
+
+
+def test_submission_verdicts_reuse_those_checked_on_the_same_sheets(monkeypatch):
+    _set_subs_sheet("voted", VOTED_ROWS)
+    _set_albums_wks([["Title", "Artist", "Week"]])
+    monkeypatch.setattr(_utils, "check_version", lambda masterlist: (1, 1))
+    duplicate = _submission(1)
+    duplicate.content = "Kid A // Radiohead // 2000 // Rock // voted"
+    clean, unknown = _submission(2), _submission(3)
+    unknown.content = "Album // Artist // 2021 // Rock // votd"
+    first = _utils.submission_verdicts([duplicate, clean, unknown], {})
+    assert [(getattr(v.sub, "warning"), v.error_id) for v in first[:2]] == [
+        ("duplicate", 55555),
+        (None, 0),
+    ]
+    assert isinstance(first[2].sub, SubError)
+
+    cached = {1: first[0], 2: first[1]}
+    again = _utils.submission_verdicts([duplicate, clean], cached)
+    assert again[0] is first[0] and again[1] is first[1]
+    monkeypatch.setattr(_utils, "check_version", lambda masterlist: (2, 1))
+    assert _utils.submission_verdicts([duplicate], cached)[0] is not first[0]
+
+
+# =============================================================================
+# rebuild_posts / RebuildJournal / ScanCursors
+# =============================================================================
+
+
+def test_rebuild_posts_shuffles_the_same_way_for_a_seed():
+    rows = [KID_A, LOVELESS, DOOLITTLE] * 3
+    posts = _utils.rebuild_posts(rows, 470, "voted")
+    assert posts == _utils.rebuild_posts(rows, 470, "voted")
+    assert sorted(posts) == sorted(
+        _utils.sheet_row_sub(row, "voted").masterlist_format() for row in rows
+    )
+
+
+def test_rebuild_journal_outlives_its_connection(tmp_path):
+    path = str(tmp_path / "rebuilds.sqlite3")
+    journal = RebuildJournal(path)
+    job = journal.start("voted", [KID_A, LOVELESS], seed=470, last_old=5)
+    journal.record(job, 11)
+    journal.record(job, 12)
+
+    resumed = RebuildJournal(path).get("voted")
+    assert resumed == RebuildJob("voted", 470, 5, [KID_A, LOVELESS], [11, 12])
+
+
+def test_rebuild_journal_forgets_finished_and_restarted_jobs():
+    journal = RebuildJournal(":memory:")
+    journal.record(journal.start("voted", [KID_A], seed=1, last_old=0), 11)
+    journal.start("new", [LOVELESS], seed=2, last_old=0)
+    assert journal.unfinished() == ["new", "voted"]
+
+    assert journal.start("voted", [DOOLITTLE], seed=3, last_old=11).posted == []
+    assert journal.get("voted") == RebuildJob("voted", 3, 11, [DOOLITTLE])
+    journal.finish("voted")
+    assert journal.get("voted") is None
+    assert journal.unfinished() == ["new"]
+
+
+def test_scan_cursors_outlive_their_connection(tmp_path):
+    path = str(tmp_path / "state.sqlite3")
+    cursors = ScanCursors(path)
+    assert cursors.get("new") is None
+    cursors.set("new", 5)
+    cursors.set("new", 9)
+    cursors.set("halted", 3)
+    assert (ScanCursors(path).get("new"), ScanCursors(path).get("halted")) == (9, 3)